@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Shared codemod engine for the AppColors.X <-> context.appX color scripts.
+
+Both directions are driven by one mapping table. A file is rewritten in a
+single regex pass that matches whole member references (`AppColors.primary`
+never matches inside `AppColors.primaryLight`), so the result no longer
+depends on the order of the mappings. String literals and comments are
+skipped. Dart block comments are treated as non-nesting.
+
+Used by convert_to_theme_aware_colors.py (to_context) and
+revert_context_app_to_appcolors.py (to_appcolors). codemod_files() runs a
+direction over many files, optionally across a process pool, and keeps a
+manifest of content hashes so --changed-only runs skip files untouched
+since the last run.
+"""
+
+import difflib
+import os
+import re
+import stat
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+from validation_cache import ValidationCache, ruleset_fingerprint
+
+TO_CONTEXT = 'to_context'
+TO_APPCOLORS = 'to_appcolors'
+BOTH = 'both'
+
+# (AppColors member, context getter, direction the pair applies in)
+COLOR_TABLE = [
+    ('primary', 'appPrimary', BOTH),
+    ('primaryLight', 'appPrimaryLight', BOTH),
+    ('primaryDark', 'appPrimaryDark', BOTH),
+    ('secondary', 'appSecondary', BOTH),
+    ('secondaryLight', 'appSecondaryLight', TO_APPCOLORS),
+    ('secondaryDark', 'appSecondaryDark', TO_APPCOLORS),
+    ('background', 'appBackground', BOTH),
+    ('surface', 'appSurface', BOTH),
+    ('surfaceVariant', 'appSurfaceVariant', BOTH),
+    ('surfaceElevated', 'appSurfaceElevated', TO_CONTEXT),
+    # surfaceElevated doesn't exist in AppColors
+    ('surfaceVariant', 'appSurfaceElevated', TO_APPCOLORS),
+    ('textPrimary', 'appTextPrimary', BOTH),
+    ('textSecondary', 'appTextSecondary', BOTH),
+    ('textTertiary', 'appTextTertiary', BOTH),
+    ('success', 'appSuccess', BOTH),
+    ('successLight', 'appSuccessLight', TO_APPCOLORS),
+    ('warning', 'appWarning', BOTH),
+    ('warningLight', 'appWarningLight', TO_APPCOLORS),
+    ('error', 'appError', BOTH),
+    ('errorLight', 'appErrorLight', TO_APPCOLORS),
+    ('info', 'appInfo', BOTH),
+    ('infoLight', 'appInfoLight', TO_APPCOLORS),
+    ('airborne', 'appAirborne', TO_APPCOLORS),
+    ('droplet', 'appDroplet', TO_APPCOLORS),
+    ('contact', 'appContact', TO_APPCOLORS),
+    ('enteric', 'appEnteric', TO_APPCOLORS),
+    ('protective', 'appProtective', TO_APPCOLORS),
+    ('neutral', 'appNeutral', TO_APPCOLORS),
+    ('neutralLight', 'appNeutralLight', TO_APPCOLORS),
+    ('neutralLighter', 'appNeutralLighter', TO_APPCOLORS),
+    ('neutralDark', 'appNeutralDark', TO_APPCOLORS),
+    ('interactive', 'appInteractive', BOTH),
+    ('interactiveLight', 'appInteractiveLight', TO_APPCOLORS),
+    ('interactiveDark', 'appInteractiveDark', TO_APPCOLORS),
+    ('interactiveBorderLight', 'appInteractiveBorderLight', TO_APPCOLORS),
+    ('interactiveBorderDark', 'appInteractiveBorderDark', TO_APPCOLORS),
+    ('border', 'appBorder', TO_CONTEXT),
+    ('divider', 'appDivider', TO_CONTEXT),
+]
+
+
+def color_mapping(direction):
+    """Source reference -> replacement for one direction of the table"""
+    mapping = {}
+    for member, getter, applies in COLOR_TABLE:
+        if applies not in (BOTH, direction):
+            continue
+        if direction == TO_CONTEXT:
+            mapping[f'AppColors.{member}'] = f'context.{getter}'
+        else:
+            mapping[f'context.{getter}'] = f'AppColors.{member}'
+    return mapping
+
+
+# Comments and string literals, which are copied through untouched
+_SKIP = (
+    r"//[^\n]*"
+    r"|/\*.*?\*/"
+    r"|(?<![\w$])r?'''.*?'''"
+    r'|(?<![\w$])r?""".*?"""'
+    r"|(?<![\w$])r'[^'\n]*'"
+    r'|(?<![\w$])r"[^"\n]*"'
+    r"|'(?:\\.|[^'\\\n])*'"
+    r'|"(?:\\.|[^"\\\n])*"'
+)
+
+
+class Codemod:
+    """Single-pass, whole-identifier rewrite of member references"""
+
+    def __init__(self, mapping):
+        self.mapping = dict(mapping)
+        # Longest first, and an identifier boundary on both sides
+        names = '|'.join(re.escape(name) for name in sorted(self.mapping, key=len, reverse=True))
+        self.pattern = re.compile(
+            rf"(?P<skip>{_SKIP})|(?<![\w$.])(?P<name>{names})(?![\w$])",
+            re.DOTALL,
+        )
+
+    def rewrite(self, source):
+        """Return (rewritten source, number of replacements)"""
+        count = 0
+
+        def replace(match):
+            nonlocal count
+            name = match.group('name')
+            if name is None:
+                return match.group(0)
+            count += 1
+            return self.mapping[name]
+
+        return self.pattern.sub(replace, source), count
+
+
+def unified_diff(path, before, after):
+    """Unified diff text for a dry run"""
+    return ''.join(difflib.unified_diff(
+        before.splitlines(keepends=True),
+        after.splitlines(keepends=True),
+        fromfile=f'a/{path}',
+        tofile=f'b/{path}',
+    ))
+
+
+_CODEMODS = {}
+
+
+def codemod_for(direction):
+    """The compiled Codemod for a direction (built once per process)"""
+    if direction not in _CODEMODS:
+        _CODEMODS[direction] = Codemod(color_mapping(direction))
+    return _CODEMODS[direction]
+
+
+def atomic_write(path, text):
+    """Replace a file's contents without ever leaving it half written"""
+    path = Path(path)
+    mode = stat.S_IMODE(path.stat().st_mode)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def rewrite_file(direction, file_path, dry_run=False):
+    """Rewrite one file; returns (replacements, unified diff or None)"""
+    with open(file_path, 'r', encoding='utf-8', newline='') as f:
+        content = f.read()
+    new_content, replacements = codemod_for(direction).rewrite(content)
+    if new_content == content:
+        return 0, None
+    if not dry_run:
+        atomic_write(file_path, new_content)
+    return replacements, unified_diff(file_path, content, new_content)
+
+
+def manifest_for(direction, enabled=True):
+    """Content-hash manifest of the files a direction has already processed"""
+    ruleset = ruleset_fingerprint({'direction': direction, 'mapping': color_mapping(direction)}, [__file__])
+    return ValidationCache(f'codemod_{direction}', ruleset, enabled=enabled)
+
+
+def git_changed_files(revision, root):
+    """Resolved paths under root that differ from a git revision, untracked files included"""
+    top = subprocess.run(['git', '-C', str(root), 'rev-parse', '--show-toplevel'],
+                         capture_output=True, text=True, check=True).stdout.strip()
+    commands = [
+        ['git', '-C', top, 'diff', '--name-only', '-z', revision, '--', str(Path(root).resolve())],
+        ['git', '-C', top, 'ls-files', '--others', '--exclude-standard', '--full-name', '-z',
+         '--', str(Path(root).resolve())],
+    ]
+    changed = set()
+    for command in commands:
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        changed.update((Path(top) / name).resolve() for name in output.split('\0') if name)
+    return changed
+
+
+def codemod_files(direction, files, jobs=1, dry_run=False, manifest=None, changed_only=False):
+    """
+    Yield (file_path, replacements, diff, error) for each file in the given
+    order. With changed_only, files whose content matches the manifest are
+    skipped (reported as unmodified). With jobs > 1 the files are rewritten
+    in a process pool; results still come back in file order, so the report
+    is the same as a serial run.
+    """
+    pending = []
+    for file_path in files:
+        if changed_only and manifest is not None:
+            _, result = manifest.get(file_path)
+            if result is not None:
+                continue
+        pending.append(file_path)
+    pending_set = set(pending)
+
+    def record(file_path):
+        if manifest is not None and not dry_run:
+            try:
+                manifest.put(file_path, manifest.key_for(file_path), 0)
+            except OSError:
+                pass
+
+    if jobs <= 1 or len(pending) <= 1:
+        for file_path in files:
+            if file_path not in pending_set:
+                yield file_path, 0, None, None
+                continue
+            try:
+                replacements, diff = rewrite_file(direction, file_path, dry_run)
+            except Exception as e:
+                yield file_path, 0, None, e
+                continue
+            record(file_path)
+            yield file_path, replacements, diff, None
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as executor:
+        futures = {
+            file_path: executor.submit(rewrite_file, direction, file_path, dry_run)
+            for file_path in sorted(pending, key=lambda path: path.stat().st_size, reverse=True)
+        }
+        for file_path in files:
+            if file_path not in pending_set:
+                yield file_path, 0, None, None
+                continue
+            try:
+                replacements, diff = futures[file_path].result()
+            except Exception as e:
+                yield file_path, 0, None, e
+                continue
+            record(file_path)
+            yield file_path, replacements, diff, None
@@ -4,64 +4,17 @@ Script to convert hardcoded AppColors to theme-aware context.appX colors.
 This script processes all Dart files in the project and replaces AppColors.X with context.appX.
 """
 
-import re
+import argparse
 import os
+import subprocess
+import sys
 from pathlib import Path
-from typing import List, Tuple
+from typing import List
 
-# Color mappings from AppColors.X to context.appX
-COLOR_MAPPINGS = {
-    'AppColors.primary': 'context.appPrimary',
-    'AppColors.primaryLight': 'context.appPrimaryLight',
-    'AppColors.primaryDark': 'context.appPrimaryDark',
-    'AppColors.secondary': 'context.appSecondary',
-    'AppColors.background': 'context.appBackground',
-    'AppColors.surface': 'context.appSurface',
-    'AppColors.surfaceVariant': 'context.appSurfaceVariant',
-    'AppColors.surfaceElevated': 'context.appSurfaceElevated',
-    'AppColors.error': 'context.appError',
-    'AppColors.success': 'context.appSuccess',
-    'AppColors.warning': 'context.appWarning',
-    'AppColors.info': 'context.appInfo',
-    'AppColors.textPrimary': 'context.appTextPrimary',
-    'AppColors.textSecondary': 'context.appTextSecondary',
-    'AppColors.textTertiary': 'context.appTextTertiary',
-    'AppColors.interactive': 'context.appInteractive',
-    'AppColors.border': 'context.appBorder',
-    'AppColors.divider': 'context.appDivider',
-}
+from color_codemod import TO_CONTEXT, codemod_files, color_mapping, git_changed_files, manifest_for
 
-def convert_file(file_path: Path) -> Tuple[int, bool]:
-    """
-    Convert AppColors references to context.appX in a single file.
-    Returns: (number_of_replacements, was_modified)
-    """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original_content = content
-        replacements = 0
-        
-        # Replace each color mapping
-        for old_color, new_color in COLOR_MAPPINGS.items():
-            # Count occurrences
-            count = content.count(old_color)
-            if count > 0:
-                content = content.replace(old_color, new_color)
-                replacements += count
-        
-        # Only write if changes were made
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return replacements, True
-        
-        return 0, False
-    
-    except Exception as e:
-        print(f"❌ Error processing {file_path}: {e}")
-        return 0, False
+# Color mappings from AppColors.X to context.appX (shared table in color_codemod.py)
+COLOR_MAPPINGS = color_mapping(TO_CONTEXT)
 
 def find_dart_files(root_dir: Path, exclude_dirs: List[str] = None) -> List[Path]:
     """Find all Dart files in the project, excluding specified directories."""
@@ -79,24 +32,49 @@ def find_dart_files(root_dir: Path, exclude_dirs: List[str] = None) -> List[Path
 
 def main():
     """Main function to convert all Dart files."""
+    parser = argparse.ArgumentParser(description='Convert AppColors.X to theme-aware context.appX.')
+    parser.add_argument('--dry-run', action='store_true', help='print a unified diff instead of writing files')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='number of worker processes (1 = serial, 0 = one per CPU)')
+    parser.add_argument('--changed-only', nargs='?', const='', metavar='REV',
+                        help='only files changed since the last run, or against git revision REV')
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    
     # Get project root (assuming script is in scripts/ directory)
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
     
     print("🔍 Scanning for Dart files...")
-    dart_files = find_dart_files(project_root / 'lib')
+    dart_files = sorted(find_dart_files(project_root / 'lib'))
     print(f"📁 Found {len(dart_files)} Dart files\n")
     
+    if args.changed_only:
+        try:
+            changed = git_changed_files(args.changed_only, project_root / 'lib')
+        except subprocess.CalledProcessError as e:
+            print(f"❌ git failed for revision '{args.changed_only}': {e.stderr.strip()}")
+            sys.exit(1)
+        dart_files = [f for f in dart_files if f.resolve() in changed]
+        print(f"📁 {len(dart_files)} changed against {args.changed_only}\n")
+    manifest = manifest_for(TO_CONTEXT)
+    
     print("🔄 Converting AppColors to theme-aware colors...\n")
     print("=" * 80)
     
     total_replacements = 0
     modified_files = 0
     
-    for dart_file in dart_files:
-        replacements, was_modified = convert_file(dart_file)
+    results = codemod_files(TO_CONTEXT, dart_files, jobs, args.dry_run, manifest,
+                            changed_only=args.changed_only == '')
+    for dart_file, replacements, diff, error in results:
+        if error is not None:
+            print(f"❌ Error processing {dart_file}: {error}")
+            continue
+        if args.dry_run and diff:
+            print(diff, end='')
         
-        if was_modified:
+        if diff:
             modified_files += 1
             total_replacements += replacements
             relative_path = dart_file.relative_to(project_root)
@@ -104,11 +82,18 @@ def main():
             print(f"   └─ {replacements} replacements")
     
     print("=" * 80)
-    print(f"\n🎉 CONVERSION COMPLETE!")
+    if args.dry_run:
+        print(f"\n🔎 DRY RUN - no files were written")
+    else:
+        print(f"\n🎉 CONVERSION COMPLETE!")
     print(f"   📝 Modified files: {modified_files}/{len(dart_files)}")
     print(f"   🔄 Total replacements: {total_replacements}")
+    if args.changed_only == '':
+        print(f"   ⏭️  Unchanged since last run: {manifest.hits}")
+    if not args.dry_run:
+        manifest.save()
     
-    if modified_files > 0:
+    if modified_files > 0 and not args.dry_run:
         print(f"\n💡 Next steps:")
         print(f"   1. Run 'flutter analyze' to check for any issues")
         print(f"   2. Test the app in both light and dark modes")
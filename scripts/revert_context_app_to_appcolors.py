@@ -4,96 +4,54 @@ Revert all context.appX back to AppColors.X
 This script reverts the theme-aware color changes back to direct AppColors usage.
 """
 
+import argparse
 import os
-import re
+import subprocess
+import sys
 from pathlib import Path
 
-# Mapping of context.appX to AppColors.X
-REPLACEMENTS = {
-    'context.appBackground': 'AppColors.background',
-    'context.appSurface': 'AppColors.surface',
-    'context.appSurfaceVariant': 'AppColors.surfaceVariant',
-    'context.appSurfaceElevated': 'AppColors.surfaceVariant',  # Note: surfaceElevated doesn't exist in AppColors
-    
-    'context.appTextPrimary': 'AppColors.textPrimary',
-    'context.appTextSecondary': 'AppColors.textSecondary',
-    'context.appTextTertiary': 'AppColors.textTertiary',
-    
-    'context.appPrimary': 'AppColors.primary',
-    'context.appPrimaryLight': 'AppColors.primaryLight',
-    'context.appPrimaryDark': 'AppColors.primaryDark',
-    
-    'context.appSecondary': 'AppColors.secondary',
-    'context.appSecondaryLight': 'AppColors.secondaryLight',
-    'context.appSecondaryDark': 'AppColors.secondaryDark',
-    
-    'context.appSuccess': 'AppColors.success',
-    'context.appSuccessLight': 'AppColors.successLight',
-    'context.appWarning': 'AppColors.warning',
-    'context.appWarningLight': 'AppColors.warningLight',
-    'context.appError': 'AppColors.error',
-    'context.appErrorLight': 'AppColors.errorLight',
-    'context.appInfo': 'AppColors.info',
-    'context.appInfoLight': 'AppColors.infoLight',
-    
-    'context.appAirborne': 'AppColors.airborne',
-    'context.appDroplet': 'AppColors.droplet',
-    'context.appContact': 'AppColors.contact',
-    'context.appEnteric': 'AppColors.enteric',
-    'context.appProtective': 'AppColors.protective',
-    
-    'context.appNeutral': 'AppColors.neutral',
-    'context.appNeutralLight': 'AppColors.neutralLight',
-    'context.appNeutralLighter': 'AppColors.neutralLighter',
-    'context.appNeutralDark': 'AppColors.neutralDark',
-    
-    'context.appInteractive': 'AppColors.interactive',
-    'context.appInteractiveLight': 'AppColors.interactiveLight',
-    'context.appInteractiveDark': 'AppColors.interactiveDark',
-    'context.appInteractiveBorderLight': 'AppColors.interactiveBorderLight',
-    'context.appInteractiveBorderDark': 'AppColors.interactiveBorderDark',
-}
+from color_codemod import TO_APPCOLORS, codemod_files, color_mapping, git_changed_files, manifest_for
 
-def process_file(file_path):
-    """Process a single Dart file and revert context.appX to AppColors.X"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original_content = content
-        replacements_made = 0
-        
-        # Apply all replacements
-        for old_pattern, new_pattern in REPLACEMENTS.items():
-            count = content.count(old_pattern)
-            if count > 0:
-                content = content.replace(old_pattern, new_pattern)
-                replacements_made += count
-        
-        # Only write if changes were made
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return replacements_made
-        
-        return 0
-    except Exception as e:
-        print(f"❌ Error processing {file_path}: {e}")
-        return 0
+# Mapping of context.appX to AppColors.X (shared table in color_codemod.py;
+# context.appSurfaceElevated maps to AppColors.surfaceVariant)
+REPLACEMENTS = color_mapping(TO_APPCOLORS)
 
 def main():
+    parser = argparse.ArgumentParser(description='Revert theme-aware context.appX back to AppColors.X.')
+    parser.add_argument('--dry-run', action='store_true', help='print a unified diff instead of writing files')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='number of worker processes (1 = serial, 0 = one per CPU)')
+    parser.add_argument('--changed-only', nargs='?', const='', metavar='REV',
+                        help='only files changed since the last run, or against git revision REV')
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    
     print("🔄 Reverting context.appX back to AppColors.X...\n")
     print("=" * 60)
     
     # Find all Dart files in lib directory
     lib_dir = Path('lib')
-    dart_files = list(lib_dir.rglob('*.dart'))
+    dart_files = sorted(lib_dir.rglob('*.dart'))
+    if args.changed_only:
+        try:
+            changed = git_changed_files(args.changed_only, lib_dir)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ git failed for revision '{args.changed_only}': {e.stderr.strip()}")
+            sys.exit(1)
+        dart_files = [f for f in dart_files if f.resolve() in changed]
+    manifest = manifest_for(TO_APPCOLORS)
     
     total_replacements = 0
     files_modified = 0
     
-    for dart_file in dart_files:
-        replacements = process_file(dart_file)
+    results = codemod_files(TO_APPCOLORS, dart_files, jobs, args.dry_run, manifest,
+                            changed_only=args.changed_only == '')
+    for dart_file, replacements, diff, error in results:
+        if error is not None:
+            print(f"❌ Error processing {dart_file}: {error}")
+            continue
+        if args.dry_run and diff:
+            print(diff, end='')
         if replacements > 0:
             files_modified += 1
             total_replacements += replacements
@@ -101,9 +59,17 @@ def main():
             print(f"   └─ {replacements} replacements")
     
     print("=" * 60)
-    print(f"\n🎉 REVERT COMPLETE!")
+    if args.dry_run:
+        print(f"\n🔎 DRY RUN - no files were written")
+    else:
+        print(f"\n🎉 REVERT COMPLETE!")
     print(f"   📁 Files modified: {files_modified}")
-    print(f"   🔄 Total replacements: {total_replacements}\n")
+    print(f"   🔄 Total replacements: {total_replacements}")
+    if args.changed_only == '':
+        print(f"   ⏭️  Unchanged since last run: {manifest.hits}")
+    print()
+    if not args.dry_run:
+        manifest.save()
 
 if __name__ == '__main__':
     main()
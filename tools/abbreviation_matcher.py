@@ -0,0 +1,82 @@
+"""
+Single-pass matcher for medical abbreviation capitalization.
+
+The validators used to compile and run one regex per abbreviation for every
+content string. AbbreviationMatcher compiles the whole abbreviation list once
+into a single case-insensitive trie-shaped regex and finds every hit in one
+scan per string, reporting the same findings as the per-abbreviation loop.
+"""
+
+import re
+
+
+def _trie_regex(words):
+    """Build a regex alternation shaped like a trie over lowercase words"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        terminal = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            # Greedy optional suffix: the longest abbreviation wins, shorter ones on backtrack
+            return f'(?:{body})?'
+        return body
+
+    return build(trie)
+
+
+class AbbreviationMatcher:
+    """Finds abbreviations written with the wrong capitalization in one scan per string"""
+
+    def __init__(self, abbreviations):
+        # Keep first-seen order so findings come out in the configured order
+        self.abbreviations = list(dict.fromkeys(abbreviations))
+        self._order = {abbr.lower(): i for i, abbr in enumerate(self.abbreviations)}
+        self._canonical = {abbr.lower(): abbr for abbr in self.abbreviations}
+
+        # Shorter abbreviations that are word-bounded prefixes of a longer one
+        # (e.g. TMP inside TMP-SMX) are reported from the longer hit.
+        self._prefixes = {}
+        for abbr in self._canonical:
+            self._prefixes[abbr] = [
+                other for other in self._canonical
+                if other != abbr and abbr.startswith(other) and not _is_word_char(abbr[len(other)])
+            ]
+
+        # Zero-width lookahead so a hit never hides another one starting inside it
+        self.pattern = re.compile(r'\b(?=(' + _trie_regex(self._canonical) + r')\b)', re.IGNORECASE)
+
+    def find_miscased(self, text):
+        """
+        Return [(abbreviation, {incorrect spellings})] for one string,
+        ordered like the configured abbreviation list.
+        """
+        found = {}
+        last_end = {}
+        for match in self.pattern.finditer(text):
+            start = match.start(1)
+            hit = match.group(1)
+            key = hit.lower()
+            for abbr in [key] + self._prefixes[key]:
+                end = start + len(abbr)
+                # Same non-overlapping semantics as findall() per abbreviation
+                if last_end.get(abbr, -1) > start:
+                    continue
+                last_end[abbr] = end
+                spelled = text[start:end]
+                if spelled != self._canonical[abbr]:
+                    found.setdefault(abbr, set()).add(spelled)
+
+        return [(self._canonical[abbr], found[abbr]) for abbr in sorted(found, key=self._order.get)]
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
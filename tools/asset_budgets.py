@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Size and parse-time budgets for every JSON asset under assets/data.
+
+Each file is measured for byte size, node count (every object, array and
+scalar), maximum nesting depth and JSON decode time (best of --repeat runs
+of json.loads, a proxy for the app's first-load decode cost), and checked
+against the budget of its asset family (tools/asset_schemas.py). A file
+over a size, node or depth budget fails the run with the measurement, the
+limit and the overshoot; files above WARN_RATIO of a budget are flagged
+early. Decode time depends on the machine, so it is compared against its
+budget but only warned about, unless --gate-timing makes it fail too.
+
+Every run is appended to build/content_tools/budgets/history.jsonl with the
+git revision, and the report shows each file's growth since the previous
+run, so trends are visible before a budget is hit.
+
+Budgets live in BUDGETS below; --budgets PATH merges overrides from a JSON
+file of the same shape ({"cds": {"bytes": 409600}}). Its keys must be
+asset family names or "default"; anything else is rejected.
+
+Usage: python tools/asset_budgets.py [--repeat N] [--budgets PATH] [--no-history] [--gate-timing]
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from asset_schemas import FAMILIES, family_for
+from git_revision import git_revision
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+ASSETS_DIR = Path('assets/data')
+HISTORY_PATH = Path('build/content_tools/budgets/history.jsonl')
+KB = 1024
+
+# Per-family limits; families not listed use DEFAULT_BUDGET
+BUDGETS = {
+    'cds': {'bytes': 384 * KB, 'nodes': 3000, 'depth': 12, 'decode_ms': 4.0},
+    'learning modules': {'bytes': 320 * KB, 'nodes': 2000, 'depth': 10, 'decode_ms': 3.0},
+    'outbreak groups': {'bytes': 128 * KB, 'nodes': 1500, 'depth': 8, 'decode_ms': 1.5},
+    'quiz': {'bytes': 96 * KB, 'nodes': 1200, 'depth': 8, 'decode_ms': 1.5},
+}
+DEFAULT_BUDGET = {'bytes': 128 * KB, 'nodes': 2500, 'depth': 10, 'decode_ms': 2.0}
+WARN_RATIO = 0.9
+# Deterministic metrics; the others (decode_ms) only fail the run with --gate-timing
+GATED_METRICS = ('bytes', 'nodes', 'depth')
+
+METRIC_LABELS = {'bytes': 'size', 'nodes': 'nodes', 'depth': 'depth', 'decode_ms': 'decode time'}
+
+
+def format_metric(metric, value):
+    if metric == 'bytes':
+        return f"{value / KB:.1f} KB"
+    if metric == 'decode_ms':
+        return f"{value:.2f} ms"
+    return str(value)
+
+
+def shape(data):
+    """(node count, max depth) of a decoded document"""
+    nodes = 0
+    max_depth = 0
+    stack = [(data, 1)]
+    while stack:
+        value, depth = stack.pop()
+        nodes += 1
+        if depth > max_depth:
+            max_depth = depth
+        if isinstance(value, dict):
+            stack.extend((item, depth + 1) for item in value.values())
+        elif isinstance(value, list):
+            stack.extend((item, depth + 1) for item in value)
+    return nodes, max_depth
+
+
+def decode_ms(raw, repeat):
+    """Best-of-N milliseconds for json.loads"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        json.loads(raw)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def measure(filepath, repeat):
+    raw = filepath.read_bytes()
+    nodes, depth = shape(json.loads(raw))
+    return {'bytes': len(raw), 'nodes': nodes, 'depth': depth, 'decode_ms': round(decode_ms(raw, repeat), 3)}
+
+
+def load_budgets(path=None):
+    """Limits by family name plus 'default', with a JSON override file's limits merged in"""
+    budgets = {family: dict(limits) for family, limits in BUDGETS.items()}
+    budgets['default'] = dict(DEFAULT_BUDGET)
+    if path:
+        known = {family.name for family in FAMILIES} | {'default'}
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+        for family, limits in overrides.items():
+            if family not in known:
+                raise ValueError(f"'{family}' is not an asset family (expected 'default' or one of: "
+                                 f"{', '.join(sorted(known - {'default'}))})")
+            unknown = sorted(set(limits) - set(DEFAULT_BUDGET))
+            if unknown:
+                raise ValueError(f"'{family}': unknown metric(s) {', '.join(unknown)} "
+                                 f"(expected {', '.join(DEFAULT_BUDGET)})")
+            budgets.setdefault(family, dict(DEFAULT_BUDGET)).update(limits)
+    return budgets
+
+
+def check(metrics, budget, gate_timing=False):
+    """(breaches, warnings) as (metric, value, limit) for one file"""
+    breaches, warnings = [], []
+    for metric, limit in budget.items():
+        value = metrics[metric]
+        if value > limit:
+            gated = gate_timing or metric in GATED_METRICS
+            (breaches if gated else warnings).append((metric, value, limit))
+        elif value > limit * WARN_RATIO:
+            warnings.append((metric, value, limit))
+    return breaches, warnings
+
+
+def previous_run(history):
+    """Metrics by file from the last history entry, or {}"""
+    try:
+        with open(history, 'r', encoding='utf-8') as f:
+            last = None
+            for line in f:
+                if line.strip():
+                    last = line
+    except OSError:
+        return {}
+    try:
+        return json.loads(last)['files'] if last else {}
+    except (ValueError, KeyError):
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check assets/data files against size and parse-time budgets.')
+    parser.add_argument('--repeat', type=int, default=20, help='decode timing runs per file (best is kept)')
+    parser.add_argument('--budgets', help='JSON file of per-family budget overrides')
+    parser.add_argument('--history', default=str(HISTORY_PATH), help='history file the run is appended to')
+    parser.add_argument('--no-history', action='store_true', help='do not append this run to the history')
+    parser.add_argument('--gate-timing', action='store_true',
+                        help='fail on decode time budgets too (machine-dependent; warn-only by default)')
+    args = parser.parse_args()
+
+    files = sorted(ASSETS_DIR.rglob('*.json'))
+    if not files:
+        print(f"❌ No JSON files found in {ASSETS_DIR}")
+        sys.exit(1)
+    try:
+        budgets = load_budgets(args.budgets)
+    except (OSError, ValueError) as e:
+        print(f"❌ Cannot load budgets from {args.budgets}: {e}")
+        sys.exit(1)
+    history = Path(args.history)
+    previous = previous_run(history)
+
+    print("=" * 80)
+    print("ASSET BUDGETS")
+    print("=" * 80)
+    header = f"{'file':<48}{'size':>10}{'growth':>10}{'nodes':>7}{'depth':>6}{'decode':>9}"
+    print(header)
+    print("-" * len(header))
+
+    results = {}
+    failures = []
+    near = []
+    for filepath in files:
+        name = filepath.relative_to(ASSETS_DIR).as_posix()
+        try:
+            metrics = measure(filepath, args.repeat)
+        except (OSError, ValueError) as e:
+            failures.append(f"{name}: could not be measured ({e})")
+            continue
+        results[name] = metrics
+        family = family_for(name)
+        family_name = family.name if family else None
+        breaches, warnings = check(metrics, budgets.get(family_name, budgets['default']), args.gate_timing)
+
+        growth = ''
+        if name in previous:
+            delta = metrics['bytes'] - previous[name]['bytes']
+            growth = f"{delta / KB:+.1f}KB" if delta else '='
+        marker = "❌" if breaches else ("⚠️ " if warnings else "  ")
+        print(f"{name:<48}{metrics['bytes'] / KB:>8.1f}KB{growth:>10}{metrics['nodes']:>7}{metrics['depth']:>6}"
+              f"{metrics['decode_ms']:>7.2f}ms {marker}")
+
+        budget_name = family_name if family_name in budgets else 'default'
+        for metric, value, limit in breaches:
+            failures.append(f"{name}: {METRIC_LABELS[metric]} {format_metric(metric, value)} exceeds the "
+                            f"'{budget_name}' budget of {format_metric(metric, limit)} "
+                            f"(+{(value / limit - 1) * 100:.0f}%)")
+        for metric, value, limit in warnings:
+            if value > limit:
+                near.append(f"{name}: {METRIC_LABELS[metric]} {format_metric(metric, value)} exceeds the "
+                            f"'{budget_name}' budget of {format_metric(metric, limit)} "
+                            f"(+{(value / limit - 1) * 100:.0f}%; not gated without --gate-timing)")
+                continue
+            near.append(f"{name}: {METRIC_LABELS[metric]} {format_metric(metric, value)} is at "
+                        f"{value / limit * 100:.0f}% of the '{budget_name}' budget ({format_metric(metric, limit)})")
+
+    print("-" * len(header))
+    print(f"Total: {len(results)} files, {sum(m['bytes'] for m in results.values()) / KB:.1f} KB, "
+          f"{sum(m['decode_ms'] for m in results.values()):.1f} ms decode")
+    if previous:
+        added = sorted(set(results) - set(previous))
+        removed = sorted(set(previous) - set(results))
+        growth = sum(m['bytes'] for m in results.values()) - sum(m['bytes'] for m in previous.values())
+        print(f"Since the previous run: {growth / KB:+.1f} KB, {len(added)} file(s) added, {len(removed)} removed")
+
+    for warning in near:
+        print(f"⚠️  {warning}")
+
+    if not args.no_history:
+        history.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'files': results,
+        }
+        with open(history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        print(f"History: {history}")
+
+    if failures:
+        print(f"\n❌ {len(failures)} budget breach(es):")
+        for failure in failures:
+            print(f"   {failure}")
+        sys.exit(1)
+    print("\n✅ All assets within budget")
+
+
+if __name__ == '__main__':
+    main()
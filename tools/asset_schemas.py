@@ -0,0 +1,488 @@
+"""
+Declarative shape schemas for every asset family under assets/data.
+
+Each schema mirrors what the Dart model that loads the family reads (see
+the fromJson/fromMap factories under lib/features/*/). Fields the app
+hard-casts (`json['x'] as String`) are required with that type; fields it
+reads with a fallback (`as String? ?? ''`) are optional but must still have
+the right type when present, because a wrong type throws at load time.
+Enums the models resolve with `values.firstWhere(...)` are listed
+exhaustively. Schema syntax is described in schema_compiler.py.
+
+FAMILIES is compiled once at import; family_for() maps a file (relative to
+assets/data) to its family.
+"""
+
+from collections import Counter
+from fnmatch import fnmatch
+
+from schema_compiler import MapOf, OneOf, compile_schema
+
+LABELED_REFERENCE = {'label': 'string', 'url': 'string'}
+TITLED_REFERENCE = {'title': 'string', 'url': 'string'}
+
+CDS_SCHEMA = {
+    'version': 'integer',
+    'updatedAt': 'datetime',
+    'id': 'string',
+    'name': 'string',
+    'description': 'string',
+    'icon?': 'string|null',
+    'color?': 'string|null',
+    'references?': [LABELED_REFERENCE],
+    'conditions': [{
+        'id': 'string',
+        'name': 'string',
+        'synonyms?': ['string'],
+        'icd10?': ['string'],
+        'severity?': ['string'],
+        'shortDescription': 'string',
+        'sections': MapOf({
+            'id': 'string',
+            'title': 'string',
+            'content': MapOf('any'),
+            'references?': [LABELED_REFERENCE],
+        }),
+    }],
+}
+
+# Learning modules: antimicrobial_stewardship.v1.json and hand_hygiene.json
+SECTIONED_MODULE_SCHEMA = {
+    'version': 'integer',
+    'updatedAt': 'datetime',
+    'sections': [{
+        'id': 'string',
+        'name': 'string',
+        'category': 'string',
+        'description': 'string',
+        'pages': [{
+            'id': 'string',
+            'name': 'string',
+            'content': ['string'],
+            'keyPoints': ['string'],
+            'references': [LABELED_REFERENCE],
+        }],
+    }],
+}
+
+BUNDLES_SCHEMA = {
+    'version': 'integer',
+    'updatedAt': 'datetime',
+    'bundles': [{
+        'id': 'string',
+        'name': 'string',
+        'category': 'string',
+        'description': 'string',
+        'components': ['string'],
+        'rationale': 'string',
+        'implementation': 'string',
+        'keyPoints': ['string'],
+        'references': [LABELED_REFERENCE],
+    }],
+}
+
+# Phase/element layout kept alongside bundles.json (not loaded by the app yet)
+BUNDLES_V1_SCHEMA = {
+    'version': 'integer',
+    'bundles': [{
+        'id': 'string',
+        'name': 'string',
+        'scope': 'string',
+        'phases': [{
+            'phaseName': 'string',
+            'elements': [{'id': 'string', 'text': 'string'}],
+        }],
+        'references': ['string'],
+    }],
+}
+
+CALCULATOR_SCHEMA = {
+    'version': 'integer',
+    'updatedAt': 'datetime',
+    'domains': [{
+        'key': 'string',
+        'title': 'string',
+        'formulas': [{
+            'id': 'string',
+            'name': 'string',
+            'formula': 'string',
+            'purpose': 'string',
+            'inputs': [{
+                # FormulaInput accepts either 'key' or 'id'
+                'key?': 'string',
+                'id?': 'string',
+                'label': 'string',
+                'type': 'string',
+                'unitHint?': 'string',
+                'unit?': 'string',
+                'hint?': 'string|null',
+                'validation?': OneOf(MapOf('any'), 'null'),
+            }],
+            'resultUnit': 'string',
+            'overview': 'string',
+            'example': {
+                'values?': MapOf('any'),
+                'inputs?': MapOf('any'),
+                'worked?': 'string',
+                'calculation?': 'string',
+                'result': 'string',
+                'scenario?': 'string|null',
+                'description?': 'string|null',
+            },
+            'benchmark': 'string',
+            'interpretation': 'string',
+            'action': 'string',
+            'indications?': 'string|null',
+            'references': [LABELED_REFERENCE],
+        }],
+    }],
+}
+
+ISOLATION_ORGANISMS_SCHEMA = {
+    'version': 'integer',
+    'organisms': [{
+        'id': 'string',
+        'organism': 'string',
+        'synonyms': ['string'],
+        'isolationTypes': ['string'],
+        'ppe': ['string'],
+        'durationText': 'string',
+        'discontinueNotes': 'string',
+        'specialConsiderations': 'string',
+        'references': [LABELED_REFERENCE],
+    }],
+    'notes?': ['string'],
+}
+
+PPE_STEP = {'icon': 'string', 'title': 'string', 'note': 'string', 'warning?': 'string'}
+
+ISOLATION_PRINCIPLES_SCHEMA = {
+    'version': 'integer',
+    'visual?': {
+        'images': [{'path': 'string', 'title': 'string', 'description': 'string', 'type': 'string'}],
+        'description?': 'string',
+        'note?': 'string',
+    },
+    'donning': [PPE_STEP],
+    'doffing': [PPE_STEP],
+    'components': [{'type': 'string', 'color': 'string', 'items': ['string']}],
+    'commonMistakes': [{'mistake': 'string', 'fix': 'string'}],
+    'references': [LABELED_REFERENCE],
+}
+
+OUTBREAK_INDEX_SCHEMA = {
+    'version': 'integer',
+    'updatedAt': 'datetime',
+    'types': [{
+        'id': 'string',
+        'name': 'string',
+        'icon': 'string',
+        'color': 'string',
+        'groups': [{
+            'id': 'string',
+            'name': 'string',
+            'icon': 'string',
+            'pathogenCount': 'integer',
+            'dataFile': 'string',
+        }],
+    }],
+}
+
+# PathogenDetail reads every block with a fallback, so only the identity
+# fields are required; a block of the wrong type still fails the cast
+OUTBREAK_GROUP_SCHEMA = {
+    'version': 'integer',
+    'groupId': 'string',
+    'groupName': 'string',
+    'type?': 'string',
+    'updatedAt': 'datetime',
+    'pathogens': [{
+        'id': 'string',
+        'name': 'string',
+        'scientificName?': 'string|null',
+        'definition?': 'string|null',
+        'reservoir?': {'primary?': ['any'], 'secondary?': ['any'], 'notes?': 'string|null'},
+        'transmission?': {'mode?': 'string|null', 'routes?': ['any'], 'notes?': 'string|null'},
+        'incubationPeriod?': {
+            'range?': 'string|null',
+            'infectiousPeriod?': 'string|null',
+            'seasonality?': 'string|null',
+            'geographic?': 'string|null',
+        },
+        'riskFactors?': ['any'],
+        'clinicalFeatures?': {
+            'symptoms?': ['any'],
+            'complications?': ['any'],
+            'caseDefinition?': {'suspected?': 'string|null', 'confirmed?': 'string|null'},
+        },
+        'diagnosis?': ['any'],
+        'treatment?': 'string|null',
+        'infectionControl?': {
+            'precautions?': 'string|null',
+            'screening?': 'string|null',
+            'cohorting?': 'string|null',
+            'sourceControl?': 'string|null',
+            'environmental?': 'string|null',
+            'staffEducation?': 'string|null',
+        },
+        'outbreakTriggers?': ['any'],
+        'reportingCommunication?': ['any'],
+        'prevention?': ['any'],
+        'references': [{'label?': 'string|null', 'url?': 'string|null'}],
+    }],
+}
+
+QUIZ_SCHEMA = {
+    'title': 'string',
+    'description': 'string',
+    'version': 'string',
+    'module': 'string',
+    'totalStages': 'integer',
+    'questionsPerStage': 'integer',
+    'questions': [{
+        'id': 'string',
+        'module': 'string',
+        'stage': 'integer',
+        'question': 'string',
+        'options': ['string'],
+        'answerIndex': 'integer',
+        'explanation': 'string',
+        'references?': [LABELED_REFERENCE],
+    }],
+}
+
+ALLERGY_SCHEMA = {
+    'version': 'integer',
+    'updatedAt': 'datetime',
+    'drugClasses': [{
+        'id': 'string',
+        'name': 'string',
+        'drugs': ['string'],
+        'crossReactivity': MapOf({
+            'riskLevel': 'string',
+            'riskPercentage': 'number',
+            'condition': 'string',
+            'explanation': 'string',
+        }),
+        'safeAlternatives': [{
+            'drugName': 'string',
+            'drugClass': 'string',
+            'crossReactivityRisk': 'number',
+            'clinicalUse': 'string',
+            'dosingConsiderations': 'string',
+        }],
+    }],
+    'references': [TITLED_REFERENCE],
+}
+
+ALLERGY_MATRIX_SCHEMA = {
+    'version': 'integer',
+    'source': {'file': 'string', 'sha256': 'string', 'updatedAt': 'datetime'},
+    'drugs': ['string'],
+    'classes': [{'id': 'string', 'drugs': ['integer']}],
+    'rules': [{
+        'riskLevel': 'string',
+        'riskPercentage': 'number',
+        'condition': 'string',
+        'explanation': 'string',
+    }],
+    'matrix': ['integer'],
+}
+
+SPECTRUM_SCHEMA = {
+    'version': 'string',
+    'updatedAt': 'datetime',
+    'organisms': [{
+        'id': 'string',
+        'name': 'string',
+        'commonName': 'string',
+        'category': {'gramPositiveCocci', 'gramNegativeBacilli', 'anaerobes', 'atypical'},
+        'notes?': 'string|null',
+    }],
+    'antibiotics': [{
+        'id': 'string',
+        'name': 'string',
+        'genericName': 'string',
+        'class': 'string',
+        'spectrumBreadth': {'narrow', 'extended', 'broad'},
+        'clinicalUse?': 'string|null',
+        'keyPoints?': OneOf(['string'], 'null'),
+        'coverage': [{
+            'organismId': 'string',
+            'level': {'excellent', 'good', 'variable', 'poor', 'none'},
+            'notes?': 'string|null',
+        }],
+        'references': [LABELED_REFERENCE],
+    }],
+}
+
+RISK_BAND = {'min': 'integer', 'max': 'integer', 'probability': 'integer', 'label': 'string'}
+RISK_RECOMMENDATION = {'isolation': 'string', 'screening': 'string', 'empiricTherapy': 'string',
+                       'stewardship': ['string']}
+
+MDRO_RISK_SCHEMA = {
+    'version': 'integer',
+    'updatedAt': 'datetime',
+    'scoringRules': {
+        'age': MapOf('integer'),
+        'hospitalAdmission': MapOf('integer'),
+        'icuStay': MapOf('integer'),
+        'nursingHome': MapOf('integer'),
+        'hemodialysis': 'integer',
+        'surgery': 'integer',
+        'antibioticUse': MapOf('integer'),
+        'broadSpectrumAntibiotics': MapOf('integer'),
+        'invasiveDevices': MapOf('integer'),
+        'immunosuppression': MapOf('integer'),
+        'chronicConditions': MapOf('integer'),
+        'priorMdro': MapOf('integer'),
+        'internationalTravel': 'integer',
+        'knownMdroContact': 'integer',
+    },
+    'riskThresholds': {'low': RISK_BAND, 'moderate': RISK_BAND, 'high': RISK_BAND, 'veryHigh': RISK_BAND},
+    'organismRiskFactors': MapOf({'highRiskFactors': ['string'], 'moderateRiskFactors': ['string']}),
+    'recommendations': {'low': RISK_RECOMMENDATION, 'moderate': RISK_RECOMMENDATION,
+                        'high': RISK_RECOMMENDATION, 'veryHigh': RISK_RECOMMENDATION},
+    'references': [TITLED_REFERENCE],
+}
+
+PROPHYLAXIS_REGIMEN = {
+    'antibioticName': 'string',
+    'dose': 'string',
+    'route': 'string',
+    'timing': 'string',
+    'duration': 'string',
+    'redosingInterval?': 'string|null',
+    'rationale': 'string',
+    'warnings': ['string'],
+    'monitoring?': OneOf(['string'], 'null'),
+    'isAlternative?': 'boolean|null',
+}
+
+SURGICAL_PROPHYLAXIS_SCHEMA = {
+    'version': 'string',
+    'updatedAt': 'datetime',
+    'procedures': [{
+        'id': 'string',
+        'name': 'string',
+        'specialty': {'orthopedic', 'cardiac', 'gastrointestinal', 'gynecologic',
+                      'neurosurgery', 'urologic', 'vascular', 'general'},
+        # Hyphenated classifications are camel-cased by the model before the lookup
+        'classification': {'clean', 'cleanContaminated', 'clean-contaminated', 'contaminated', 'dirty'},
+        'description': 'string',
+        'primaryProphylaxis': PROPHYLAXIS_REGIMEN,
+        'betaLactamAllergyAlternative?': OneOf(PROPHYLAXIS_REGIMEN, 'null'),
+        'mrsaCoverageAddition?': OneOf(PROPHYLAXIS_REGIMEN, 'null'),
+        'specialConsiderations': ['string'],
+        'references': [LABELED_REFERENCE],
+    }],
+}
+
+
+def duplicate_ids(items, path):
+    """(path, message) for every repeated 'id' in a list of objects"""
+    counts = Counter(item.get('id') for item in items)
+    return [(f"{path}[{i}].id", f"duplicate id '{item['id']}'")
+            for i, item in enumerate(items) if item.get('id') is not None and counts[item['id']] > 1]
+
+
+def check_quiz(data):
+    errors = duplicate_ids(data['questions'], 'questions')
+    for i, question in enumerate(data['questions']):
+        path = f"questions[{i}]"
+        if len(question['options']) < 2:
+            errors.append((f"{path}.options", f"needs at least 2 options, has {len(question['options'])}"))
+        if not 0 <= question['answerIndex'] < len(question['options']):
+            errors.append((f"{path}.answerIndex",
+                           f"answerIndex {question['answerIndex']} is out of range for {len(question['options'])} options"))
+        if not 1 <= question['stage'] <= data['totalStages']:
+            errors.append((f"{path}.stage", f"stage {question['stage']} is outside 1..{data['totalStages']}"))
+    return errors
+
+
+def check_spectrum(data):
+    errors = duplicate_ids(data['organisms'], 'organisms') + duplicate_ids(data['antibiotics'], 'antibiotics')
+    organisms = {organism['id'] for organism in data['organisms']}
+    for i, antibiotic in enumerate(data['antibiotics']):
+        for j, coverage in enumerate(antibiotic['coverage']):
+            if coverage['organismId'] not in organisms:
+                errors.append((f"antibiotics[{i}].coverage[{j}].organismId",
+                               f"unknown organism '{coverage['organismId']}'"))
+    return errors
+
+
+def check_allergy_matrix(data):
+    errors = duplicate_ids(data['classes'], 'classes')
+    n = len(data['drugs'])
+    if len(data['matrix']) != n * n:
+        errors.append(('matrix', f"has {len(data['matrix'])} cells, {n} drugs need {n * n}"))
+    for i, code in enumerate(data['matrix']):
+        if not 0 <= code < len(data['rules']):
+            errors.append((f"matrix[{i}]", f"rule {code} does not exist"))
+    for i, drug_class in enumerate(data['classes']):
+        for j, drug in enumerate(drug_class['drugs']):
+            if not 0 <= drug < n:
+                errors.append((f"classes[{i}].drugs[{j}]", f"drug {drug} does not exist"))
+    return errors
+
+
+def check_unique_ids(list_field):
+    def check(data):
+        return duplicate_ids(data[list_field], list_field)
+    return check
+
+
+class AssetFamily:
+    """Files under assets/data that share one schema, plus consistency checks run once the shape is valid"""
+
+    def __init__(self, name, patterns, schema, checks=()):
+        self.name = name
+        self.patterns = patterns
+        self.checks = checks
+        self.check = compile_schema(schema)
+
+    def matches(self, relative_path):
+        return any(fnmatch(relative_path, pattern) for pattern in self.patterns)
+
+    def validate(self, data):
+        """List of (json_path, message); the consistency checks only run on well-shaped data"""
+        errors = []
+        self.check(data, '', errors)
+        if not errors:
+            for check in self.checks:
+                errors.extend(check(data))
+        return errors
+
+
+FAMILIES = [
+    AssetFamily('cds', ['cds/*.json'], CDS_SCHEMA, [check_unique_ids('conditions')]),
+    AssetFamily('outbreak index', ['outbreak_groups/index.v1.json'], OUTBREAK_INDEX_SCHEMA),
+    AssetFamily('outbreak groups', ['outbreak_groups/*/*.json'], OUTBREAK_GROUP_SCHEMA,
+                [check_unique_ids('pathogens')]),
+    AssetFamily('quiz', ['quiz_*.json'], QUIZ_SCHEMA, [check_quiz]),
+    AssetFamily('learning modules', ['hand_hygiene.json', 'antimicrobial_stewardship.v1.json'],
+                SECTIONED_MODULE_SCHEMA, [check_unique_ids('sections')]),
+    AssetFamily('bundles', ['bundles.json'], BUNDLES_SCHEMA, [check_unique_ids('bundles')]),
+    AssetFamily('bundles v1', ['bundles.v1.json'], BUNDLES_V1_SCHEMA, [check_unique_ids('bundles')]),
+    AssetFamily('isolation organisms', ['isolation_organisms.v1.json'], ISOLATION_ORGANISMS_SCHEMA,
+                [check_unique_ids('organisms')]),
+    AssetFamily('isolation principles', ['isolation_principles.v1.json'], ISOLATION_PRINCIPLES_SCHEMA),
+    AssetFamily('calculator', ['calculator/*.json'], CALCULATOR_SCHEMA),
+    AssetFamily('allergy cross-reactivity', ['stewardship/allergy_cross_reactivity_rules.json'], ALLERGY_SCHEMA,
+                [check_unique_ids('drugClasses')]),
+    AssetFamily('allergy matrix', ['stewardship/allergy_cross_reactivity_matrix.json'], ALLERGY_MATRIX_SCHEMA,
+                [check_allergy_matrix]),
+    AssetFamily('antibiotic spectrum', ['stewardship/antibiotic_spectrum_data.json'], SPECTRUM_SCHEMA,
+                [check_spectrum]),
+    AssetFamily('MDRO risk scoring', ['stewardship/mdro_risk_scoring.json'], MDRO_RISK_SCHEMA),
+    AssetFamily('surgical prophylaxis', ['stewardship/surgical_prophylaxis_data.json'],
+                SURGICAL_PROPHYLAXIS_SCHEMA, [check_unique_ids('procedures')]),
+]
+
+
+def family_for(relative_path):
+    """The family a file belongs to (path relative to assets/data, '/'-separated), or None"""
+    for family in FAMILIES:
+        if family.matches(relative_path):
+            return family
+    return None
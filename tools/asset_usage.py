@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Find assets/data files the app never reads and asset paths it reads that don't exist.
+
+Every Dart file under lib/ is scanned (in a process pool) with one compiled
+pattern set that picks out three things: const String declarations, string
+literals that are or build an asset path ('assets/...', '$_basePath...'),
+and plain word literals ('surgical-prophylaxis'). References are then
+resolved:
+- const names interpolated into a literal are substituted
+  ('$_groupBasePath$dataFile' -> 'assets/data/outbreak_groups/$dataFile')
+- a remaining $dataFile is expanded to every dataFile listed in
+  outbreak_groups/index.v1.json
+- any other interpolation becomes a wildcard
+  ('assets/data/cds/$categoryId.v1.json'). A file matching it counts as
+  read when each wildcard's value also appears as a literal in the same
+  Dart file (the category ids), or when that file has no such literals at
+  all
+
+Reported:
+- assets/data files nothing resolves to, with the bytes dropping them would save
+  (files in EXPECTED_UNUSED, shipped ahead of the Dart code that reads them,
+  are listed separately and don't count)
+- exact references (and index dataFiles) that point at missing files
+- referenced files whose directory pubspec.yaml doesn't bundle
+
+Usage: python tools/asset_usage.py [--jobs N] [--strict]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+LIB_DIR = Path('lib')
+ASSETS_DIR = Path('assets/data')
+PUBSPEC = Path('pubspec.yaml')
+OUTBREAK_INDEX = ASSETS_DIR / 'outbreak_groups' / 'index.v1.json'
+
+DART_PATTERNS = re.compile(r"""
+    \bconst\s+(?:String\s+)?(?P<const>\w+)\s*=\s*(?P<cq>['"])(?P<value>[^'"\n]*)(?P=cq)
+  | (?P<lq>['"])(?P<literal>(?:assets/|\$\{?\w+\}?)[^'"\n]*)(?P=lq)
+  | (?P<wq>['"])(?P<word>[A-Za-z0-9][A-Za-z0-9._-]*)(?P=wq)
+""", re.VERBOSE)
+INTERPOLATION = re.compile(r'\$\{?([A-Za-z_][\w.]*?)\}?(?=[^\w]|$)')
+WILDCARD_VALUE = '[A-Za-z0-9._-]+'
+
+
+def scan_dart(filepath):
+    """(file, {const: value}, [(line, literal)], {word literals}) for one Dart file"""
+    text = filepath.read_text(encoding='utf-8', errors='replace')
+    consts, literals, words = {}, [], set()
+    for match in DART_PATTERNS.finditer(text):
+        line = text.count('\n', 0, match.start()) + 1
+        if match.group('const'):
+            consts[match.group('const')] = match.group('value')
+            literals.append((line, match.group('value')))
+        elif match.group('literal'):
+            literals.append((line, match.group('literal')))
+        else:
+            words.add(match.group('word'))
+    return filepath.as_posix(), consts, literals, words
+
+
+def outbreak_data_files():
+    """dataFile values from the outbreak index, or [] if it can't be read"""
+    try:
+        with open(OUTBREAK_INDEX, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        return [group['dataFile'] for kind in index['types'] for group in kind['groups']]
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
+
+
+# Interpolated variables whose values come from an asset rather than the Dart source
+INDIRECTIONS = {'dataFile': (OUTBREAK_INDEX.as_posix(), outbreak_data_files)}
+
+# Compiled assets shipped before the app reads them, with the reason
+EXPECTED_UNUSED = {
+    'assets/data/stewardship/allergy_cross_reactivity_matrix.json':
+        'tools/compile_allergy_matrix.py output for O(1) allergy lookups; allergy_cross_reactivity_repository.dart still walks the rules',
+}
+
+
+def bundled_entries():
+    """Asset paths and directories declared under flutter: assets: in pubspec.yaml"""
+    try:
+        text = PUBSPEC.read_text(encoding='utf-8')
+    except OSError:
+        return None
+    section = re.search(r'^  assets:\n((?:    - .*\n?)+)', text, re.MULTILINE)
+    return [line.strip()[2:].strip() for line in section.group(1).splitlines()] if section else []
+
+
+def is_bundled(path, entries):
+    # Flutter bundles a directory entry's files, not its subdirectories
+    return any(path == entry or (entry.endswith('/') and path.rsplit('/', 1)[0] + '/' == entry) for entry in entries)
+
+
+def resolve(scans, assets):
+    """(read: {asset: [sources]}, missing: [(source, path)], dynamic: [(source, pattern, matched, candidates)], references)"""
+    global_consts = {}
+    for _, consts, _, _ in scans:
+        global_consts.update(consts)
+
+    read = defaultdict(list)
+    missing = []
+    dynamic = []
+    references = 0
+    for dart_file, consts, literals, words in scans:
+        def substitute(match):
+            name = match.group(1)
+            value = consts.get(name, global_consts.get(name))
+            return value if value is not None else match.group(0)
+
+        for line, literal in literals:
+            source = f"{dart_file}:{line}"
+            path = INTERPOLATION.sub(substitute, literal)
+            if not path.startswith('assets/') or path.endswith('/'):
+                continue
+            references += 1
+            variables = INTERPOLATION.findall(path)
+            if not variables:
+                if path in assets or Path(path).exists():
+                    read[path].append(source)
+                else:
+                    missing.append((source, path))
+                continue
+
+            name = variables[0].rsplit('.', 1)[-1]
+            if len(variables) == 1 and name in INDIRECTIONS:
+                index_file, values = INDIRECTIONS[name]
+                for value in values():
+                    expanded = INTERPOLATION.sub(lambda _: value, path)
+                    if expanded in assets:
+                        read[expanded].append(f"{source} via {index_file}")
+                    else:
+                        missing.append((f"{index_file} via {source}", expanded))
+                continue
+
+            parts = INTERPOLATION.split(path)
+            regex = re.compile(''.join(re.escape(part) if i % 2 == 0 else f"({WILDCARD_VALUE})"
+                                       for i, part in enumerate(parts)))
+            matched = []
+            candidates = [asset for asset in assets if regex.fullmatch(asset)]
+            # Only trust the wildcard values the file spells out when it spells any of them
+            known = any(value in words for asset in candidates for value in regex.fullmatch(asset).groups())
+            for asset in candidates:
+                if not known or all(value in words for value in regex.fullmatch(asset).groups()):
+                    read[asset].append(f"{source} ({path})")
+                    matched.append(asset)
+            dynamic.append((source, path, len(matched), len(candidates)))
+    return read, missing, dynamic, references
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report unused assets/data files and missing asset references in lib/.')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='number of worker processes (1 = serial, 0 = one per CPU)')
+    parser.add_argument('--strict', action='store_true', help='also exit with status 1 when assets are unused')
+    args = parser.parse_args()
+
+    dart_files = sorted(LIB_DIR.rglob('*.dart'))
+    if not dart_files or not ASSETS_DIR.exists():
+        print(f"❌ Run from the project root: needs {LIB_DIR}/ and {ASSETS_DIR}/")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("ASSET USAGE")
+    print("=" * 80)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    if jobs == 1:
+        scans = [scan_dart(filepath) for filepath in dart_files]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            scans = list(executor.map(scan_dart, dart_files, chunksize=16))
+
+    assets = {filepath.as_posix(): filepath.stat().st_size
+              for filepath in sorted(ASSETS_DIR.rglob('*')) if filepath.is_file() and not filepath.name.startswith('.')}
+    read, missing, dynamic, references = resolve(scans, assets)
+    print(f"Scanned {len(dart_files)} Dart files ({jobs} worker(s)), {references} asset reference(s)")
+    print(f"assets/data: {len(assets)} files, {sum(assets.values()) / 1024:.1f} KB; "
+          f"{sum(1 for path in assets if path in read)} read by the app")
+
+    if dynamic:
+        print("\nDynamic paths:")
+        for source, pattern, matched, candidates in dynamic:
+            print(f"   {pattern}: {matched} of {candidates} matching file(s)  [{source}]")
+
+    expected = [path for path in assets if path not in read and path in EXPECTED_UNUSED]
+    unused = [path for path in assets if path not in read and path not in EXPECTED_UNUSED]
+    unused_bytes = sum(assets[path] for path in unused)
+    print(f"\n{'⚠️ ' if unused else '✅'} Unused assets: {len(unused)}, {unused_bytes / 1024:.1f} KB "
+          f"({unused_bytes / max(sum(assets.values()), 1) * 100:.1f}% of assets/data)")
+    for path in sorted(unused, key=lambda path: -assets[path]):
+        print(f"   {assets[path] / 1024:>8.1f} KB  {path}")
+
+    if expected:
+        print(f"\nExpected unused: {len(expected)}, {sum(assets[path] for path in expected) / 1024:.1f} KB")
+        for path in expected:
+            print(f"   {assets[path] / 1024:>8.1f} KB  {path}  [{EXPECTED_UNUSED[path]}]")
+
+    print(f"\n{'❌' if missing else '✅'} Missing assets: {len(missing)}")
+    for source, path in missing:
+        print(f"   {path}  [{source}]")
+
+    entries = bundled_entries()
+    unbundled = []
+    if entries is not None:
+        unbundled = sorted(path for path in read if not is_bundled(path, entries))
+        print(f"\n{'❌' if unbundled else '✅'} Read but not bundled by pubspec.yaml: {len(unbundled)}")
+        for path in unbundled:
+            print(f"   {path}  [{read[path][0]}]")
+
+    if missing or unbundled or (args.strict and unused):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
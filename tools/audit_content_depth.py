@@ -1,76 +1,139 @@
-import json
+import argparse
+import contextlib
 from pathlib import Path
 import sys
 
+from cds_rules import Rule, RuleEngine
+from issue_output import WARNING, open_issue_stream
+from json_positions import load_json_with_positions
+from profiling import NULL_PROFILER, OUTPUT_DIR as PROFILE_DIR, Profiler
+from validation_cache import ValidationCache, ruleset_fingerprint
+
 # Force UTF-8 output for Windows consoles
 sys.stdout.reconfigure(encoding='utf-8')
+sys.stderr.reconfigure(encoding='utf-8')
 
 CDS_DIR = Path('assets/data/cds')
 
-def audit_file(filepath):
+SUSPICIOUS_MARKERS = ['TODO', 'FIXME', 'PENDING', 'INSERT', 'LOREM', 'IPSUM']
+ALLOWED_SHORT = ['none', 'n/a', 'none.', 'not applicable', 'not applicable.']
+
+class ContentDepthRule(Rule):
+    """Placeholder markers, suspiciously short and empty content strings"""
+
+    id = 'content_depth'
+    severity = WARNING
+
+    def visit_string(self, doc, obj, path):
+        # Check for markers
+        upper = obj.upper()
+        for marker in SUSPICIOUS_MARKERS:
+            if marker in upper:
+                doc.issue(self, f"  [MARKER] Found '{marker}' in {path}", doc.json_path(path))
+
+        # Check for shortness (heuristic)
+        words = obj.split()
+        if len(words) < 3 and len(obj) > 0:
+             # Ignore common short strings like "None" or "N/A" if they are valid, but flag them for review
+             if obj.lower() not in ALLOWED_SHORT:
+                doc.issue(self, f"  [SHORT] Very short content in {path}: '{obj}'", doc.json_path(path))
+
+        if len(obj.strip()) == 0:
+            doc.issue(self, f"  [EMPTY] Empty string in {path}", doc.json_path(path))
+
+ENGINE = RuleEngine([ContentDepthRule()])
+
+# Replaced by a Profiler when --profile is given
+PROFILER = NULL_PROFILER
+
+def audit_file(filepath, sink=None):
+    """Audit one category file and return its report lines; a sink receives every finding"""
+    lines = []
+    PROFILER.set_file(filepath.name)
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with PROFILER.phase('read+parse'):
+            data, positions = load_json_with_positions(filepath)
     except Exception as e:
-        print(f"Error reading {filepath.name}: {e}")
-        return
+        lines.append(f"Error reading {filepath.name}: {e}")
+        return lines
 
     filename = filepath.name
     conditions = data.get('conditions', [])
     
-    print(f"\n--- {filename} ({len(conditions)} conditions) ---")
-    
-    suspicious_markers = ['TODO', 'FIXME', 'PENDING', 'INSERT', 'LOREM', 'IPSUM']
-    
-    for condition in conditions:
-        cond_name = condition.get('name', 'Unknown')
-        sections = condition.get('sections', {})
-        
-        for section_id, section in sections.items():
-            if section_id == 'references':
-                continue
-                
-            content = section.get('content', {})
-            
-            # Helper to recursively check content
-            def check_content(obj, path):
-                issues = []
-                if isinstance(obj, str):
-                    # Check for markers
-                    for marker in suspicious_markers:
-                        if marker in obj.upper():
-                            issues.append(f"  [MARKER] Found '{marker}' in {path}")
-                    
-                    # Check for shortness (heuristic)
-                    words = obj.split()
-                    if len(words) < 3 and len(obj) > 0:
-                         # Ignore common short strings like "None" or "N/A" if they are valid, but flag them for review
-                         if obj.lower() not in ['none', 'n/a', 'none.', 'not applicable', 'not applicable.']:
-                            issues.append(f"  [SHORT] Very short content in {path}: '{obj}'")
-                    
-                    if len(obj.strip()) == 0:
-                        issues.append(f"  [EMPTY] Empty string in {path}")
-                        
-                elif isinstance(obj, dict):
-                    for k, v in obj.items():
-                        issues.extend(check_content(v, f"{path}.{k}"))
-                elif isinstance(obj, list):
-                    for i, v in enumerate(obj):
-                        issues.extend(check_content(v, f"{path}[{i}]"))
-                return issues
-
-            issues = check_content(content, f"{cond_name}.{section_id}")
-            for issue in issues:
-                print(issue)
+    lines.append(f"\n--- {filename} ({len(conditions)} conditions) ---")
+
+    with PROFILER.phase('traversal'):
+        doc = ENGINE.run(data, filename, sink, positions)
+    lines.extend(doc.issues[ContentDepthRule.id])
+
+    return lines
+
+def ruleset():
+    """Fingerprint of everything that decides a file's audit result"""
+    config = {'SUSPICIOUS_MARKERS': SUSPICIOUS_MARKERS, 'ALLOWED_SHORT': ALLOWED_SHORT}
+    tools_dir = Path(__file__).resolve().parent
+    # json_positions.py decides the "(line L, col C)" in cached report lines; issue_output.py
+    # is left out because --jsonl/--sarif runs bypass the cache
+    sources = ['audit_content_depth.py', 'cds_rules.py', 'json_positions.py']
+    return ruleset_fingerprint(config, [tools_dir / name for name in sources])
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Audit CDS content depth.')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='re-audit every file instead of replaying cached results')
+    parser.add_argument('--jsonl', metavar='PATH',
+                        help="stream findings as JSON lines to PATH ('-' for stdout, text report to stderr)")
+    parser.add_argument('--sarif', metavar='PATH', help='also write findings as a SARIF 2.1.0 log')
+    parser.add_argument('--profile', action='store_true',
+                        help='time every rule and phase per file (runs without the cache)')
+    parser.add_argument('--profile-top', type=int, default=15, metavar='N', help='rows in the profile tables')
+    parser.add_argument('--profile-output', default=str(PROFILE_DIR / 'profile_audit_content_depth.json'),
+                        help='JSON timing report path')
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    # Opened before stdout is redirected, so '-' still means the real stdout
+    stream = open_issue_stream(args.jsonl, args.sarif, 'audit_content_depth', ENGINE.rules)
+    try:
+        if args.jsonl == '-':
+            with contextlib.redirect_stdout(sys.stderr):
+                run(args, stream)
+        else:
+            run(args, stream)
+    finally:
+        if stream is not None:
+            stream.close()
+
+def run(args, stream):
+    global PROFILER
+    if args.profile:
+        PROFILER = Profiler()
+        ENGINE.instrument(PROFILER)
     if not CDS_DIR.exists():
         print("Directory not found")
         return
 
+    # Structured output needs the live run, so it bypasses the cache
+    cache = ValidationCache('audit_content_depth', ruleset(),
+                            enabled=not (args.no_cache or args.profile or stream is not None))
     files = sorted(list(CDS_DIR.glob('*.json')))
     for f in files:
-        audit_file(f)
+        key, lines = cache.get(f)
+        if lines is None:
+            lines = audit_file(f, stream.file(f) if stream else None)
+            cache.put(f, key, lines)
+        with PROFILER.phase('print'):
+            for line in lines:
+                print(line)
+
+    print()
+    cache.save()
+    print(cache.summary())
+
+    if args.profile:
+        PROFILER.print_report(args.profile_top)
+        print(f"Profile written to {PROFILER.write_report(args.profile_output)}")
 
 if __name__ == '__main__':
     main()
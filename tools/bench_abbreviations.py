@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass abbreviation matcher against the legacy
+per-abbreviation regex loop on the real CDS corpus.
+
+Also checks that both report the same findings, on the corpus as shipped and
+on a lowercased copy of it (which produces plenty of hits).
+
+Usage: python tools/bench_abbreviations.py [--repeat N]
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+
+from abbreviation_matcher import AbbreviationMatcher
+from validate_all_cds import CDS_DIR, REQUIRED_CAPS
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+
+def legacy_find_miscased(value, abbreviations):
+    """The original per-abbreviation compile + findall loop"""
+    found = []
+    for abbr in abbreviations:
+        pattern = re.compile(r'\b' + abbr.lower() + r'\b', re.IGNORECASE)
+        matches = pattern.findall(value)
+        incorrect = [m for m in matches if m != abbr]
+        if incorrect:
+            found.append((abbr, set(incorrect)))
+    return found
+
+
+def collect_content_strings(data):
+    """Every string the abbreviation check scans (section content, no references)"""
+    strings = []
+
+    def walk(value):
+        if isinstance(value, str):
+            strings.append(value)
+        elif isinstance(value, dict):
+            for val in value.values():
+                walk(val)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+
+    for condition in data.get('conditions', []):
+        for section_id, section in condition.get('sections', {}).items():
+            if section_id != 'references':
+                walk(section.get('content', {}))
+    return strings
+
+
+def time_run(fn, strings, repeat):
+    """Best-of-N wall time and the findings of the last run"""
+    best = float('inf')
+    findings = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        findings = [fn(s) for s in strings]
+        best = min(best, time.perf_counter() - start)
+    return best, findings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='runs per variant (best time is reported)')
+    args = parser.parse_args()
+
+    strings = []
+    for json_file in sorted(CDS_DIR.glob('*.json')):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            strings.extend(collect_content_strings(json.load(f)))
+
+    abbreviations = list(dict.fromkeys(REQUIRED_CAPS))
+    matcher = AbbreviationMatcher(abbreviations)
+
+    print("=" * 80)
+    print("ABBREVIATION MATCHER BENCHMARK")
+    print("=" * 80)
+    print(f"Strings: {len(strings)} ({sum(len(s) for s in strings) / 1024:.0f} KB)")
+    print(f"Abbreviations: {len(abbreviations)}")
+    print()
+
+    failed = False
+    for label, corpus in [('corpus', strings), ('lowercased', [s.lower() for s in strings])]:
+        legacy_time, legacy = time_run(lambda s: legacy_find_miscased(s, abbreviations), corpus, args.repeat)
+        matcher_time, matched = time_run(matcher.find_miscased, corpus, args.repeat)
+        hits = sum(len(f) for f in legacy)
+        same = legacy == matched
+        failed = failed or not same
+
+        print(f"[{label}] findings: {hits}, identical: {'yes' if same else 'NO'}")
+        print(f"   legacy loop:    {legacy_time * 1000:8.1f} ms")
+        print(f"   single pass:    {matcher_time * 1000:8.1f} ms")
+        print(f"   speedup:        {legacy_time / matcher_time:8.1f}x")
+        print()
+
+    if failed:
+        print("❌ Matcher findings differ from the legacy loop")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
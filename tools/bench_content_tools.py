@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the content tooling.
+
+Times every validator stage (JSON parsing, each rule on its own, and the
+full validate_all_cds / audit_content_depth / urinary profiles) on the real
+assets/data/cds corpus and on synthetic corpora at larger scales, then
+reports each stage's scaling exponent between consecutive scales
+(1.0 = linear; noticeably above 1 means the stage goes super-linear).
+
+Results are written as JSON to build/content_tools/benchmarks/latest.json
+and appended to history.jsonl together with the git revision, so runs can
+be compared between commits. The 1000x corpus is ~2.8 GB of JSON and takes
+tens of minutes; use --scales 10 100 for a quick check.
+
+Usage: python tools/bench_content_tools.py [--scales 10 100 1000] [--repeat N] [--stages NAME ...]
+"""
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import audit_content_depth
+import validate_all_cds
+from cds_rules import (AbbreviationRule, ConditionStructureRule, DosingRule, RuleEngine,
+                       TextLengthRule, TopLevelFieldsRule)
+from git_revision import git_revision
+from synthetic_corpus import iter_synthetic_documents, load_templates, scale_error, split_scale
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+import validate_urinary_category
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+RESULTS_DIR = Path('build/content_tools/benchmarks')
+SUPER_LINEAR_THRESHOLD = 1.15
+
+
+def single(rule):
+    return RuleEngine([rule]).run
+
+
+# Stage name -> callable(document, filename); 'parse' is handled separately
+RULE_STAGES = {
+    'structure': single(TopLevelFieldsRule(validate_all_cds.REQUIRED_TOP_FIELDS)),
+    'conditions': single(ConditionStructureRule(validate_all_cds.REQUIRED_CONDITION_FIELDS,
+                                                validate_all_cds.REQUIRED_SECTIONS)),
+    'abbreviations': single(AbbreviationRule(validate_all_cds.REQUIRED_CAPS)),
+    'content_depth': single(audit_content_depth.ContentDepthRule()),
+    'dosing': single(DosingRule(validate_all_cds.DOSING_PATTERN)),
+    'text_length': single(TextLengthRule()),
+    'validate_all_cds': validate_all_cds.ENGINE.run,
+    'audit_content_depth': audit_content_depth.ENGINE.run,
+    'urinary_profile': validate_urinary_category.ENGINE.run,
+}
+STAGES = ['parse'] + list(RULE_STAGES)
+
+
+def real_corpus():
+    """Yield (filename, text) for the real corpus"""
+    for json_file in sorted(validate_all_cds.CDS_DIR.glob('*.json')):
+        yield json_file.name, json_file.read_text(encoding='utf-8')
+
+
+def synthetic_corpus(templates, scale):
+    """Yield (filename, text) for a synthetic corpus, one file at a time"""
+    for filename, document in iter_synthetic_documents(templates, scale):
+        yield filename, json.dumps(document, ensure_ascii=False, indent=2)
+
+
+def time_corpus(corpus, stages):
+    """Run every stage over every file once; returns (totals, files, bytes, conditions)"""
+    totals = dict.fromkeys(stages, 0.0)
+    files = 0
+    total_bytes = 0
+    conditions = 0
+    for filename, text in corpus:
+        files += 1
+        total_bytes += len(text.encode('utf-8'))
+
+        start = time.perf_counter()
+        data = json.loads(text)
+        if 'parse' in totals:
+            totals['parse'] += time.perf_counter() - start
+        conditions += len(data.get('conditions', []))
+
+        for stage in stages:
+            if stage == 'parse':
+                continue
+            run = RULE_STAGES[stage]
+            start = time.perf_counter()
+            run(data, filename)
+            totals[stage] += time.perf_counter() - start
+    return totals, files, total_bytes, conditions
+
+
+def measure(label, scale, corpus_factory, stages, repeat):
+    """Best-of-N timings for one corpus"""
+    best = None
+    for _ in range(repeat):
+        totals, files, total_bytes, conditions = time_corpus(corpus_factory(), stages)
+        best = totals if best is None else {s: min(best[s], totals[s]) for s in stages}
+    files_factor, conditions_factor = split_scale(scale)
+    return {
+        'label': label,
+        'scale': scale,
+        'files_factor': files_factor,
+        'conditions_factor': conditions_factor,
+        'files': files,
+        'bytes': total_bytes,
+        'conditions': conditions,
+        'seconds': best,
+    }
+
+
+def scaling_exponents(results, stages):
+    """log(time ratio) / log(size ratio) between consecutive scales, per stage"""
+    exponents = {}
+    for stage in stages:
+        steps = []
+        for prev, cur in zip(results, results[1:]):
+            t0, t1 = prev['seconds'][stage], cur['seconds'][stage]
+            size_ratio = cur['bytes'] / prev['bytes']
+            if t0 <= 0 or t1 <= 0 or size_ratio <= 1:
+                steps.append(None)
+                continue
+            steps.append(round(math.log(t1 / t0) / math.log(size_ratio), 3))
+        exponents[stage] = steps
+    return exponents
+
+
+def print_report(results, exponents, stages):
+    print()
+    header = f"{'stage':<22}" + ''.join(f"{r['label']:>12}" for r in results) + "   exponents"
+    print(header)
+    print("-" * len(header))
+    for stage in stages:
+        cells = ''.join(f"{r['seconds'][stage] * 1000:>10.1f}ms" for r in results)
+        steps = ' '.join('-' if e is None else f"{e:.2f}{'!' if e > SUPER_LINEAR_THRESHOLD else ''}"
+                         for e in exponents[stage])
+        print(f"{stage:<22}{cells}   {steps}")
+    print()
+    flagged = [s for s in stages if any(e is not None and e > SUPER_LINEAR_THRESHOLD for e in exponents[s])]
+    if flagged:
+        print(f"⚠️  Super-linear (exponent > {SUPER_LINEAR_THRESHOLD}): {', '.join(flagged)}")
+    else:
+        print("✅ All stages scale linearly")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the content validators.')
+    parser.add_argument('--scales', type=int, nargs='*', default=[10, 100, 1000],
+                        help='synthetic corpus scales to run after the real corpus (default: 10 100 1000)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs on the real corpus (best time is kept)')
+    parser.add_argument('--stages', nargs='*', choices=STAGES, help='only time these stages')
+    parser.add_argument('--output', help='results file (default: build/content_tools/benchmarks/latest.json)')
+    args = parser.parse_args()
+    for scale in args.scales:
+        if scale_error(scale):
+            parser.error(f"--scales: {scale_error(scale)}")
+
+    stages = args.stages or STAGES
+    templates = load_templates()
+    if not templates:
+        print(f"❌ No JSON files found in {validate_all_cds.CDS_DIR}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("CONTENT TOOLING BENCHMARK")
+    print("=" * 80)
+
+    results = [measure('real', 1, real_corpus, stages, args.repeat)]
+    print(f"real: {results[0]['files']} files, {results[0]['bytes'] / 1024 / 1024:.1f} MB")
+    for scale in sorted(set(args.scales)):
+        result = measure(f'{scale}x', scale, lambda: synthetic_corpus(templates, scale), stages, 1)
+        results.append(result)
+        print(f"{scale}x: {result['files']} files, {result['bytes'] / 1024 / 1024:.1f} MB, "
+              f"{result['conditions']} conditions")
+
+    exponents = scaling_exponents(results, stages)
+    print_report(results, exponents, stages)
+
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'stages': stages,
+        'results': results,
+        'exponents': exponents,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / 'latest.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    history = output.parent / 'history.jsonl'
+    with open(history, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(report) + '\n')
+    print(f"Results written to {output} (history: {history})")
+
+
+if __name__ == '__main__':
+    main()
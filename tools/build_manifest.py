@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Content-addressed manifest of every JSON asset under assets/data.
+
+For each file the manifest records its SHA-256, byte size, version and
+updatedAt (when the file has them), and the length of every top-level
+array (pathogens, questions, conditions...). The app can compare a cached
+decoded copy against the hash alone, and pick outbreak groups to load from
+the manifest without opening the group files:
+
+    {
+      "format": 1,
+      "digest": "<sha256 over every file's path and hash>",
+      "files": {
+        "outbreak_groups/bacterial/mdro_hai.v1.json": {
+          "sha256": "...", "bytes": 41234, "version": 1,
+          "updatedAt": "2025-01-11T00:00:00Z", "counts": {"pathogens": 7}
+        },
+        ...
+      }
+    }
+
+Counts that are declared by hand are verified against the data:
+- outbreak_groups/index.v1.json: every dataFile exists and its
+  pathogenCount matches the group file (group files the index doesn't
+  list are reported as warnings)
+- quiz_*.v1.json: questionsPerStage and totalStages match the questions
+
+Usage: python tools/build_manifest.py [--output PATH] [--check]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+ASSETS_DIR = Path('assets/data')
+OUTPUT_PATH = Path('build/assets_data/manifest.v1.json')
+MANIFEST_FORMAT = 1
+OUTBREAK_INDEX = 'outbreak_groups/index.v1.json'
+
+
+def describe(raw, data):
+    """Manifest entry for one decoded file"""
+    entry = {'sha256': hashlib.sha256(raw).hexdigest(), 'bytes': len(raw)}
+    if isinstance(data, dict):
+        for field in ('version', 'updatedAt'):
+            if field in data:
+                entry[field] = data[field]
+        counts = {key: len(value) for key, value in data.items() if isinstance(value, list)}
+        if counts:
+            entry['counts'] = counts
+    return entry
+
+
+def check_outbreak_index(index, decoded):
+    """(errors, warnings) for the outbreak index's dataFile and pathogenCount entries"""
+    errors, warnings = [], []
+    listed = set()
+    for t, kind in enumerate(index.get('types', [])):
+        for g, group in enumerate(kind.get('groups', [])):
+            path = f"types[{t}].groups[{g}]"
+            data_file = f"outbreak_groups/{group.get('dataFile')}"
+            listed.add(data_file)
+            if data_file not in decoded:
+                errors.append(f"{OUTBREAK_INDEX}:{path}.dataFile: '{group.get('dataFile')}' does not exist")
+                continue
+            group_data = decoded[data_file]
+            pathogens = group_data.get('pathogens') if isinstance(group_data, dict) else None
+            if not isinstance(pathogens, list):
+                errors.append(f"{data_file}: no pathogens array")
+                continue
+            if group.get('pathogenCount') != len(pathogens):
+                errors.append(f"{OUTBREAK_INDEX}:{path}.pathogenCount: declares {group.get('pathogenCount')}, "
+                              f"{group.get('dataFile')} has {len(pathogens)}")
+            if group_data.get('type', kind.get('id')) != kind.get('id'):
+                warnings.append(f"{data_file}: type '{group_data.get('type')}' but listed under '{kind.get('id')}'")
+
+    for name in sorted(decoded):
+        if name.startswith('outbreak_groups/') and name != OUTBREAK_INDEX and name not in listed:
+            warnings.append(f"{name}: not listed in {OUTBREAK_INDEX} (never loaded by the app)")
+    return errors, warnings
+
+
+def check_quiz(name, quiz):
+    """Errors for a quiz whose declared stage layout doesn't match its questions"""
+    errors = []
+    questions = quiz.get('questions', [])
+    per_stage = Counter(q.get('stage') for q in questions if isinstance(q, dict))
+    total_stages = quiz.get('totalStages')
+    if sorted(per_stage) != list(range(1, (total_stages or 0) + 1)):
+        errors.append(f"{name}: totalStages is {total_stages}, questions use stages "
+                      f"{', '.join(str(s) for s in sorted(per_stage, key=str))}")
+    expected = quiz.get('questionsPerStage')
+    for stage, count in sorted(per_stage.items(), key=lambda item: str(item[0])):
+        if count != expected:
+            errors.append(f"{name}: stage {stage} has {count} questions, questionsPerStage is {expected}")
+    return errors
+
+
+def build_manifest(assets_dir=ASSETS_DIR, exclude=()):
+    """(manifest, decoded data by relative path, files that failed to decode)"""
+    files = {}
+    decoded = {}
+    unreadable = []
+    for filepath in sorted(assets_dir.rglob('*.json')):
+        if filepath.resolve() in exclude:
+            continue
+        name = filepath.relative_to(assets_dir).as_posix()
+        raw = filepath.read_bytes()
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            unreadable.append(f"{name}: {e}")
+            files[name] = {'sha256': hashlib.sha256(raw).hexdigest(), 'bytes': len(raw)}
+            continue
+        decoded[name] = data
+        files[name] = describe(raw, data)
+
+    digest = hashlib.sha256()
+    for name, entry in files.items():
+        digest.update(f"{name}\0{entry['sha256']}\n".encode('utf-8'))
+    manifest = {'format': MANIFEST_FORMAT, 'digest': digest.hexdigest(), 'files': files}
+    return manifest, decoded, unreadable
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a content-addressed manifest of assets/data.')
+    parser.add_argument('--output', default=str(OUTPUT_PATH),
+                        help='manifest path (default: build/assets_data/manifest.v1.json)')
+    parser.add_argument('--check', action='store_true', help='only verify the declared counts; write nothing')
+    args = parser.parse_args()
+
+    if not ASSETS_DIR.exists():
+        print(f"❌ Directory not found: {ASSETS_DIR}")
+        sys.exit(1)
+
+    output = Path(args.output)
+    print("=" * 80)
+    print("ASSET MANIFEST")
+    print("=" * 80)
+
+    manifest, decoded, unreadable = build_manifest(exclude={output.resolve()})
+    errors = list(unreadable)
+    warnings = []
+    if OUTBREAK_INDEX in decoded:
+        index_errors, index_warnings = check_outbreak_index(decoded[OUTBREAK_INDEX], decoded)
+        errors.extend(index_errors)
+        warnings.extend(index_warnings)
+    for name, data in decoded.items():
+        if name.startswith('quiz_') and isinstance(data, dict):
+            errors.extend(check_quiz(name, data))
+
+    files = manifest['files']
+    total_bytes = sum(entry['bytes'] for entry in files.values())
+    print(f"Files: {len(files)}, {total_bytes / 1024:.1f} KB")
+    print(f"Digest: {manifest['digest']}")
+    groups = sum(1 for name in files if name.startswith('outbreak_groups/') and name != OUTBREAK_INDEX)
+    print(f"Outbreak groups: {groups}, pathogens: "
+          f"{sum(files[name].get('counts', {}).get('pathogens', 0) for name in files if name.startswith('outbreak_groups/'))}")
+
+    print(f"\n{'❌' if errors else '✅'} Declared counts: {len(errors)} mismatch(es)")
+    for error in errors:
+        print(f"   {error}")
+    for warning in warnings:
+        print(f"⚠️  {warning}")
+
+    if not args.check:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"\nManifest written to {output}")
+
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
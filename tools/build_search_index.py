@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Build a cross-category search index for the CDS conditions.
+
+Normalized tokens from each condition's name, synonyms, ICD-10 codes and
+shortDescription are mapped to (category, condition) postings in one
+compact JSON file, so the app can search every category without decoding
+any category file. The vocabulary is sorted, which gives prefix
+(type-ahead) lookups with a binary search.
+
+Index layout (build/assets_data/cds_search_index.v1.json):
+
+    categories  [category id, ...]
+    conditions  [[category index, condition id, condition name], ...]
+    tokens      sorted vocabulary
+    postings    per token: [condition index * 4 + field, ...]
+                field: 0 name, 1 synonym, 2 icd10, 3 shortDescription
+
+Usage:
+    python tools/build_search_index.py [--out PATH]
+    python tools/build_search_index.py --query "cyst" [--out PATH]
+"""
+
+import argparse
+import bisect
+import gzip
+import json
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+from validate_all_cds import CDS_DIR
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+OUTPUT_PATH = Path('build/assets_data/cds_search_index.v1.json')
+INDEX_VERSION = 1
+
+FIELDS = ['name', 'synonyms', 'icd10', 'shortDescription']
+# Ranking weight of a hit per field, in FIELDS order
+FIELD_WEIGHTS = [8, 4, 6, 1]
+MIN_TOKEN_LENGTH = 2
+STOP_WORDS = {'and', 'or', 'of', 'the', 'in', 'with', 'without', 'for', 'to', 'a', 'an', 'by', 'on', 'at', 'due', 'e.g', 'i.e'}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+(?:\.[a-z0-9]+)?')
+ICD10_QUERY = re.compile(r'^[a-z]\d[0-9a-z]*(?:\.[0-9a-z]*)?$')
+
+
+def normalize(text):
+    """Casefold and strip accents"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    """Normalized search tokens of a free-text value"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(normalize(text)):
+        candidates = [token]
+        if '.' in token and ICD10_QUERY.match(token):
+            # ICD-10 code inside free text: index both "n30.00" and "n30"
+            candidates.insert(0, token.split('.')[0])
+        tokens.extend(t for t in candidates if len(t) >= MIN_TOKEN_LENGTH and t not in STOP_WORDS)
+    return tokens
+
+
+def icd10_tokens(code):
+    """An ICD-10 code is searchable with or without its dot ("N30.00", "n3000", "n30")"""
+    code = normalize(code).strip()
+    tokens = {code, code.replace('.', '')}
+    if '.' in code:
+        tokens.add(code.split('.')[0])
+    return sorted(t for t in tokens if t)
+
+
+def field_values(condition, field):
+    value = condition.get(field)
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def build_index(files):
+    """Build the index structure from category files"""
+    categories = []
+    conditions = []
+    postings = {}
+
+    for json_file in files:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        category_index = len(categories)
+        categories.append(data.get('id', json_file.name.split('.')[0]))
+
+        for condition in data.get('conditions', []):
+            condition_index = len(conditions)
+            conditions.append([category_index, condition.get('id'), condition.get('name', '')])
+            for field_code, field in enumerate(FIELDS):
+                for value in field_values(condition, field):
+                    if not isinstance(value, str):
+                        continue
+                    tokens = icd10_tokens(value) if field == 'icd10' else tokenize(value)
+                    for token in tokens:
+                        postings.setdefault(token, set()).add(condition_index * 4 + field_code)
+
+    tokens = sorted(postings)
+    return {
+        'version': INDEX_VERSION,
+        'categories': categories,
+        'conditions': conditions,
+        'tokens': tokens,
+        'postings': [sorted(postings[token]) for token in tokens],
+    }
+
+
+class SearchIndex:
+    """Query side of the index: works on the index file alone"""
+
+    def __init__(self, index):
+        self.categories = index['categories']
+        self.conditions = index['conditions']
+        self.tokens = index['tokens']
+        self.postings = index['postings']
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _prefix_range(self, prefix):
+        start = bisect.bisect_left(self.tokens, prefix)
+        end = bisect.bisect_left(self.tokens, prefix + '\uffff', lo=start)
+        return start, end
+
+    def _scores(self, token, prefix):
+        """condition index -> best field weight for one query token"""
+        if prefix:
+            start, end = self._prefix_range(token)
+        else:
+            start = bisect.bisect_left(self.tokens, token)
+            end = start + 1 if start < len(self.tokens) and self.tokens[start] == token else start
+
+        scores = {}
+        for i in range(start, end):
+            # Exact token hits outrank prefix completions
+            bonus = 2 if self.tokens[i] == token else 1
+            for posting in self.postings[i]:
+                condition_index, field_code = divmod(posting, 4)
+                score = FIELD_WEIGHTS[field_code] * bonus
+                if score > scores.get(condition_index, 0):
+                    scores[condition_index] = score
+        return scores
+
+    def search(self, query, limit=10):
+        """
+        Return [(category id, condition id, name, score)] for a query. Every
+        query token must match; the last one is treated as a prefix.
+        """
+        terms = []
+        for word in normalize(query).split():
+            # ICD-10 codes are looked up as typed ("n30.0" completes to "n30.00")
+            terms.extend([word] if ICD10_QUERY.match(word) else tokenize(word))
+        if not terms:
+            return []
+
+        combined = None
+        for i, term in enumerate(terms):
+            scores = self._scores(term, prefix=(i == len(terms) - 1))
+            if combined is None:
+                combined = scores
+            else:
+                combined = {c: combined[c] + s for c, s in scores.items() if c in combined}
+            if not combined:
+                return []
+
+        ranked = sorted(combined.items(), key=lambda item: (-item[1], self.conditions[item[0]][2]))
+        results = []
+        for condition_index, score in ranked[:limit]:
+            category_index, condition_id, name = self.conditions[condition_index]
+            results.append((self.categories[category_index], condition_id, name, score))
+        return results
+
+
+def verify_index(index, files):
+    """Every indexed condition must exist in its category file, and postings must be in range"""
+    problems = []
+    ids_by_category = {}
+    for json_file in files:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        category = data.get('id', json_file.name.split('.')[0])
+        if category in ids_by_category:
+            problems.append(f"Duplicate category id '{category}' ({json_file.name})")
+        ids = [c.get('id') for c in data.get('conditions', [])]
+        duplicates = {i for i in ids if ids.count(i) > 1}
+        for duplicate in sorted(duplicates, key=str):
+            problems.append(f"{category}: duplicate condition id '{duplicate}'")
+        ids_by_category[category] = set(ids)
+
+    for category_index, condition_id, name in index['conditions']:
+        category = index['categories'][category_index]
+        if condition_id is None:
+            problems.append(f"{category}: condition '{name}' has no id")
+        elif condition_id not in ids_by_category.get(category, ()):
+            problems.append(f"{category}: indexed condition '{condition_id}' not found")
+
+    limit = len(index['conditions']) * 4
+    for token, postings in zip(index['tokens'], index['postings']):
+        if any(p < 0 or p >= limit for p in postings):
+            problems.append(f"Token '{token}' has out-of-range postings")
+    return problems
+
+
+def measure_latency(search_index, queries, repeat=3):
+    """Average and p95 lookup latency in microseconds"""
+    timings = []
+    for query in queries:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            search_index.search(query)
+            best = min(best, time.perf_counter() - start)
+        timings.append(best * 1e6)
+    timings.sort()
+    return sum(timings) / len(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def sample_queries(index):
+    """Type-ahead prefixes and full names of every condition, plus every ICD-10 token"""
+    queries = []
+    for _, _, name in index['conditions']:
+        words = name.split()
+        if words:
+            queries.append(words[0][:3])
+        queries.append(name)
+    queries.extend(t for t in index['tokens'] if ICD10_QUERY.match(t))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the CDS search index.')
+    parser.add_argument('--out', default=str(OUTPUT_PATH), help='index path (default: build/assets_data/cds_search_index.v1.json)')
+    parser.add_argument('--query', help='search an existing index instead of building one')
+    parser.add_argument('--limit', type=int, default=10, help='results to show for --query')
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    if args.query:
+        if not out.exists():
+            print(f"❌ Index not found: {out} (run without --query first)")
+            sys.exit(1)
+        results = SearchIndex.load(out).search(args.query, args.limit)
+        for category, condition_id, name, score in results:
+            print(f"{score:>4}  {category} / {condition_id}  {name}")
+        print(f"{len(results)} result(s) for '{args.query}'")
+        return
+
+    files = sorted(CDS_DIR.glob('*.json'))
+    if not files:
+        print(f"❌ No JSON files found in {CDS_DIR}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("CDS SEARCH INDEX")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    index = build_index(files)
+    encoded = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_bytes(encoded)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    corpus_bytes = sum(f.stat().st_size for f in files)
+    print(f"Categories: {len(index['categories'])}")
+    print(f"Conditions: {len(index['conditions'])}")
+    print(f"Tokens: {len(index['tokens'])}, postings: {sum(len(p) for p in index['postings'])}")
+    print(f"Index size: {len(encoded) / 1024:.1f} KB ({len(gzip.compress(encoded, mtime=0)) / 1024:.1f} KB gzipped), "
+          f"vs {corpus_bytes / 1024:.0f} KB of category files")
+    print(f"Build time: {build_ms:.0f} ms")
+
+    # Everything below works from the file on disk, like the app would
+    start = time.perf_counter()
+    search_index = SearchIndex.load(out)
+    load_ms = (time.perf_counter() - start) * 1000
+    queries = sample_queries(index)
+    average, p95 = measure_latency(search_index, queries)
+    print(f"Index load: {load_ms:.1f} ms")
+    print(f"Lookup latency over {len(queries)} queries: avg {average:.0f} µs, p95 {p95:.0f} µs")
+
+    problems = verify_index(json.loads(encoded), files)
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    print(f"✅ All indexed conditions exist. Index written to {out}")
+
+
+if __name__ == '__main__':
+    main()
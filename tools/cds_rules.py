@@ -0,0 +1,402 @@
+"""
+Single-traversal rule engine for CDS category files.
+
+RuleEngine walks a category document once and dispatches every condition,
+section and section-content string to the registered rules. A rule only
+implements the hooks it cares about; the engine skips hooks no rule
+overrides, so adding a rule never adds another walk over the tree.
+
+Tools assemble a profile (a list of configured rules) and read the
+per-rule findings back from the returned Document:
+
+    engine = RuleEngine([TopLevelFieldsRule(...), AbbreviationRule(...)])
+    doc = engine.run(data, filepath.name)
+    doc.issues['abbreviations']
+
+Every finding carries a JSON path into the document; when the run is
+given a PositionIndex (json_positions.py) the path is also resolved to a
+line and column. Per-rule limits
+(RuleEngine(rules, limits={'abbreviations': 5})) cap how many messages are
+kept on the Document; the counts stay exact, and a sink passed to run()
+(see issue_output.py) receives every finding as it is reported.
+"""
+
+import re
+
+from abbreviation_matcher import AbbreviationMatcher
+from issue_output import ERROR, WARNING
+
+# Any "Drug <dose><unit> [route] [frequency]" mention, conforming or not
+REGIMEN_PATTERN = re.compile(
+    r'\b(?P<drug>[A-Za-z][a-z]+(?:-[a-z]+)?)\s+'
+    r'(?P<dose>\d+(?:\.\d+)?(?:-\d+(?:\.\d+)?)?)\s?'
+    r'(?P<unit>(?:mg|g|mcg|units?|million units|%)(?:/kg)?(?:/day)?)(?![A-Za-z])'
+    r'(?:\s+(?P<route>IV/PO|PO/IV|IV|PO|IM|SC|topically|inhaled|intrathecal|intravitreal))?'
+    r'(?:\s+(?:divided\s+)?(?P<frequency>daily|BID|TID|QID|weekly|once|q\d+(?:-\d+)?h|x\s?1|single dose))?'
+)
+STANDARD_ROUTES = ['IV', 'PO', 'IM', 'SC', 'topically']
+STANDARD_UNITS = ['mg', 'g', 'mcg', 'unit', 'units', '%']
+STANDARD_FREQUENCIES = ['daily', 'BID', 'TID', 'QID']
+# Interval frequencies: q8h, q6-8h
+STANDARD_INTERVAL = re.compile(r'q\d+(?:-\d+)?h')
+# Doses the house format accepts: 500, 1-2, 1.5 (not 7.5-12.5)
+STANDARD_DOSE = re.compile(r'\d+(?:-\d+)?(?:\.\d+)?')
+# Words that precede a dose but are not drugs ("max 500mg", "then 4mg/kg")
+NOT_DRUGS = {'and', 'or', 'then', 'max', 'maximum', 'to', 'of', 'at', 'with', 'plus', 'up', 'dose', 'doses', 'by', 'than', 'is', 'over', 'protein'}
+# JSON path of the section a content path belongs to
+SECTION_PATH = re.compile(r'conditions\[\d+\]\.sections\.[^.\[]+')
+
+
+class Document:
+    """Per-file state for one engine run: the data plus findings keyed by rule id"""
+
+    def __init__(self, data, filename, rules, limits=None, sink=None, positions=None):
+        self.data = data
+        self.filename = filename
+        self.issues = {rule.id: [] for rule in rules}
+        self.warnings = {rule.id: [] for rule in rules}
+        self.issue_counts = {rule.id: 0 for rule in rules}
+        self.warning_counts = {rule.id: 0 for rule in rules}
+        self.limits = limits or {}
+        self.sink = sink
+        self.positions = positions
+        self.state = {}
+        # Position of the walk, for rules that need more than the display path
+        self.condition = None
+        self.condition_index = None
+        self.section_id = None
+        self.content_path = None
+
+    def issue(self, rule, message, path=''):
+        self._record(self.issues, self.issue_counts, rule, rule.severity, message, path)
+
+    def warn(self, rule, message, path=''):
+        self._record(self.warnings, self.warning_counts, rule, WARNING, message, path)
+
+    def _record(self, findings, counts, rule, severity, message, path):
+        counts[rule.id] += 1
+        location = self.positions.locate(path) if self.positions is not None else None
+        limit = self.limits.get(rule.id)
+        if limit is None or len(findings[rule.id]) < limit:
+            findings[rule.id].append(message if location is None else f"{message} (line {location[0]}, col {location[1]})")
+        if self.sink is not None:
+            self.sink.emit(rule.id, severity, message, path, location)
+
+    def suppressed(self, rule_id):
+        """Issues of a rule that were counted but not kept because of its limit"""
+        return self.issue_counts[rule_id] - len(self.issues[rule_id])
+
+    def json_path(self, path):
+        """Translate a display path ('Name.section.key[0]') into a JSON path into the document"""
+        prefix, rest = self.content_path
+        return prefix + path[len(rest):]
+
+
+class Rule:
+    """Base class for rules; override only the hooks the rule needs"""
+
+    id = 'rule'
+    # Severity of doc.issue() findings; doc.warn() findings are always warnings
+    severity = ERROR
+
+    def begin(self, doc):
+        """Called once per document before the walk"""
+
+    def visit_condition(self, doc, condition, index):
+        """Called for every condition (index is 1-based)"""
+
+    def visit_section(self, doc, condition, section_id, section):
+        """Called for every section of every condition, references included"""
+
+    def visit_string(self, doc, value, path):
+        """Called for every string inside section content (references excluded)"""
+
+    def finish(self, doc):
+        """Called once per document after the walk"""
+
+
+def _overrides(rule, hook):
+    return getattr(type(rule), hook) is not getattr(Rule, hook)
+
+
+class RuleEngine:
+    """Runs a rule profile over a document in a single traversal"""
+
+    def __init__(self, rules, limits=None):
+        self.rules = list(rules)
+        self.limits = dict(limits or {})
+        ids = [rule.id for rule in self.rules]
+        if len(ids) != len(set(ids)):
+            raise ValueError(f"Duplicate rule ids in profile: {ids}")
+        self.instrument(None)
+
+    def instrument(self, profiler):
+        """
+        (Re)build the hook dispatch lists, timing every hook through
+        profiler.wrap() when a profiler is given. Without one the lists hold
+        the plain bound methods, so an uninstrumented engine pays nothing.
+        """
+        def hooks(name):
+            found = [(r, getattr(r, name)) for r in self.rules if _overrides(r, name)]
+            if profiler is None or not profiler.enabled:
+                return [hook for _, hook in found]
+            return [profiler.wrap(r.id, name, hook) for r, hook in found]
+
+        self._begin = hooks('begin')
+        self._conditions = hooks('visit_condition')
+        self._sections = hooks('visit_section')
+        self._strings = hooks('visit_string')
+        self._finish = hooks('finish')
+
+    def run(self, data, filename, sink=None, positions=None):
+        doc = Document(data, filename, self.rules, self.limits, sink, positions)
+        for hook in self._begin:
+            hook(doc)
+
+        conditions = data.get('conditions', []) if isinstance(data, dict) else []
+        walk_sections = self._sections or self._strings
+        for index, condition in enumerate(conditions, 1):
+            doc.condition = condition
+            doc.condition_index = index
+            for hook in self._conditions:
+                hook(doc, condition, index)
+            if not walk_sections:
+                continue
+
+            cond_name = condition.get('name', 'Unknown')
+            for section_id, section in condition.get('sections', {}).items():
+                doc.section_id = section_id
+                for hook in self._sections:
+                    hook(doc, condition, section_id, section)
+                if self._strings and section_id != 'references':
+                    # References hold URLs and labels, not clinical content
+                    path = f"{cond_name}.{section_id}"
+                    doc.content_path = (f"conditions[{index - 1}].sections.{section_id}.content", path)
+                    self._walk_strings(doc, section.get('content', {}), path)
+
+        for hook in self._finish:
+            hook(doc)
+        return doc
+
+    def _walk_strings(self, doc, value, path):
+        if isinstance(value, str):
+            for hook in self._strings:
+                hook(doc, value, path)
+        elif isinstance(value, dict):
+            for key, val in value.items():
+                self._walk_strings(doc, val, f"{path}.{key}")
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                self._walk_strings(doc, item, f"{path}[{i}]")
+
+
+# --- Shared rules ---
+
+class TopLevelFieldsRule(Rule):
+    """Required category fields, plus optional version / condition-count expectations"""
+
+    id = 'structure'
+
+    def __init__(self, required_fields, expected_version=None, expected_conditions=None):
+        self.required_fields = required_fields
+        self.expected_version = expected_version
+        self.expected_conditions = expected_conditions
+
+    def begin(self, doc):
+        data = doc.data
+        for field in self.required_fields:
+            if field not in data:
+                doc.issue(self, f"Missing top-level field: {field}", field)
+
+        if self.expected_version is not None and data.get('version') != self.expected_version:
+            doc.warn(self, f"Version is {data.get('version')}, expected {self.expected_version}", 'version')
+
+        if 'conditions' not in data:
+            doc.issue(self, "No conditions array found")
+            return
+
+        conditions = data['conditions']
+        if self.expected_conditions is not None:
+            if len(conditions) != self.expected_conditions:
+                doc.warn(self, f"Expected {self.expected_conditions} conditions, found {len(conditions)}", 'conditions')
+        elif not conditions:
+            doc.issue(self, "Conditions array is empty", 'conditions')
+
+
+class ConditionStructureRule(Rule):
+    """Required condition fields, sections and reference entries"""
+
+    id = 'conditions'
+
+    def __init__(self, required_fields, required_sections, min_references=1):
+        self.required_fields = required_fields
+        self.required_sections = required_sections
+        self.min_references = min_references
+
+    def visit_condition(self, doc, condition, index):
+        cond_name = condition.get('name', f'Condition {index}')
+        base = f"conditions[{index - 1}]"
+
+        for field in self.required_fields:
+            if field not in condition:
+                doc.issue(self, f"{cond_name}: Missing field '{field}'", f"{base}.{field}")
+
+        if 'sections' not in condition:
+            return
+
+        sections = condition['sections']
+        for section in self.required_sections:
+            if section not in sections:
+                doc.issue(self, f"{cond_name}: Missing section '{section}'", f"{base}.sections.{section}")
+
+        if 'references' not in sections:
+            doc.issue(self, f"{cond_name}: No references section", f"{base}.sections.references")
+            return
+
+        refs = sections['references'].get('references', [])
+        refs_path = f"{base}.sections.references.references"
+        if len(refs) < self.min_references:
+            if self.min_references == 1:
+                doc.issue(self, f"{cond_name}: No references found (minimum 1 required)", refs_path)
+            else:
+                doc.issue(self, f"{cond_name}: Only {len(refs)} references (minimum {self.min_references} required)",
+                          refs_path)
+
+        for i, ref in enumerate(refs, 1):
+            if 'label' not in ref:
+                doc.issue(self, f"{cond_name}: Reference {i} missing 'label'", f"{refs_path}[{i - 1}]")
+            if 'url' not in ref:
+                doc.issue(self, f"{cond_name}: Reference {i} missing 'url'", f"{refs_path}[{i - 1}]")
+
+
+class AbbreviationRule(Rule):
+    """Medical abbreviations must be written in their canonical capitalization"""
+
+    id = 'abbreviations'
+
+    def __init__(self, abbreviations):
+        self.matcher = AbbreviationMatcher(abbreviations)
+
+    def visit_string(self, doc, value, path):
+        for abbr, incorrect in self.matcher.find_miscased(value):
+            doc.issue(self, f"In '{path}': Found '{abbr}' as {incorrect}", doc.json_path(path))
+
+
+class DosingRule(Rule):
+    """
+    Extracts dosing regimens (drug, dose, unit, route, frequency) from content
+    strings in place and checks each against the house dosing format.
+
+    Regimens are collected in doc.state['dosing'] with their condition,
+    section and JSON path. Sections with non-conforming regimens get one
+    warning each, and a category with fewer conforming regimens than
+    `minimum` gets a summary warning.
+    """
+
+    id = 'dosing'
+
+    def __init__(self, pattern, minimum=None, routes=STANDARD_ROUTES, units=STANDARD_UNITS,
+                 frequencies=STANDARD_FREQUENCIES):
+        self.pattern = pattern
+        self.minimum = minimum
+        self.routes = set(routes)
+        self.units = set(units)
+        self.frequencies = set(frequencies)
+
+    def begin(self, doc):
+        doc.state[self.id] = []
+
+    def visit_string(self, doc, value, path):
+        regimens = doc.state[self.id]
+        for match in REGIMEN_PATTERN.finditer(value):
+            fields = match.groupdict()
+            conforming = self.pattern.match(value, match.start()) is not None
+            if not conforming and not self.is_regimen(fields):
+                continue
+            regimens.append({
+                'condition_id': doc.condition.get('id'),
+                'condition': doc.condition.get('name', 'Unknown'),
+                'section': doc.section_id,
+                'path': doc.json_path(path),
+                'text': match.group(0),
+                'drug': fields['drug'],
+                'dose': fields['dose'],
+                'unit': fields['unit'],
+                'route': fields['route'],
+                'frequency': fields['frequency'],
+                'conforming': conforming,
+                'problems': [] if conforming else self.problems(fields, match.group(0)),
+            })
+
+    def is_regimen(self, fields):
+        """Filter out dose-like text that is not a regimen ("max 500mg", "dogs 99%")"""
+        if fields['drug'].lower() in NOT_DRUGS:
+            return False
+        if fields['route'] or fields['frequency']:
+            return True
+        return fields['drug'][0].isupper() and fields['unit'] != '%'
+
+    def problems(self, fields, text):
+        """Why a regimen does not match the house format"""
+        found = []
+        if not fields['drug'][0].isupper():
+            found.append("drug name not capitalized")
+        if not STANDARD_DOSE.fullmatch(fields['dose']):
+            found.append(f"dose format '{fields['dose']}' not standard")
+        if re.search(r'\d\s+[a-z%]', text[len(fields['drug']):]):
+            found.append("space between dose and unit")
+        if fields['unit'] not in self.units:
+            found.append(f"unit '{fields['unit']}' not in standard form")
+        if fields['route'] is None:
+            found.append("no route")
+        elif fields['route'] not in self.routes:
+            found.append(f"route '{fields['route']}' not standard")
+        if fields['frequency'] is None:
+            found.append("no frequency")
+        elif fields['frequency'] not in self.frequencies and not STANDARD_INTERVAL.fullmatch(fields['frequency']):
+            found.append(f"frequency '{fields['frequency']}' not standard")
+        return found or ["does not match the house dosing pattern"]
+
+    def finish(self, doc):
+        regimens = doc.state[self.id]
+        by_section = {}
+        for regimen in regimens:
+            if not regimen['conforming']:
+                by_section.setdefault(f"{regimen['condition']}.{regimen['section']}", []).append(regimen)
+        for section, bad in by_section.items():
+            example = bad[0]
+            doc.warn(self, f"{section}: {len(bad)} non-conforming regimen(s), "
+                           f"e.g. '{example['text']}' ({', '.join(example['problems'])})",
+                     SECTION_PATH.match(example['path']).group(0))
+
+        conforming = sum(1 for r in regimens if r['conforming'])
+        if self.minimum is not None and conforming < self.minimum:
+            doc.warn(self, f"Only found {conforming} properly formatted dosing instructions (expected >{self.minimum})",
+                     'conditions')
+
+
+class TextLengthRule(Rule):
+    """Names and descriptions that are likely to overflow their UI cards"""
+
+    id = 'text_length'
+
+    def __init__(self, max_name=50, max_short_description=150, max_category_description=100):
+        self.max_name = max_name
+        self.max_short_description = max_short_description
+        self.max_category_description = max_category_description
+
+    def visit_condition(self, doc, condition, index):
+        name = condition.get('name', '')
+        if len(name) > self.max_name:
+            doc.warn(self, f"Long condition name (may overflow): '{name}' ({len(name)} chars)",
+                     f"conditions[{index - 1}].name")
+
+        short_desc = condition.get('shortDescription', '')
+        if len(short_desc) > self.max_short_description:
+            doc.warn(self, f"Long shortDescription for '{name}': {len(short_desc)} chars (may overflow on cards)",
+                     f"conditions[{index - 1}].shortDescription")
+
+    def finish(self, doc):
+        cat_desc = doc.data.get('description', '')
+        if len(cat_desc) > self.max_category_description:
+            doc.warn(self, f"Long category description: {len(cat_desc)} chars", 'description')
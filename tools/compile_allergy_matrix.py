@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Compile the allergy cross-reactivity rules into a drug x drug lookup table.
+
+assets/data/stewardship/allergy_cross_reactivity_rules.json stores risk per
+drug class (drugClasses[].drugs plus crossReactivity keyed by target class).
+This expands the rules once into a dense matrix over integer drug ids, so
+"is drug B safe for a patient allergic to A, C and D" is a few array reads:
+
+    {
+      "version": 1,
+      "source": {"file": "...", "sha256": "...", "updatedAt": "..."},
+      "drugs": ["Amoxicillin", "Ampicillin", ...],       # drug id = index
+      "classes": [{"id": "penicillins", "drugs": [0, 1, ...]}, ...],
+      "rules": [{"riskLevel": "none", ...}, {"riskLevel": "same_class", ...}, ...],
+      "matrix": [0, 1, 5, ...]                            # row-major, len(drugs)**2
+    }
+
+rules[matrix[allergy * len(drugs) + candidate]] is the rule that applies;
+code 0 means no known cross-reactivity and code 1 means the same drug class
+(no class rule; avoid). Rules with the same content are stored once. When a drug is in more than one class, the
+highest-risk rule wins.
+
+Rule targets are resolved to class ids first and then to drug names
+('aztreonam' -> Aztreonam, from the safe alternatives). The compiler
+reports:
+- drugs listed in several classes, and drug pairs whose rules then disagree
+- rule targets that name no class or drug
+- class pairs whose rules are not symmetric (missing reverse rule, or a
+  different risk/condition in each direction)
+- drug pairs whose matrix cells differ in risk level or percentage by
+  direction, including those set by rules that target a single drug
+- safe alternatives whose declared risk disagrees with the matrix
+
+Usage: python tools/compile_allergy_matrix.py [--output PATH] [--check] [--strict]
+                                              [--query DRUG --allergy DRUG [--allergy DRUG ...]]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+RULES_PATH = Path('assets/data/stewardship/allergy_cross_reactivity_rules.json')
+OUTPUT_PATH = Path('assets/data/stewardship/allergy_cross_reactivity_matrix.json')
+MATRIX_VERSION = 1
+RULE_FIELDS = ('riskLevel', 'riskPercentage', 'condition', 'explanation')
+
+NO_RULE = 0
+SAME_CLASS = 1
+SENTINEL_RULES = [
+    {'riskLevel': 'none', 'riskPercentage': 0.0, 'condition': 'any_reaction',
+     'explanation': 'No known cross-reactivity between these drug classes.'},
+    {'riskLevel': 'same_class', 'riskPercentage': 100.0, 'condition': 'any_reaction',
+     'explanation': 'Same drug class as the allergy; avoid.'},
+]
+
+
+def normalize(name):
+    return name.casefold().replace('_', ' ').replace('-', ' ').strip()
+
+
+def resolve_target(target, class_drugs, drug_ids):
+    """Drug ids a crossReactivity key refers to: a class id, else a single drug name"""
+    if target in class_drugs:
+        return class_drugs[target]
+    drug = drug_ids.get(normalize(target))
+    return [drug] if drug is not None else None
+
+
+def compile_matrix(data, source_raw):
+    """(matrix document, findings by kind)"""
+    findings = defaultdict(list)
+
+    # Drug universe: every class member plus every safe alternative, by normalized name
+    names = {}
+    for drug_class in data['drugClasses']:
+        for drug in drug_class['drugs']:
+            names.setdefault(normalize(drug), drug)
+        for alternative in drug_class['safeAlternatives']:
+            names.setdefault(normalize(alternative['drugName']), alternative['drugName'])
+    drugs = sorted(names.values(), key=normalize)
+    drug_ids = {normalize(drug): i for i, drug in enumerate(drugs)}
+
+    class_drugs = {}
+    classes_of = defaultdict(list)
+    for drug_class in data['drugClasses']:
+        members = sorted({drug_ids[normalize(drug)] for drug in drug_class['drugs']})
+        class_drugs[drug_class['id']] = members
+        for drug in members:
+            classes_of[drug].append(drug_class['id'])
+    for drug, class_ids in sorted(classes_of.items()):
+        if len(class_ids) > 1:
+            findings['multi_class'].append(f"{drugs[drug]} is listed in {len(class_ids)} classes: {', '.join(class_ids)}")
+
+    # Rule table and class-level lookup: (from class, to class) -> rule code
+    rules = list(SENTINEL_RULES)
+    codes_by_rule = {}
+    class_rules = {}
+    drug_rules = {}
+    for drug_class in data['drugClasses']:
+        for target, rule in drug_class['crossReactivity'].items():
+            entry = {field: rule[field] for field in RULE_FIELDS}
+            code = codes_by_rule.setdefault(json.dumps(entry, sort_keys=True), len(rules))
+            if code == len(rules):
+                rules.append(entry)
+            if target in class_drugs:
+                class_rules[(drug_class['id'], target)] = code
+                continue
+            members = resolve_target(target, class_drugs, drug_ids)
+            if members is None:
+                findings['unresolved'].append(f"{drug_class['id']} -> '{target}' names no drug class or drug")
+                continue
+            for drug in members:
+                drug_rules[(drug_class['id'], drug)] = code
+
+    def risk(code):
+        return rules[code]['riskPercentage']
+
+    n = len(drugs)
+    matrix = [NO_RULE] * (n * n)
+    conflicts = defaultdict(int)
+    for allergy in range(n):
+        for candidate in range(n):
+            if allergy == candidate:
+                matrix[allergy * n + candidate] = SAME_CLASS
+                continue
+            codes = set()
+            for from_class in classes_of.get(allergy, []):
+                if (from_class, candidate) in drug_rules:
+                    codes.add(drug_rules[(from_class, candidate)])
+                for to_class in classes_of.get(candidate, []):
+                    code = class_rules.get((from_class, to_class))
+                    if code is not None:
+                        codes.add(code)
+                    elif from_class == to_class:
+                        codes.add(SAME_CLASS)
+            if not codes:
+                continue
+            if len({(rules[c]['riskLevel'], risk(c)) for c in codes}) > 1:
+                conflicts[(drugs[allergy], drugs[candidate])] = len(codes)
+            # The most conservative rule wins
+            matrix[allergy * n + candidate] = max(codes, key=lambda c: (c == SAME_CLASS, risk(c)))
+    for (allergy, candidate), count in sorted(conflicts.items()):
+        findings['conflicts'].append(f"{allergy} -> {candidate}: {count} rules apply, the highest risk is used")
+
+    # Symmetry of the class-level rules
+    for (from_class, to_class), code in sorted(class_rules.items()):
+        if from_class == to_class:
+            continue
+        reverse = class_rules.get((to_class, from_class))
+        if reverse is None:
+            findings['asymmetric'].append(f"{from_class} -> {to_class} has no reverse rule")
+            continue
+        if from_class > to_class:
+            continue
+        forward, backward = rules[code], rules[reverse]
+        differences = [f"{field} {forward[field]} vs {backward[field]}"
+                       for field in ('riskLevel', 'riskPercentage', 'condition') if forward[field] != backward[field]]
+        if differences:
+            findings['asymmetric'].append(f"{from_class} <-> {to_class}: {', '.join(differences)}")
+
+    # Symmetry of the expanded matrix, which also covers rules that target a single drug
+    for allergy in range(n):
+        for candidate in range(allergy + 1, n):
+            forward, backward = rules[matrix[allergy * n + candidate]], rules[matrix[candidate * n + allergy]]
+            differences = [f"{field} {forward[field]} vs {backward[field]}"
+                           for field in ('riskLevel', 'riskPercentage') if forward[field] != backward[field]]
+            if differences:
+                findings['asymmetric_drugs'].append(f"{drugs[allergy]} <-> {drugs[candidate]}: {', '.join(differences)}")
+
+    # Safe alternatives should agree with what the matrix says for the whole class
+    for drug_class in data['drugClasses']:
+        for alternative in drug_class['safeAlternatives']:
+            candidate = drug_ids[normalize(alternative['drugName'])]
+            worst = max((matrix[allergy * n + candidate] for allergy in class_drugs[drug_class['id']]),
+                        key=lambda c: (c == SAME_CLASS, risk(c)), default=NO_RULE)
+            if worst == SAME_CLASS or rules[worst]['riskLevel'] in ('moderate', 'high'):
+                findings['alternatives'].append(
+                    f"{alternative['drugName']} is a safe alternative for {drug_class['id']} "
+                    f"but the matrix says {rules[worst]['riskLevel']} ({risk(worst)}%)")
+            elif worst != NO_RULE and risk(worst) != alternative['crossReactivityRisk']:
+                findings['alternatives'].append(
+                    f"{alternative['drugName']} for {drug_class['id']}: declared risk "
+                    f"{alternative['crossReactivityRisk']}% vs rule {risk(worst)}%")
+
+    document = {
+        'version': MATRIX_VERSION,
+        'source': {'file': RULES_PATH.name, 'sha256': hashlib.sha256(source_raw).hexdigest(),
+                   'updatedAt': data.get('updatedAt')},
+        'drugs': drugs,
+        'classes': [{'id': class_id, 'drugs': members} for class_id, members in class_drugs.items()],
+        'rules': rules,
+        'matrix': matrix,
+    }
+    return document, findings
+
+
+class AllergyMatrix:
+    """O(1) lookups over a compiled matrix document"""
+
+    def __init__(self, document):
+        self.drugs = document['drugs']
+        self.rules = document['rules']
+        self.matrix = document['matrix']
+        self.ids = {normalize(drug): i for i, drug in enumerate(self.drugs)}
+
+    def id(self, drug):
+        return self.ids.get(normalize(drug))
+
+    def rule(self, allergy, candidate):
+        """The rule for giving `candidate` to a patient allergic to `allergy` (drug ids)"""
+        return self.rules[self.matrix[allergy * len(self.drugs) + candidate]]
+
+    def check(self, candidate, allergies):
+        """(allergy id, rule) with the highest risk for a candidate against a full allergy list"""
+        n = len(self.drugs)
+        worst = None
+        for allergy in allergies:
+            code = self.matrix[allergy * n + candidate]
+            if worst is None or (code == SAME_CLASS, self.rules[code]['riskPercentage']) > \
+                    (worst[1] == SAME_CLASS, self.rules[worst[1]]['riskPercentage']):
+                worst = (allergy, code)
+        return None if worst is None else (worst[0], self.rules[worst[1]])
+
+
+def encode(document):
+    """Stable, compact encoding: one line per top-level field, the matrix on one line"""
+    lines = [f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False, separators=(',', ':'))}"
+             for key, value in document.items()]
+    return "{\n" + ",\n".join(lines) + "\n}\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile allergy cross-reactivity rules into a drug x drug matrix.')
+    parser.add_argument('--output', default=str(OUTPUT_PATH), help='matrix asset path')
+    parser.add_argument('--check', action='store_true', help='fail if the matrix asset is out of date; write nothing')
+    parser.add_argument('--strict', action='store_true', help='exit with status 1 when anything is flagged')
+    parser.add_argument('--query', metavar='DRUG', help='look up a candidate drug against --allergy drugs')
+    parser.add_argument('--allergy', action='append', default=[], metavar='DRUG', help='drug the patient is allergic to')
+    args = parser.parse_args()
+
+    try:
+        source_raw = RULES_PATH.read_bytes()
+        data = json.loads(source_raw)
+    except (OSError, ValueError) as e:
+        print(f"❌ Cannot read {RULES_PATH}: {e}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("ALLERGY CROSS-REACTIVITY MATRIX")
+    print("=" * 80)
+
+    document, findings = compile_matrix(data, source_raw)
+    n = len(document['drugs'])
+    print(f"{n} drugs in {len(document['classes'])} classes, {len(document['rules']) - len(SENTINEL_RULES)} rules, "
+          f"{sum(1 for code in document['matrix'] if code > SAME_CLASS)} drug pairs with a class rule")
+
+    labels = {
+        'multi_class': 'Drugs in several classes',
+        'conflicts': 'Conflicting rules',
+        'unresolved': 'Unresolved rule targets',
+        'asymmetric': 'Asymmetric class rules',
+        'asymmetric_drugs': 'Asymmetric drug pairs',
+        'alternatives': 'Safe alternatives disagreeing with the rules',
+    }
+    for kind, label in labels.items():
+        items = findings[kind]
+        print(f"\n{'⚠️ ' if items else '✅'} {label}: {len(items)}")
+        for item in items:
+            print(f"   {item}")
+
+    if args.query:
+        matrix = AllergyMatrix(document)
+        candidate = matrix.id(args.query)
+        allergies = [matrix.id(drug) for drug in args.allergy]
+        unknown = [drug for drug, drug_id in zip([args.query] + args.allergy, [candidate] + allergies) if drug_id is None]
+        if unknown:
+            print(f"\n❌ Unknown drug(s): {', '.join(unknown)}")
+            sys.exit(1)
+        result = matrix.check(candidate, allergies)
+        print(f"\n{args.query} with allergies to {', '.join(args.allergy) or 'nothing'}:")
+        if result is None:
+            print("   no allergies given")
+        else:
+            allergy, rule = result
+            print(f"   {rule['riskLevel']} ({rule['riskPercentage']}%, {rule['condition']}) via {document['drugs'][allergy]}")
+            print(f"   {rule['explanation']}")
+
+    output = Path(args.output)
+    encoded = encode(document)
+    print()
+    if args.check:
+        current = output.read_text(encoding='utf-8') if output.exists() else None
+        if current != encoded:
+            print(f"❌ {output} is out of date; run python tools/compile_allergy_matrix.py")
+            sys.exit(1)
+        print(f"✅ {output} is up to date")
+    elif not args.query:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(encoded, encoding='utf-8')
+        print(f"Matrix written to {output} ({len(encoded.encode('utf-8')) / 1024:.1f} KB)")
+
+    if args.strict and any(findings.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
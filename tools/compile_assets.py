@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Compile the JSON assets under assets/data into a minified, key-stable form.
+
+Every *.json file is re-encoded without whitespace (keys keep their source
+order, non-ASCII stays UTF-8) and optionally gzipped. Each compiled file is
+decoded again and compared with its source, and the report shows bytes
+saved and the decode-time delta per file.
+
+Usage: python tools/compile_assets.py [--out DIR] [--gzip] [--repeat N]
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+ASSETS_DIR = Path('assets/data')
+OUTPUT_DIR = Path('build/assets_data')
+
+
+def minify(data):
+    """Compact, key-order-preserving JSON encoding"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def find_duplicate_keys(text):
+    """Object keys that appear twice in one object (minifying keeps only the last)"""
+    duplicates = []
+
+    def hook(pairs):
+        seen = set()
+        for key, _ in pairs:
+            if key in seen:
+                duplicates.append(key)
+            seen.add(key)
+        return dict(pairs)
+
+    json.loads(text, object_pairs_hook=hook)
+    return duplicates
+
+
+def decode_time(fn, repeat):
+    """Best-of-N seconds for one decode"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compile_file(source, target, use_gzip, repeat):
+    """Compile one asset; returns a report dict"""
+    raw = source.read_bytes()
+    text = raw.decode('utf-8')
+    data = json.loads(text)
+    compiled = minify(data).encode('utf-8')
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(compiled)
+
+    report = {
+        'file': source.relative_to(ASSETS_DIR).as_posix(),
+        'source_bytes': len(raw),
+        'compiled_bytes': len(compiled),
+        'round_trip': json.loads(compiled.decode('utf-8')) == data,
+        'duplicate_keys': find_duplicate_keys(text),
+        'source_decode': decode_time(lambda: json.loads(raw.decode('utf-8')), repeat),
+        'compiled_decode': decode_time(lambda: json.loads(compiled.decode('utf-8')), repeat),
+    }
+
+    if use_gzip:
+        # mtime=0 keeps the gzip output byte-for-byte reproducible
+        packed = gzip.compress(compiled, compresslevel=9, mtime=0)
+        gz_target = target.with_name(target.name + '.gz')
+        gz_target.write_bytes(packed)
+        report['gzip_bytes'] = len(packed)
+        report['gzip_decode'] = decode_time(lambda: json.loads(gzip.decompress(packed).decode('utf-8')), repeat)
+        report['round_trip'] = report['round_trip'] and json.loads(gzip.decompress(packed)) == data
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile assets/data JSON into minified (and gzipped) form.')
+    parser.add_argument('--out', default=str(OUTPUT_DIR), help='output directory (default: build/assets_data)')
+    parser.add_argument('--gzip', action='store_true', help='also write .json.gz variants')
+    parser.add_argument('--repeat', type=int, default=5, help='decode timing runs per file (best is kept)')
+    args = parser.parse_args()
+
+    if not ASSETS_DIR.exists():
+        print(f"❌ Directory not found: {ASSETS_DIR}")
+        sys.exit(1)
+
+    out_dir = Path(args.out)
+    files = sorted(ASSETS_DIR.rglob('*.json'))
+
+    print("=" * 80)
+    print("ASSET COMPILATION")
+    print("=" * 80)
+    header = f"{'file':<48}{'source':>10}{'compiled':>10}{'saved':>7}"
+    if args.gzip:
+        header += f"{'gzip':>10}"
+    header += f"{'decode Δ':>11}"
+    print(header)
+    print("-" * len(header))
+
+    totals = {'source_bytes': 0, 'compiled_bytes': 0, 'gzip_bytes': 0}
+    failures = []
+    for source in files:
+        try:
+            report = compile_file(source, out_dir / source.relative_to(ASSETS_DIR), args.gzip, args.repeat)
+        except (ValueError, OSError) as e:
+            failures.append(f"{source}: {e}")
+            continue
+
+        for key in totals:
+            totals[key] += report.get(key, 0)
+        saved = 1 - report['compiled_bytes'] / report['source_bytes']
+        delta_ms = (report['compiled_decode'] - report['source_decode']) * 1000
+        line = (f"{report['file']:<48}{report['source_bytes'] / 1024:>8.1f}KB{report['compiled_bytes'] / 1024:>8.1f}KB"
+                f"{saved * 100:>6.1f}%")
+        if args.gzip:
+            line += f"{report['gzip_bytes'] / 1024:>8.1f}KB"
+        line += f"{delta_ms:>+9.2f}ms"
+        print(line)
+
+        if not report['round_trip']:
+            failures.append(f"{report['file']}: compiled output does not decode to the source data")
+        if report['duplicate_keys']:
+            print(f"   ⚠️  duplicate keys (last value wins): {', '.join(sorted(set(report['duplicate_keys'])))}")
+
+    print("-" * len(header))
+    source_total = totals['source_bytes'] or 1
+    print(f"Total: {totals['source_bytes'] / 1024:.1f} KB -> {totals['compiled_bytes'] / 1024:.1f} KB minified "
+          f"({(1 - totals['compiled_bytes'] / source_total) * 100:.1f}% saved)")
+    if args.gzip:
+        print(f"       {totals['gzip_bytes'] / 1024:.1f} KB gzipped "
+              f"({(1 - totals['gzip_bytes'] / source_total) * 100:.1f}% saved)")
+    print(f"Output: {out_dir}")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ All compiled assets round-trip to their source data")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Validate every quiz bank and compile it into per-stage shards.
+
+The app loads all six quiz_*.v1.json banks whole and then filters by
+stage. This validates all banks in one pass (schema, answerIndex in range,
+ids unique across banks, question module matching its bank, and the
+declared totalStages/questionsPerStage layout), then writes one shard per
+module and stage plus an index, so starting a stage decodes only its own
+questions:
+
+    build/assets_data/quiz_shards/index.v1.json
+    build/assets_data/quiz_shards/shared.v1.json
+    build/assets_data/quiz_shards/<module>/stage_<n>.v1.json
+
+Each stage shard holds its questions in source order plus --orders
+deterministic pre-shuffled orderings of them (lists of question indices).
+The shuffles are seeded from the module, stage and the shard's content,
+so they only change when the questions do. Option order is kept, since
+options like "All of the above" depend on their position.
+
+Questions that are identical after normalizing case, whitespace and
+punctuation (same question, same options, same correct answer) are
+reported. Every bank keeps its own copy and its stage layout. Copies whose
+content (everything but id, module and stage) is exactly the same are
+stored once in shared.v1.json, keyed by the first copy's id. Their stage
+shard entries keep id, module and stage and name the pool entry in
+'shared'.
+
+Index entries record each shard's path, byte size and SHA-256. After
+writing, every bank is reassembled from its shards and the shared pool
+and compared with the source.
+
+Usage: python tools/compile_quiz.py [--out DIR] [--orders N] [--check]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import shutil
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from asset_schemas import family_for
+from build_manifest import check_quiz
+from compile_assets import minify
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+ASSETS_DIR = Path('assets/data')
+OUTPUT_DIR = Path('build/assets_data/quiz_shards')
+INDEX_VERSION = 1
+DEFAULT_ORDERS = 8
+SAFE_NAME = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]*$')
+NON_WORD = re.compile(r'\W+')
+# Fields a pooled question keeps in its own module's stage shard
+PER_QUESTION_FIELDS = ('id', 'module', 'stage')
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize(text):
+    return NON_WORD.sub(' ', str(text).casefold()).strip()
+
+
+def question_key(question):
+    """Identity of a question regardless of case, spacing, punctuation and option order"""
+    options = [normalize(option) for option in question['options']]
+    return normalize(question['question']), tuple(sorted(options)), options[question['answerIndex']]
+
+
+def load_banks(assets_dir=ASSETS_DIR):
+    """(banks as [(file name, data)], errors) for every quiz_*.json, validated in one pass"""
+    banks, errors = [], []
+    owners = {}
+    for filepath in sorted(assets_dir.glob('quiz_*.json')):
+        name = filepath.name
+        try:
+            data = json.loads(filepath.read_bytes())
+        except ValueError as e:
+            errors.append(f"{name}: invalid JSON ({e})")
+            continue
+        findings = family_for(name).validate(data)
+        errors.extend(f"{name}:{path}: {message}" for path, message in findings)
+        if findings:
+            continue
+        if not SAFE_NAME.match(data['module']):
+            errors.append(f"{name}: module '{data['module']}' is not a safe directory name")
+            continue
+        for i, question in enumerate(data['questions']):
+            if question['module'] != data['module']:
+                errors.append(f"{name}:questions[{i}].module: '{question['module']}' in the '{data['module']}' bank")
+            if question['id'] in owners and owners[question['id']] != name:
+                errors.append(f"{name}:questions[{i}].id: '{question['id']}' is also used in {owners[question['id']]}")
+            owners.setdefault(question['id'], name)
+        banks.append((name, data))
+    return banks, errors
+
+
+def content_of(question):
+    return {key: value for key, value in question.items() if key not in PER_QUESTION_FIELDS}
+
+
+def find_duplicates(banks):
+    """(shared pool {id: content}, {question id: pool id}, report lines); the banks are left as they are"""
+    copies = Counter(minify(content_of(question)) for _, data in banks for question in data['questions'])
+    pool, shared, pool_ids = {}, {}, {}
+    first = {}
+    report = []
+    for name, data in banks:
+        for question in data['questions']:
+            content = minify(content_of(question))
+            if copies[content] > 1:
+                pool_id = pool_ids.setdefault(content, question['id'])
+                pool.setdefault(pool_id, content_of(question))
+                shared[question['id']] = pool_id
+            key = question_key(question)
+            if key not in first:
+                first[key] = (name, question['id'])
+                continue
+            first_name, first_id = first[key]
+            stored = "stored once" if shared.get(first_id, first_id) == shared.get(question['id']) \
+                else "worded differently, stored in both"
+            report.append(f"{name}: '{question['id']}' duplicates '{first_id}' in {first_name} ({stored})")
+    return pool, shared, report
+
+
+def shuffled_orders(module, stage, encoded_questions, count):
+    """count deterministic permutations of the stage's question indices"""
+    size = len(json.loads(encoded_questions))
+    digest = sha256(encoded_questions.encode('utf-8'))
+    orders = []
+    for k in range(count):
+        order = list(range(size))
+        random.Random(f"{module}:{stage}:{k}:{digest}").shuffle(order)
+        orders.append(order)
+    return orders
+
+
+def shard_bank(name, data, out_dir, order_count, shared):
+    """Write one bank's stage shards, pooled questions by reference; returns its index entry"""
+    module = data['module']
+    module_dir = out_dir / module
+    if module_dir.exists():
+        shutil.rmtree(module_dir)
+    module_dir.mkdir(parents=True)
+
+    by_stage = defaultdict(list)
+    for question in data['questions']:
+        if question['id'] in shared:
+            question = {key: question[key] for key in PER_QUESTION_FIELDS}
+            question['shared'] = shared[question['id']]
+        by_stage[question['stage']].append(question)
+
+    stages = []
+    for stage in sorted(by_stage):
+        questions = by_stage[stage]
+        shard = {
+            'module': module,
+            'stage': stage,
+            'questions': questions,
+            'orders': shuffled_orders(module, stage, minify(questions), order_count),
+        }
+        encoded = minify(shard).encode('utf-8')
+        shard_path = f"{module}/stage_{stage}.v1.json"
+        (out_dir / shard_path).write_bytes(encoded)
+        stages.append({'stage': stage, 'shard': shard_path, 'questions': len(questions),
+                       'bytes': len(encoded), 'sha256': sha256(encoded)})
+
+    raw = (ASSETS_DIR / name).read_bytes()
+    entry = {key: value for key, value in data.items() if key != 'questions'}
+    entry['source'] = {'file': name, 'bytes': len(raw), 'sha256': sha256(raw)}
+    entry['stages'] = stages
+    return entry
+
+
+def reassemble(entry, out_dir, pool):
+    """A bank's questions rebuilt from its shards and the shared pool, in stage order"""
+    questions = []
+    for stage in entry['stages']:
+        encoded = (out_dir / stage['shard']).read_bytes()
+        if sha256(encoded) != stage['sha256'] or len(encoded) != stage['bytes']:
+            raise ValueError(f"shard {stage['shard']} does not match its index hash/size")
+        shard = json.loads(encoded)
+        for order in shard['orders']:
+            if sorted(order) != list(range(len(shard['questions']))):
+                raise ValueError(f"shard {stage['shard']} has an ordering that is not a permutation")
+        for question in shard['questions']:
+            if 'shared' in question:
+                pooled = {key: value for key, value in question.items() if key != 'shared'}
+                pooled.update(pool[question['shared']])
+                question = pooled
+            questions.append(question)
+    return questions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate the quiz banks and compile them into per-stage shards.')
+    parser.add_argument('--out', default=str(OUTPUT_DIR), help='output directory (default: build/assets_data/quiz_shards)')
+    parser.add_argument('--orders', type=int, default=DEFAULT_ORDERS, help='pre-shuffled orderings per stage')
+    parser.add_argument('--check', action='store_true', help='only validate the banks; write nothing')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("QUIZ BANK COMPILER")
+    print("=" * 80)
+
+    banks, errors = load_banks()
+    if not banks and not errors:
+        print(f"❌ No quiz banks found in {ASSETS_DIR}")
+        sys.exit(1)
+    for name, data in banks:
+        errors.extend(check_quiz(name, data))
+    pool, shared, duplicates = find_duplicates(banks)
+
+    print(f"Banks: {len(banks)}, questions: {sum(len(data['questions']) for _, data in banks)}, "
+          f"{len(duplicates)} duplicate(s), {len(pool)} shared")
+    for duplicate in duplicates:
+        print(f"⚠️  {duplicate}")
+    print(f"\n{'❌' if errors else '✅'} Validation: {len(errors)} error(s)")
+    for error in errors:
+        print(f"   {error}")
+    if errors:
+        sys.exit(1)
+    if args.check:
+        return
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    print(f"\n{'module':<20}{'source':>10}{'stages':>8}{'largest shard':>15}")
+    print("-" * 53)
+    failures = []
+    modules = []
+    encoded_pool = minify({'questions': pool}).encode('utf-8')
+    (out_dir / 'shared.v1.json').write_bytes(encoded_pool)
+    written_pool = json.loads((out_dir / 'shared.v1.json').read_bytes())['questions']
+    for name, data in banks:
+        entry = shard_bank(name, data, out_dir, args.orders, shared)
+        modules.append(entry)
+        try:
+            # Pooled questions come back with their fields regrouped, so keys are compared sorted
+            rebuilt = reassemble(entry, out_dir, written_pool)
+            expected = sorted(data['questions'], key=lambda q: q['stage'])
+            if json.dumps(rebuilt, sort_keys=True) != json.dumps(expected, sort_keys=True):
+                failures.append(f"{name}: shards do not reassemble to the source questions")
+        except (ValueError, OSError) as e:
+            failures.append(f"{name}: {e}")
+        largest = max((stage['bytes'] for stage in entry['stages']), default=0)
+        print(f"{data['module']:<20}{entry['source']['bytes'] / 1024:>8.1f}KB{len(entry['stages']):>8}"
+              f"{largest / 1024:>13.1f}KB")
+    print("-" * 53)
+
+    index = {'indexVersion': INDEX_VERSION, 'orders': args.orders,
+             'shared': {'shard': 'shared.v1.json', 'questions': len(pool),
+                        'bytes': len(encoded_pool), 'sha256': sha256(encoded_pool)},
+             'modules': modules}
+    (out_dir / 'index.v1.json').write_bytes(minify(index).encode('utf-8'))
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print(f"✅ All {len(banks)} banks reassemble from their shards. Output: {out_dir}")
+
+
+if __name__ == '__main__':
+    main()
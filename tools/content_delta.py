@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Delta update packages between two versions of assets/data.
+
+`diff` compares two versions - directories or git revisions - and writes a
+patch that holds only what changed. Changed files are diffed structurally:
+both versions are split into their JSON values (json_positions.span_tree),
+unchanged conditions/sections/array items are matched by their exact
+bytes, and the walk descends into changed containers, so an edited regimen
+costs a few hundred bytes instead of the whole 300 KB category. Every edit
+is a splice of the old file's bytes, which keeps the source formatting
+exactly; the generator applies its own patch and checks the result
+byte-for-byte (falling back to shipping the whole file if it ever differs).
+
+`apply` checks each file's base hash, applies the edits and checks the
+result hash, so a patch can only turn the version it was built from into
+the version it was built for.
+
+Patch layout (gzipped when the path ends in .gz):
+
+    {"format": 1, "files": {
+        "cds/x.v1.json": {"op": "patch", "base": "<sha256>", "sha256": "<sha256>",
+                          "edits": [[start, end, "replacement text"], ...]},
+        "quiz_new.v1.json": {"op": "add", "sha256": "...", "content": "..."},
+        "old.json": {"op": "delete", "base": "..."}}}
+
+Usage:
+    python tools/content_delta.py diff OLD [NEW] [--output PATH]
+    python tools/content_delta.py apply PATCH [--target DIR]
+
+OLD and NEW are assets/data directories or git revisions (NEW defaults to
+the working tree's assets/data).
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import subprocess
+import sys
+from difflib import SequenceMatcher
+from pathlib import Path
+
+from compile_assets import minify
+from json_positions import span_tree
+from schema_compiler import child_path
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+ASSETS_DIR = Path('assets/data')
+OUTPUT_PATH = Path('build/content_tools/content_delta.json.gz')
+PATCH_FORMAT = 1
+# Edits are reported at this depth: conditions[3].sections.empiric
+REPORT_DEPTH = 4
+
+
+def sha256(raw):
+    return hashlib.sha256(raw).hexdigest()
+
+
+def read_directory(directory):
+    """{relative path: bytes} for every JSON file under a directory"""
+    directory = Path(directory)
+    return {path.relative_to(directory).as_posix(): path.read_bytes() for path in sorted(directory.rglob('*.json'))}
+
+
+def read_revision(revision, subdir=ASSETS_DIR):
+    """{relative path: bytes} for every JSON file under assets/data at a git revision"""
+    prefix = subdir.as_posix() + '/'
+    listing = subprocess.run(['git', 'ls-tree', '-r', '-z', '--name-only', revision, '--', prefix],
+                             capture_output=True, check=True).stdout.decode('utf-8')
+    files = {}
+    for name in sorted(filter(None, listing.split('\0'))):
+        if name.endswith('.json'):
+            files[name[len(prefix):]] = subprocess.run(['git', 'show', f'{revision}:{name}'],
+                                                       capture_output=True, check=True).stdout
+    return files
+
+
+def read_version(source):
+    """A directory if one exists at that path, otherwise a git revision"""
+    if Path(source).is_dir():
+        return read_directory(source)
+    return read_revision(source)
+
+
+def diff_spans(old_raw, old, new_raw, new, path, edits):
+    """Append (start, end, replacement, path) splices that turn the old value's bytes into the new one's"""
+    if old_raw[old.start:old.end] == new_raw[new.start:new.end]:
+        return
+    if old.children is None or new.children is None or old_raw[old.start] != new_raw[new.start]:
+        edits.append((old.start, old.end, new_raw[new.start:new.end], path))
+        return
+
+    # Each unit is a child plus the separator/whitespace/key in front of it
+    def units(raw, span):
+        starts = [span.start + 1] + [child.end for _, child in span.children[:-1]]
+        return [(start, key, child) for start, (key, child) in zip(starts, span.children)]
+
+    old_units, new_units = units(old_raw, old), units(new_raw, new)
+    matcher = SequenceMatcher(None, [old_raw[u[0]:u[2].end] for u in old_units],
+                              [new_raw[u[0]:u[2].end] for u in new_units], autojunk=False)
+    is_array = old_raw[old.start] == ord('[')
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        if tag == 'replace' and i2 - i1 == j2 - j1:
+            for (o_start, o_key, o_child), (n_start, n_key, n_child) in zip(old_units[i1:i2], new_units[j1:j2]):
+                if o_key == n_key:
+                    if old_raw[o_start:o_child.start] != new_raw[n_start:n_child.start]:
+                        # Same key, different separator/whitespace in front of it
+                        edits.append((o_start, o_child.start, new_raw[n_start:n_child.start], path))
+                    child = f"{path}[{n_key}]" if is_array else child_path(path, n_key)
+                    diff_spans(old_raw, o_child, new_raw, n_child, child, edits)
+                else:
+                    edits.append((o_start, o_child.end, new_raw[n_start:n_child.end], path))
+            continue
+        start = old_units[i1][0] if i1 < len(old_units) else (old_units[-1][2].end if old_units else old.start + 1)
+        end = old_units[i2 - 1][2].end if i2 > i1 else start
+        replacement = new_raw[new_units[j1][0]:new_units[j2 - 1][2].end] if j2 > j1 else b''
+        edits.append((start, end, replacement, path))
+
+    # Whitespace between the last child and the closing bracket
+    old_tail = old_units[-1][2].end if old_units else old.start + 1
+    new_tail = new_units[-1][2].end if new_units else new.start + 1
+    if old_raw[old_tail:old.end - 1] != new_raw[new_tail:new.end - 1]:
+        edits.append((old_tail, old.end - 1, new_raw[new_tail:new.end - 1], path))
+
+
+def apply_edits(raw, edits):
+    """Splice (start, end, replacement) edits into bytes; edits must not overlap"""
+    parts = []
+    position = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: edit[0]):
+        parts.append(raw[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(raw[position:])
+    return b''.join(parts)
+
+
+def diff_file(old_raw, new_raw):
+    """(patch entry, [changed paths]) for a modified file"""
+    entry = {'op': 'patch', 'base': sha256(old_raw), 'sha256': sha256(new_raw)}
+    try:
+        json.loads(old_raw), json.loads(new_raw)
+        old_root, new_root = span_tree(old_raw), span_tree(new_raw)
+    except ValueError:
+        old_root = new_root = None
+
+    edits = []
+    if old_root is not None and new_root is not None:
+        # Leading/trailing whitespace around the root value (e.g. the final newline)
+        if old_raw[:old_root.start] != new_raw[:new_root.start]:
+            edits.append((0, old_root.start, new_raw[:new_root.start], ''))
+        diff_spans(old_raw, old_root, new_raw, new_root, '', edits)
+        if old_raw[old_root.end:] != new_raw[new_root.end:]:
+            edits.append((old_root.end, len(old_raw), new_raw[new_root.end:], ''))
+
+    if old_root is None or apply_edits(old_raw, [e[:3] for e in edits]) != new_raw:
+        # Not JSON on one side, or a splice the walk got wrong: ship the whole file
+        edits = [(0, len(old_raw), new_raw, '')]
+    entry['edits'] = [[start, end, replacement.decode('utf-8')] for start, end, replacement, _ in edits]
+    if len(minify(entry)) > len(new_raw):
+        entry = {'op': 'add', 'base': entry['base'], 'sha256': entry['sha256'], 'content': new_raw.decode('utf-8')}
+    return entry, [path for *_, path in edits]
+
+
+def report_path(path):
+    """Truncate a JSON path to the condition/section level for the report"""
+    parts = [p for p in path.replace('[', '.[').split('.') if p]
+    return '.'.join(parts[:REPORT_DEPTH]).replace('.[', '[') or '<root>'
+
+
+def build_patch(old_files, new_files):
+    """(patch, report rows) between two {path: bytes} versions"""
+    files = {}
+    rows = []
+    for name in sorted(set(old_files) | set(new_files)):
+        old_raw, new_raw = old_files.get(name), new_files.get(name)
+        if old_raw == new_raw:
+            continue
+        if new_raw is None:
+            entry, changed, status = {'op': 'delete', 'base': sha256(old_raw)}, [], 'deleted'
+        elif old_raw is None:
+            entry = {'op': 'add', 'sha256': sha256(new_raw), 'content': new_raw.decode('utf-8')}
+            changed, status = [], 'added'
+        else:
+            entry, changed = diff_file(old_raw, new_raw)
+            status = 'modified' if entry['op'] == 'patch' else 'replaced'
+        files[name] = entry
+        rows.append({'file': name, 'status': status, 'full_bytes': len(new_raw or b''),
+                     'patch_bytes': len(minify(entry).encode('utf-8')),
+                     'changed': sorted({report_path(path) for path in changed})})
+    return {'format': PATCH_FORMAT, 'files': files}, rows
+
+
+def write_patch(patch, output):
+    output.parent.mkdir(parents=True, exist_ok=True)
+    data = minify(patch).encode('utf-8')
+    if output.suffix == '.gz':
+        # mtime=0 keeps the package byte-for-byte reproducible
+        data = gzip.compress(data, compresslevel=9, mtime=0)
+    output.write_bytes(data)
+    return len(data)
+
+
+def read_patch(path):
+    data = Path(path).read_bytes()
+    if data[:2] == b'\x1f\x8b':
+        data = gzip.decompress(data)
+    return json.loads(data)
+
+
+def apply_patch(patch, target):
+    """Apply a patch to a directory in place; returns a list of errors (nothing is written if any)"""
+    if patch.get('format') != PATCH_FORMAT:
+        return [f"unsupported patch format {patch.get('format')}"]
+    target = Path(target)
+    errors = []
+    results = {}
+    for name, entry in patch['files'].items():
+        path = target / name
+        current = path.read_bytes() if path.exists() else None
+        if 'base' in entry and (current is None or sha256(current) != entry['base']):
+            errors.append(f"{name}: does not match the patch's base version")
+            continue
+        if entry['op'] == 'delete':
+            results[name] = None
+            continue
+        if entry['op'] == 'add':
+            result = entry['content'].encode('utf-8')
+        else:
+            result = apply_edits(current, [(start, end, text.encode('utf-8')) for start, end, text in entry['edits']])
+        if sha256(result) != entry['sha256']:
+            errors.append(f"{name}: patched content does not match the expected hash")
+            continue
+        results[name] = result
+    if errors:
+        return errors
+
+    for name, result in results.items():
+        path = target / name
+        if result is None:
+            path.unlink()
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(result)
+    return []
+
+
+def run_diff(args):
+    try:
+        old_files = read_version(args.old)
+        new_files = read_version(args.new)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ git failed: {e.stderr.decode('utf-8', errors='replace').strip()}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print(f"CONTENT DELTA: {args.old} -> {args.new}")
+    print("=" * 80)
+
+    patch, rows = build_patch(old_files, new_files)
+    if not rows:
+        print("✅ No changes")
+    for row in rows:
+        print(f"{row['file']:<52}{row['status']:>9}{row['full_bytes'] / 1024:>9.1f}KB full"
+              f"{row['patch_bytes'] / 1024:>9.1f}KB patch")
+        for changed in row['changed']:
+            print(f"   ~ {changed}")
+
+    output = Path(args.output)
+    package_bytes = write_patch(patch, output)
+    full_bytes = sum(row['full_bytes'] for row in rows)
+    full_gzip = len(gzip.compress(b''.join(new_files[row['file']] for row in rows if row['file'] in new_files),
+                                  compresslevel=9, mtime=0))
+    print("-" * 80)
+    print(f"Changed files: {len(rows)} of {len(set(old_files) | set(new_files))}")
+    print(f"Full files: {full_bytes / 1024:.1f} KB ({full_gzip / 1024:.1f} KB gzipped)")
+    print(f"Patch: {sum(row['patch_bytes'] for row in rows) / 1024:.1f} KB "
+          f"({package_bytes / 1024:.1f} KB as written)")
+    print(f"Patch written to {output}")
+
+
+def run_apply(args):
+    patch = read_patch(args.patch)
+    errors = apply_patch(patch, args.target)
+    if errors:
+        for error in errors:
+            print(f"❌ {error}")
+        print("Nothing was written")
+        sys.exit(1)
+    print(f"✅ Applied {len(patch['files'])} file change(s) to {args.target}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or apply delta patches between versions of assets/data.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    diff = commands.add_parser('diff', help='build a patch from OLD to NEW')
+    diff.add_argument('old', help='assets/data directory or git revision')
+    diff.add_argument('new', nargs='?', default=str(ASSETS_DIR),
+                      help='assets/data directory or git revision (default: assets/data)')
+    diff.add_argument('--output', default=str(OUTPUT_PATH), help='patch path (.gz to compress)')
+    apply = commands.add_parser('apply', help='apply a patch to a directory in place')
+    apply.add_argument('patch', help='patch file')
+    apply.add_argument('--target', default=str(ASSETS_DIR), help='directory to patch (default: assets/data)')
+    args = parser.parse_args()
+
+    if args.command == 'diff':
+        run_diff(args)
+    else:
+        run_apply(args)
+
+
+if __name__ == '__main__':
+    main()
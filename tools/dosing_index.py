@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Corpus-wide dosing regimen index for the CDS categories.
+
+Extracts every dosing regimen (drug, dose, unit, route, frequency) from the
+section content of each category in place, with its condition, section and
+JSON path, and streams them to a JSONL or CSV index. Regimens that do not
+follow the house format ("Ceftriaxone 2g IV daily") are reported per section.
+
+Usage:
+    python tools/dosing_index.py [--format jsonl|csv] [--output PATH] [--sections]
+    python tools/dosing_index.py --query vancomycin [--non-conforming]
+"""
+
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+
+from cds_rules import DosingRule, RuleEngine
+from validate_all_cds import CDS_DIR, DOSING_PATTERN
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+OUTPUT_DIR = Path('build/content_tools')
+FIELDS = ['category', 'condition_id', 'condition', 'section', 'path', 'drug', 'dose', 'unit',
+          'route', 'frequency', 'conforming', 'problems', 'text']
+
+ENGINE = RuleEngine([DosingRule(DOSING_PATTERN)])
+
+
+def iter_category_regimens(files):
+    """Yield (filepath, regimens, section_warnings) one category at a time"""
+    for json_file in files:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        doc = ENGINE.run(data, json_file.name)
+        category = data.get('id', json_file.name.split('.')[0])
+        regimens = doc.state[DosingRule.id]
+        for regimen in regimens:
+            regimen['category'] = category
+        yield json_file, regimens, doc.warnings[DosingRule.id]
+
+
+class IndexWriter:
+    """Streams regimen records to JSONL or CSV"""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        if fmt == 'csv':
+            self._csv = csv.DictWriter(self._file, fieldnames=FIELDS)
+            self._csv.writeheader()
+
+    def write(self, regimen):
+        if self.fmt == 'csv':
+            row = dict(regimen, problems='; '.join(regimen['problems']))
+            self._csv.writerow({field: row.get(field) for field in FIELDS})
+        else:
+            self._file.write(json.dumps({field: regimen.get(field) for field in FIELDS}, ensure_ascii=False))
+            self._file.write('\n')
+
+    def close(self):
+        self._file.close()
+
+
+def build_index(args):
+    files = sorted(CDS_DIR.glob('*.json'))
+    if not files:
+        print(f"❌ No JSON files found in {CDS_DIR}")
+        sys.exit(1)
+
+    output = Path(args.output) if args.output else OUTPUT_DIR / f'dosing_index.{args.format}'
+    writer = IndexWriter(output, args.format)
+
+    print("=" * 80)
+    print("CDS DOSING INDEX")
+    print("=" * 80)
+
+    total = 0
+    total_conforming = 0
+    try:
+        for json_file, regimens, section_warnings in iter_category_regimens(files):
+            conforming = 0
+            for regimen in regimens:
+                writer.write(regimen)
+                conforming += regimen['conforming']
+            total += len(regimens)
+            total_conforming += conforming
+
+            print(f"{json_file.name}: {len(regimens)} regimens, {len(regimens) - conforming} non-conforming "
+                  f"in {len(section_warnings)} sections")
+            if args.sections:
+                for warning in section_warnings:
+                    print(f"   ⚠️  {warning}")
+    finally:
+        writer.close()
+
+    print("-" * 80)
+    print(f"Regimens: {total} ({total_conforming} conforming, {total - total_conforming} non-conforming)")
+    print(f"Index written to {output}")
+
+
+def query_index(args):
+    """Stream an existing index and print regimens for one drug"""
+    path = Path(args.output) if args.output else OUTPUT_DIR / 'dosing_index.jsonl'
+    if not path.exists():
+        print(f"❌ Index not found: {path} (run without --query first)")
+        sys.exit(1)
+
+    drug = args.query.lower()
+    matches = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            regimen = json.loads(line)
+            if regimen['drug'].lower() != drug:
+                continue
+            if args.non_conforming and regimen['conforming']:
+                continue
+            matches += 1
+            flag = '' if regimen['conforming'] else f"  [{', '.join(regimen['problems'])}]"
+            print(f"{regimen['category']}: {regimen['path']}: {regimen['text']}{flag}")
+    print(f"{matches} regimen(s) for '{args.query}'")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the CDS dosing regimen index.')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl', help='index format')
+    parser.add_argument('--output', help='index path (default: build/content_tools/dosing_index.<format>)')
+    parser.add_argument('--sections', action='store_true', help='list non-conforming regimens per section')
+    parser.add_argument('--query', metavar='DRUG', help='print regimens for DRUG from an existing JSONL index')
+    parser.add_argument('--non-conforming', action='store_true', help='with --query, only non-conforming regimens')
+    args = parser.parse_args()
+
+    if args.query:
+        query_index(args)
+    else:
+        build_index(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Canonical drug lexicon and a corpus-wide scan for misspelled drug names.
+
+The lexicon is built from the antibiotic names in
+stewardship/antibiotic_spectrum_data.json (name and genericName) and the
+drugs lists in stewardship/allergy_cross_reactivity_rules.json. Every
+name is split into its words ('Piperacillin-Tazobactam' -> piperacillin,
+tazobactam). The words go into a trie for exact and plural lookups and into
+a BK-tree for fuzzy lookups. A BK-tree query only visits nodes whose
+distance band can still hold a match, so cost grows well below linearly
+with lexicon size.
+
+Every string value under assets/data is then scanned once. A word that is
+not in the lexicon but is within one edit of a lexicon word (two for words
+over 8 letters) is reported as a likely misspelling ('cefriaxone' -> 'ceftriaxone'). Each
+distinct word is looked up only once per run. Combination drugs written
+with a separator other than the canonical hyphen ('piperacillin/
+tazobactam') are reported as non-canonical variants. Findings carry
+file, JSON path and line:column.
+
+Real drugs or words that merely look like a lexicon word (cefixime vs
+cefepime) are listed in NOT_MISSPELLINGS; --allow FILE adds more, one word
+per line.
+
+Usage: python tools/drug_lexicon.py [--allow FILE] [--output PATH] [--strict]
+                                    [--jsonl PATH|-] [--sarif PATH]
+"""
+
+import argparse
+import contextlib
+import json
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from issue_output import WARNING, open_issue_stream
+from json_positions import load_json_with_positions
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+sys.stderr.reconfigure(encoding='utf-8')
+
+DATA_DIR = Path('assets/data')
+SPECTRUM_PATH = DATA_DIR / 'stewardship' / 'antibiotic_spectrum_data.json'
+ALLERGY_PATH = DATA_DIR / 'stewardship' / 'allergy_cross_reactivity_rules.json'
+OUTPUT_PATH = Path('build/content_tools/drug_lexicon.json')
+
+MIN_WORD = 5
+# Lexicon words that are not drug names on their own ('Colistimethate Sodium')
+NON_DRUG_WORDS = {'sodium', 'potassium', 'calcium'}
+# Near a lexicon word, but correct
+NOT_MISSPELLINGS = {
+    'cefixime', 'cefoxitin', 'cefotetan', 'cefuroxime', 'cefiderocol', 'cefpodoxime',
+    'norfloxacin', 'gemifloxacin', 'holistic', 'solium',
+}
+WORD = re.compile(r'[A-Za-z]+')
+
+
+def max_distance(word):
+    """Edits tolerated for a word of this length: short words get fewer"""
+    return 1 if len(word) <= 8 else 2
+
+
+def pattern_masks(word):
+    """Per-character bitmasks of word, for levenshtein()"""
+    masks = {}
+    for i, char in enumerate(word):
+        masks[char] = masks.get(char, 0) | 1 << i
+    return masks
+
+
+def levenshtein(word, other, masks=None):
+    """Edit distance, bit-parallel over word (Myers 1999); pass pattern_masks(word) to reuse it"""
+    if not word:
+        return len(other)
+    masks = masks if masks is not None else pattern_masks(word)
+    full = (1 << len(word)) - 1
+    high = 1 << (len(word) - 1)
+    positive, negative = full, 0
+    score = len(word)
+    for char in other:
+        eq = masks.get(char, 0)
+        vertical = eq | negative
+        horizontal = (((eq & positive) + positive) ^ positive) | eq
+        h_positive = negative | ~(horizontal | positive)
+        h_negative = positive & horizontal
+        if h_positive & high:
+            score += 1
+        elif h_negative & high:
+            score -= 1
+        h_positive = (h_positive << 1) | 1
+        h_negative <<= 1
+        positive = (h_negative | ~(vertical | h_positive)) & full
+        negative = h_positive & vertical & full
+    return score
+
+
+class Trie:
+    """Lowercase word -> canonical spelling, with plural-tolerant lookup"""
+
+    def __init__(self):
+        self.root = {}
+        self.size = 0
+
+    def add(self, word, canonical):
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        if '' not in node:
+            self.size += 1
+        node[''] = canonical
+
+    def get(self, word):
+        """Canonical spelling of word, or of word without a plural 's'"""
+        node = self.root
+        for i, char in enumerate(word):
+            if '' in node and i == len(word) - 1 and char == 's':
+                return node['']
+            node = node.get(char)
+            if node is None:
+                return None
+        return node.get('')
+
+
+class BKTree:
+    """Burkhard-Keller tree over Levenshtein distance"""
+
+    def __init__(self):
+        self.root = None
+        self.visits = 0
+
+    def add(self, word):
+        if self.root is None:
+            self.root = (word, {})
+            return
+        node = self.root
+        while True:
+            distance = levenshtein(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                return
+            node = child
+
+    def search(self, word, tolerance):
+        """[(distance, word)] within tolerance, closest first"""
+        found = []
+        masks = pattern_masks(word)
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            self.visits += 1
+            distance = levenshtein(word, node[0], masks)
+            if distance <= tolerance:
+                found.append((distance, node[0]))
+            # Triangle inequality: only children in [d - t, d + t] can hold a match
+            for edge, child in node[1].items():
+                if distance - tolerance <= edge <= distance + tolerance:
+                    stack.append(child)
+        return sorted(found)
+
+
+class DrugLexicon:
+    def __init__(self, names, allow=()):
+        """names: {canonical name: [source, ...]}"""
+        self.names = names
+        self.trie = Trie()
+        self.tree = BKTree()
+        self.allow = {word.lower() for word in allow}
+        self.compounds = {}
+        for name in names:
+            parts = WORD.findall(name)
+            for part in parts:
+                word = part.lower()
+                if len(word) >= MIN_WORD and word not in NON_DRUG_WORDS:
+                    self.trie.add(word, part)
+                    self.tree.add(word)
+            hyphenated = re.fullmatch(r'([A-Za-z]+)-([A-Za-z]+)', name)
+            if hyphenated and all(len(part) >= MIN_WORD for part in hyphenated.groups()):
+                self.compounds[(hyphenated.group(1).lower(), hyphenated.group(2).lower())] = name
+        pairs = '|'.join(f"{re.escape(first)}(?:\\s*/\\s*|\\s+){re.escape(second)}"
+                         for first, second in sorted(self.compounds))
+        self.variant_pattern = re.compile(rf"\b(?:{pairs})\b", re.IGNORECASE) if pairs else None
+        self._cache = {}
+        self.queries = 0
+
+    def suggest(self, word):
+        """(canonical word, distance) for a likely misspelling, or None; cached per word"""
+        key = word.lower()
+        if key in self._cache:
+            return self._cache[key]
+        result = None
+        if len(key) >= MIN_WORD and key not in self.allow and key not in NOT_MISSPELLINGS \
+                and self.trie.get(key) is None:
+            self.queries += 1
+            matches = self.tree.search(key, max_distance(key))
+            if matches:
+                distance, match = matches[0]
+                result = (self.trie.get(match), distance)
+        self._cache[key] = result
+        return result
+
+    def variant(self, text):
+        """[(start, found text, canonical name)] for combinations written without the hyphen"""
+        if self.variant_pattern is None:
+            return []
+        found = []
+        for match in self.variant_pattern.finditer(text):
+            first, second = (part.lower() for part in WORD.findall(match.group()))
+            found.append((match.start(), match.group(), self.compounds[(first, second)]))
+        return found
+
+
+def canonical_names():
+    """{name: [sources]} from the spectrum data and the allergy rules"""
+    names = defaultdict(list)
+    with open(SPECTRUM_PATH, 'r', encoding='utf-8') as f:
+        spectrum = json.load(f)
+    for antibiotic in spectrum['antibiotics']:
+        for field in ('name', 'genericName'):
+            # 'Colistin (Polymyxin E)' and 'TMP-SMX (Co-trimoxazole)' name two spellings each
+            for name in re.split(r'\s*[()]\s*', antibiotic[field]):
+                if name:
+                    names[name].append(f"{SPECTRUM_PATH.name}:{antibiotic['id']}.{field}")
+    with open(ALLERGY_PATH, 'r', encoding='utf-8') as f:
+        allergy = json.load(f)
+    for drug_class in allergy['drugClasses']:
+        for drug in drug_class['drugs']:
+            names[drug].append(f"{ALLERGY_PATH.name}:{drug_class['id']}")
+    return dict(names)
+
+
+def iter_strings(value, path=''):
+    """(JSON path, string) for every string value in a document"""
+    if isinstance(value, str):
+        yield path, value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from iter_strings(item, f"{path}.{key}" if path else key)
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            yield from iter_strings(item, f"{path}[{i}]")
+
+
+def match_case(word, canonical):
+    return canonical.lower() if word.islower() else canonical
+
+
+class MisspellingRule:
+    """Word is a few edits away from a canonical drug name"""
+    id = 'drug-misspelling'
+
+
+class VariantRule:
+    """Combination drug is not written in its canonical hyphenated form"""
+    id = 'drug-variant'
+
+
+RULES = [MisspellingRule, VariantRule]
+
+
+def scan_file(filepath, lexicon, sink=None):
+    """[(rule id, path, (line, column), found, suggestion, distance)] for one file"""
+    data, positions = load_json_with_positions(filepath)
+    findings = []
+    for path, text in iter_strings(data):
+        hits = []
+        for match in WORD.finditer(text):
+            suggestion = lexicon.suggest(match.group())
+            if suggestion is not None:
+                canonical, distance = suggestion
+                hits.append((MisspellingRule.id, match.start(), match.group(),
+                             match_case(match.group(), canonical), distance))
+        for start, found, canonical in lexicon.variant(text):
+            hits.append((VariantRule.id, start, found, canonical, None))
+        if not hits:
+            continue
+        for rule_id, start, found, suggestion, distance in hits:
+            where = positions.locate_in_string(path, start)
+            findings.append((rule_id, path, where, found, suggestion, distance))
+            if sink is not None:
+                detail = f" (edit distance {distance})" if distance is not None else ""
+                sink.emit(rule_id, WARNING, f"'{found}' should probably be '{suggestion}'{detail}", path, where)
+    return findings
+
+
+def load_allow(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def run(args, stream=None):
+    files = sorted(DATA_DIR.rglob('*.json'))
+    if not files:
+        print(f"❌ No JSON files found in {DATA_DIR}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("DRUG LEXICON")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    names = canonical_names()
+    lexicon = DrugLexicon(names, load_allow(args.allow) if args.allow else ())
+    print(f"Lexicon: {len(names)} canonical names, {lexicon.trie.size} words, "
+          f"{len(lexicon.compounds)} combination drugs")
+
+    results = []
+    failures = []
+    for filepath in files:
+        relative = filepath.relative_to(DATA_DIR).as_posix()
+        sink = stream.file(filepath) if stream is not None else None
+        try:
+            findings = scan_file(filepath, lexicon, sink)
+        except (OSError, ValueError) as e:
+            failures.append(f"{relative}: {e}")
+            continue
+        if findings:
+            results.append((relative, findings))
+    elapsed = time.perf_counter() - start
+
+    for relative, findings in results:
+        print(f"\n⚠️  {relative}")
+        for rule_id, path, (line, col), found, suggestion, distance in findings:
+            kind = f"misspelling, {distance} edit(s)" if rule_id == MisspellingRule.id else "variant"
+            print(f"      [{line}:{col}] {path}: '{found}' -> '{suggestion}' ({kind})")
+
+    counts = Counter((found.lower(), suggestion) for _, findings in results
+                     for _, _, _, found, suggestion, _ in findings)
+    if counts:
+        print("\nMost frequent:")
+        for (found, suggestion), count in counts.most_common(10):
+            print(f"   {count:>4}  {found} -> {suggestion}")
+
+    average = lexicon.tree.visits / lexicon.queries if lexicon.queries else 0
+    print("-" * 80)
+    print(f"Fuzzy lookups: {lexicon.queries} distinct words, {average:.1f} of {lexicon.trie.size} "
+          f"BK-tree nodes visited on average")
+    total = sum(len(findings) for _, findings in results)
+    print(f"Summary: {len(files)} files, {total} finding(s) in {len(results)} file(s) in {elapsed:.2f}s")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'names': names, 'compounds': sorted(lexicon.compounds.values())}, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    print(f"Lexicon written to {output}")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures or (args.strict and total):
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the drug lexicon and report misspelled drug names in assets/data.')
+    parser.add_argument('--allow', metavar='FILE', help='words that are not misspellings, one per line')
+    parser.add_argument('--output', default=str(OUTPUT_PATH), help='lexicon JSON path')
+    parser.add_argument('--strict', action='store_true', help='exit with status 1 when anything is reported')
+    parser.add_argument('--jsonl', metavar='PATH',
+                        help="stream findings as JSON lines to PATH ('-' for stdout, text report to stderr)")
+    parser.add_argument('--sarif', metavar='PATH', help='also write findings as a SARIF 2.1.0 log')
+    args = parser.parse_args()
+
+    # Opened before stdout is redirected, so '-' still means the real stdout
+    stream = open_issue_stream(args.jsonl, args.sarif, 'drug_lexicon', RULES)
+    try:
+        if args.jsonl == '-':
+            with contextlib.redirect_stdout(sys.stderr):
+                run(args, stream)
+        else:
+            run(args, stream)
+    finally:
+        if stream is not None:
+            stream.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Polling file watcher for the content tools' --watch modes.
+
+Files are compared by (mtime_ns, size) on every poll, which is cheap for
+the few hundred JSON files under assets/data and works the same on every
+platform (no inotify/FSEvents dependency). A burst of saves - editors
+often write a temp file, rename it and touch it again - is reported as
+one batch once the files have been quiet for the debounce period.
+"""
+
+import time
+from pathlib import Path
+
+
+class PollingWatcher:
+    """Report created, modified and removed files under a set of directories"""
+
+    def __init__(self, roots, pattern='*.json', interval=0.05, debounce=0.05, max_delay=1.0):
+        self.roots = [Path(root) for root in roots]
+        self.pattern = pattern
+        self.interval = interval
+        self.debounce = debounce
+        # A file that never stops changing is still reported after this long
+        self.max_delay = max_delay
+        self._state = self.snapshot()
+
+    def snapshot(self):
+        state = {}
+        for root in self.roots:
+            if not root.exists():
+                continue
+            for path in root.rglob(self.pattern):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    # Deleted between listing and stat
+                    continue
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+        return state
+
+    def _diff(self, state):
+        changed = {path for path, stamp in state.items() if self._state.get(path) != stamp}
+        removed = set(self._state) - set(state)
+        return changed, removed
+
+    def wait(self):
+        """Block until a burst of changes has settled; returns (changed, removed) sorted lists"""
+        changed, removed = set(), set()
+        first_change = last_change = None
+        while True:
+            time.sleep(self.interval)
+            state = self.snapshot()
+            new_changed, new_removed = self._diff(state)
+            self._state = state
+            now = time.monotonic()
+            if new_changed or new_removed:
+                changed = (changed | new_changed) - new_removed
+                removed = (removed | new_removed) - new_changed
+                first_change = first_change or now
+                last_change = now
+            if last_change is None:
+                continue
+            if now - last_change >= self.debounce or now - first_change >= self.max_delay:
+                return sorted(changed), sorted(removed)
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Corpus-wide duplicate and near-duplicate detection for the CDS categories.
+
+Exact duplicates:
+- condition ids, ICD-10 codes and synonyms (case-insensitive) that appear
+  on more than one condition
+- section contents that are identical after whitespace/case normalization
+
+Near duplicates: every section's text is cut into word shingles and sketched
+with one-permutation MinHash; LSH banding proposes candidate pairs, whose
+shingle-set Jaccard similarity is then computed exactly. Only candidate
+pairs are compared, so the cost grows with the number of sections rather
+than its square.
+
+For each duplicate group the report estimates the bytes that could be
+reclaimed by keeping one copy (minified JSON size of the section content).
+
+Usage: python tools/find_duplicates.py [--threshold 0.7] [--output PATH] [--strict]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+from cds_rules import Rule, RuleEngine
+from compile_assets import minify
+from validate_all_cds import CDS_DIR
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+OUTPUT_PATH = Path('build/content_tools/duplicates.json')
+
+KEY_FIELDS = ['id', 'icd10', 'synonyms']
+FIELD_LABELS = {'id': 'condition ids', 'icd10': 'ICD-10 codes', 'synonyms': 'synonyms'}
+SHINGLE_WORDS = 5
+# Sections shorter than this are boilerplate ("See empiric therapy") more often than copies
+MIN_SECTION_WORDS = 30
+NUM_BINS = 64
+BANDS = 16
+ROWS = NUM_BINS // BANDS
+NEAR_THRESHOLD = 0.7
+
+WORD_PATTERN = re.compile(r'\w+')
+BIN_BITS = 6
+VALUE_MASK = (1 << (64 - BIN_BITS)) - 1
+
+
+class DuplicateCollector(Rule):
+    """Collects identifier occurrences and per-section text for the corpus-wide pass"""
+
+    id = 'duplicates'
+
+    def begin(self, doc):
+        doc.state['keys'] = []
+        doc.state['sections'] = []
+
+    def visit_condition(self, doc, condition, index):
+        for field in KEY_FIELDS:
+            values = condition.get(field)
+            if values is None:
+                continue
+            if not isinstance(values, list):
+                values = [values]
+            for i, value in enumerate(values):
+                if isinstance(value, str) and value.strip():
+                    path = f"conditions[{index - 1}].{field}" + (f"[{i}]" if field != 'id' else '')
+                    doc.state['keys'].append((field, value.strip().casefold(), value, path))
+
+    def visit_section(self, doc, condition, section_id, section):
+        if section_id == 'references' or not isinstance(section, dict):
+            return
+        content = section.get('content', {})
+        doc.state['sections'].append({
+            'path': f"conditions[{doc.condition_index - 1}].sections.{section_id}.content",
+            'condition': condition.get('name', 'Unknown'),
+            'text': ' '.join(iter_strings(content)),
+            'bytes': len(minify(content).encode('utf-8')),
+        })
+
+
+ENGINE = RuleEngine([DuplicateCollector()])
+
+
+def iter_strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_strings(item)
+
+
+def hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def shingles(words):
+    if len(words) <= SHINGLE_WORDS:
+        return {hash64(' '.join(words))}
+    return {hash64(' '.join(words[i:i + SHINGLE_WORDS])) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash(shingle_hashes):
+    """
+    One-permutation MinHash: the top bits of each shingle hash pick a bin,
+    the rest compete for that bin's minimum. Empty bins borrow the next
+    non-empty bin's value (rotation densification) so sketches of short
+    texts stay comparable.
+    """
+    bins = [None] * NUM_BINS
+    for h in shingle_hashes:
+        b, value = h >> (64 - BIN_BITS), h & VALUE_MASK
+        if bins[b] is None or value < bins[b]:
+            bins[b] = value
+    filled = [b for b in range(NUM_BINS) if bins[b] is not None]
+    if not filled:
+        return tuple(bins)
+    signature = list(bins)
+    for b in range(NUM_BINS):
+        if signature[b] is None:
+            # Distance to the next filled bin, wrapping around
+            offset = next((d for d in range(1, NUM_BINS) if bins[(b + d) % NUM_BINS] is not None))
+            signature[b] = bins[(b + offset) % NUM_BINS] + offset * (VALUE_MASK + 1)
+    return tuple(signature)
+
+
+def collect(files):
+    """Run the collector over every category; returns (key occurrences, sections)"""
+    keys = []
+    sections = []
+    for json_file in files:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        doc = ENGINE.run(data, json_file.name)
+        category = data.get('id', json_file.name.split('.')[0])
+        for field, normalized, value, path in doc.state['keys']:
+            keys.append({'field': field, 'normalized': normalized, 'value': value,
+                         'category': category, 'path': f"{json_file.name}:{path}"})
+        for section in doc.state['sections']:
+            section['category'] = category
+            section['path'] = f"{json_file.name}:{section['path']}"
+            sections.append(section)
+    return keys, sections
+
+
+def duplicate_keys(keys):
+    """field -> [(value, [occurrences])] for values found on more than one condition"""
+    groups = defaultdict(list)
+    for key in keys:
+        groups[(key['field'], key['normalized'])].append(key)
+
+    by_field = {field: [] for field in KEY_FIELDS}
+    for (field, _), occurrences in sorted(groups.items()):
+        if len(occurrences) > 1:
+            by_field[field].append((occurrences[0]['value'], occurrences))
+    return by_field
+
+
+def exact_section_groups(sections):
+    """Sections whose normalized text is identical"""
+    groups = defaultdict(list)
+    for section in sections:
+        if section['text'].strip():
+            groups[hashlib.sha256(section['normalized'].encode('utf-8')).hexdigest()].append(section)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def near_duplicate_pairs(sections, threshold):
+    """(similarity, a, b) for section pairs at or above the threshold, excluding exact copies"""
+    candidates = set()
+    buckets = defaultdict(list)
+    for i, section in enumerate(sections):
+        signature = section['signature']
+        for band in range(BANDS):
+            buckets[(band, signature[band * ROWS:(band + 1) * ROWS])].append(i)
+    for members in buckets.values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                candidates.add((members[x], members[y]))
+
+    pairs = []
+    for i, j in candidates:
+        a, b = sections[i], sections[j]
+        if a['normalized'] == b['normalized']:
+            continue
+        similarity = len(a['shingles'] & b['shingles']) / len(a['shingles'] | b['shingles'])
+        if similarity >= threshold:
+            pairs.append((similarity, a, b))
+    pairs.sort(key=lambda pair: (-pair[0], pair[1]['path'], pair[2]['path']))
+    return pairs, len(candidates)
+
+
+def clusters(pairs):
+    """Group near-duplicate pairs into connected clusters (union-find)"""
+    parent = {}
+
+    def find(path):
+        parent.setdefault(path, path)
+        while parent[path] != path:
+            parent[path] = parent[parent[path]]
+            path = parent[path]
+        return path
+
+    sections = {}
+    for _, a, b in pairs:
+        sections[a['path']] = a
+        sections[b['path']] = b
+        parent[find(a['path'])] = find(b['path'])
+
+    groups = defaultdict(list)
+    for path, section in sections.items():
+        groups[find(path)].append(section)
+    return [sorted(group, key=lambda s: s['path']) for group in groups.values()]
+
+
+def reclaimable(group):
+    """Bytes saved by keeping only the largest member of a group, scaled by overlap"""
+    keep = max(group, key=lambda s: s['bytes'])
+    total = 0
+    for section in group:
+        if section is keep:
+            continue
+        union = section['shingles'] | keep['shingles']
+        overlap = len(section['shingles'] & keep['shingles']) / len(union) if union else 1.0
+        total += int(section['bytes'] * overlap)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find duplicate and near-duplicate CDS content.')
+    parser.add_argument('--threshold', type=float, default=NEAR_THRESHOLD,
+                        help='minimum shingle Jaccard similarity for near duplicates (default: 0.7)')
+    parser.add_argument('--output', default=str(OUTPUT_PATH), help='JSON report path')
+    parser.add_argument('--strict', action='store_true', help='exit with status 1 when duplicate condition ids exist')
+    args = parser.parse_args()
+
+    files = sorted(CDS_DIR.glob('*.json'))
+    if not files:
+        print(f"❌ No JSON files found in {CDS_DIR}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("CDS DUPLICATE CONTENT REPORT")
+    print("=" * 80)
+
+    keys, sections = collect(files)
+    for section in sections:
+        words = WORD_PATTERN.findall(section['text'].casefold())
+        section['normalized'] = ' '.join(words)
+        section['shingles'] = shingles(words) if words else set()
+        section['signature'] = minhash(section['shingles'])
+    print(f"Scanned {len(files)} categories, {len(sections)} sections")
+
+    report = {'keys': {}, 'exact_sections': [], 'near_sections': []}
+
+    # 1. Identifiers
+    duplicated = duplicate_keys(keys)
+    for field in KEY_FIELDS:
+        groups = duplicated[field]
+        marker = "❌" if field == 'id' and groups else ("⚠️ " if groups else "✅")
+        print(f"\n{marker} Duplicate {FIELD_LABELS[field]}: {len(groups)}")
+        for value, occurrences in groups:
+            categories = {o['category'] for o in occurrences}
+            scope = "across categories" if len(categories) > 1 else "within a category"
+            print(f"   '{value}' ({len(occurrences)}x, {scope})")
+            for occurrence in occurrences:
+                print(f"      {occurrence['path']}")
+        report['keys'][field] = [
+            {'value': value, 'paths': [o['path'] for o in occurrences]} for value, occurrences in groups
+        ]
+
+    # 2. Exact section copies
+    exact = exact_section_groups(sections)
+    exact_bytes = sum(reclaimable(group) for group in exact)
+    print(f"\n{'⚠️ ' if exact else '✅'} Identical sections: {len(exact)} group(s), ~{exact_bytes / 1024:.1f} KB reclaimable")
+    for group in sorted(exact, key=lambda g: g[0]['path']):
+        print(f"   {len(group)}x, {group[0]['bytes']} bytes each")
+        for section in group:
+            print(f"      {section['path']}")
+        report['exact_sections'].append({'paths': [s['path'] for s in group], 'bytes': group[0]['bytes']})
+
+    # 3. Near duplicates
+    eligible = [s for s in sections if len(s['normalized'].split()) >= MIN_SECTION_WORDS]
+    pairs, candidate_count = near_duplicate_pairs(eligible, args.threshold)
+    near = clusters(pairs)
+    near_bytes = sum(reclaimable(group) for group in near)
+    print(f"\n{'⚠️ ' if near else '✅'} Near-duplicate sections (Jaccard >= {args.threshold}): "
+          f"{len(pairs)} pair(s) in {len(near)} cluster(s), ~{near_bytes / 1024:.1f} KB reclaimable")
+    print(f"   LSH compared {candidate_count} candidate pairs "
+          f"(vs {len(eligible) * (len(eligible) - 1) // 2} for all pairs)")
+    for similarity, a, b in pairs:
+        print(f"   {similarity:.2f}  {a['path']}")
+        print(f"         {b['path']}")
+        report['near_sections'].append({'similarity': round(similarity, 3), 'paths': [a['path'], b['path']],
+                                        'bytes': [a['bytes'], b['bytes']]})
+
+    report['reclaimable_bytes'] = exact_bytes + near_bytes
+    print("-" * 80)
+    print(f"Estimated reclaimable: {(exact_bytes + near_bytes) / 1024:.1f} KB "
+          f"of {sum(s['bytes'] for s in sections) / 1024:.1f} KB section content")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Report written to {output}")
+
+    if args.strict and duplicated['id']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+"""
+Current git revision, for tools that record it next to their results
+(benchmark and budget history), without importing those tools.
+"""
+
+import subprocess
+
+
+def git_revision():
+    """Short hash of HEAD, or None outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,143 @@
+"""
+Structured, streaming issue output for the content validators.
+
+Rules report findings through Document.issue() / Document.warn(); when the
+engine run is given a sink from an IssueStream, every finding is written
+out as a record the moment it is found:
+
+    {"file": "assets/data/cds/x.v1.json", "path": "conditions[0].sections.empiric.content.adult",
+     "line": 212, "column": 22, "rule": "abbreviations", "severity": "error", "message": "..."}
+
+(line/column are present when the tool loaded the file with positions.)
+
+JsonlWriter writes one JSON object per line and flushes it, so CI and
+editors can consume results while the run is still going. SarifWriter
+streams the same records into a SARIF 2.1.0 log; only the JSON skeleton is
+held back until close(), so memory stays flat however many issues a run
+finds.
+
+Usage in a tool:
+
+    stream = open_issue_stream(args.jsonl, args.sarif, 'validate_all_cds', ENGINE.rules)
+    doc = ENGINE.run(data, filepath.name, sink=stream.file(filepath))
+    ...
+    stream.close()
+
+A JSONL path of '-' writes the records to stdout.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+ERROR = 'error'
+WARNING = 'warning'
+
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+
+
+class JsonlWriter:
+    """One JSON record per line, flushed as it is written"""
+
+    def __init__(self, path):
+        if str(path) == '-':
+            self.stream = sys.stdout
+            self._owned = False
+        else:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self.stream = open(path, 'w', encoding='utf-8')
+            self._owned = True
+
+    def write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.stream.flush()
+
+    def close(self):
+        if self._owned:
+            self.stream.close()
+
+
+class SarifWriter:
+    """Streams records into a single-run SARIF 2.1.0 log file"""
+
+    def __init__(self, path, tool_name, rules=()):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._first = True
+        driver = {
+            'name': tool_name,
+            'rules': [{'id': rule.id, 'shortDescription': {'text': (rule.__doc__ or rule.id).strip().splitlines()[0]}}
+                      for rule in rules],
+        }
+        head = json.dumps({'$schema': SARIF_SCHEMA, 'version': '2.1.0',
+                           'runs': [{'tool': {'driver': driver}, 'results': []}]}, ensure_ascii=False)
+        # Everything up to the (still open) results array
+        self._tail = ']}]}'
+        self._file.write(head[:-len(self._tail)])
+
+    def write(self, record):
+        location = {'physicalLocation': {'artifactLocation': {'uri': record['file']}}}
+        if record.get('line'):
+            location['physicalLocation']['region'] = {'startLine': record['line'], 'startColumn': record['column']}
+        if record.get('path'):
+            location['logicalLocations'] = [{'fullyQualifiedName': record['path']}]
+        result = {
+            'ruleId': record['rule'],
+            'level': record['severity'],
+            'message': {'text': record['message']},
+            'locations': [location],
+        }
+        if not self._first:
+            self._file.write(',')
+        self._first = False
+        self._file.write(json.dumps(result, ensure_ascii=False))
+
+    def close(self):
+        self._file.write(self._tail)
+        self._file.close()
+
+
+class FileSink:
+    """The per-file handle a Document emits its findings to"""
+
+    def __init__(self, stream, filepath):
+        self.stream = stream
+        self.file = Path(filepath).as_posix()
+
+    def emit(self, rule_id, severity, message, path, location=None):
+        record = {'file': self.file, 'path': path}
+        if location is not None:
+            record['line'], record['column'] = location
+        record.update({'rule': rule_id, 'severity': severity, 'message': message.strip()})
+        self.stream.write(record)
+
+
+class IssueStream:
+    """Fans records out to the configured writers and counts them by severity"""
+
+    def __init__(self, writers):
+        self.writers = list(writers)
+        self.counts = {ERROR: 0, WARNING: 0}
+
+    def file(self, filepath):
+        return FileSink(self, filepath)
+
+    def write(self, record):
+        self.counts[record['severity']] = self.counts.get(record['severity'], 0) + 1
+        for writer in self.writers:
+            writer.write(record)
+
+    def close(self):
+        for writer in self.writers:
+            writer.close()
+
+
+def open_issue_stream(jsonl=None, sarif=None, tool_name='', rules=()):
+    """IssueStream for a tool's --jsonl / --sarif options, or None when neither is given"""
+    writers = []
+    if jsonl:
+        writers.append(JsonlWriter(jsonl))
+    if sarif:
+        writers.append(SarifWriter(sarif, tool_name, rules))
+    return IssueStream(writers) if writers else None
@@ -0,0 +1,168 @@
+"""
+Position-tracking JSON loading: JSON path -> byte offset and line:column.
+
+The document itself is decoded with the C json parser; the positions come
+from one regex tokenization pass over the raw bytes that records where
+every value starts, keyed by the same JSON paths the rules report
+('conditions[0].sections.empiric.content.adult[2]', '' for the root).
+The pass runs on the first lookup (files without findings never pay for
+it), and line numbers are only computed for offsets that are looked up,
+so the index stays on for every file on every run.
+
+    data, positions = load_json_with_positions(filepath)
+    positions.locate('conditions[3].sections.empiric')   # -> (412, 21)
+
+Paths that don't exist (a missing field, for instance) resolve to their
+nearest existing ancestor. locate_in_string() points inside a string
+value, counting the source's escapes ('\u00e9' is six columns).
+
+span_tree() runs the same tokenization but returns the start and end byte
+of every value as a tree, for tools that work on the raw text of a value
+(content_delta.py splices them).
+"""
+
+import bisect
+import json
+import re
+
+# Object keys (with their colon), strings, brackets, and literals/numbers;
+# commas and colons never need a Python-level step
+TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"(\s*:)?|[{}\[\]]|[^\s{}\[\]:,"]+')
+PARENT = re.compile(r'(?:\.[^.\[]*|\[\d+\])$')
+STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+# One source character or escape sequence inside a JSON string
+STRING_PART = re.compile(r'\\u[0-9a-fA-F]{4}|\\.|.', re.DOTALL)
+
+LBRACE, RBRACE, LBRACKET, RBRACKET, BACKSLASH = b'{}[]\\'
+
+
+def scan_offsets(raw):
+    """Byte offset of every value in a valid JSON document, keyed by JSON path"""
+    offsets = {}
+    # Open containers: [path, is_array, next index, current key]
+    stack = []
+    for match in TOKEN.finditer(raw):
+        first = raw[match.start()]
+        if first == RBRACE or first == RBRACKET:
+            stack.pop()
+            continue
+        if match.start(1) != -1:
+            token = raw[match.start():match.start(1)]
+            stack[-1][3] = json.loads(token) if BACKSLASH in token else token[1:-1].decode('utf-8')
+            continue
+
+        if not stack:
+            path = ''
+        else:
+            frame = stack[-1]
+            if frame[1]:
+                path = f"{frame[0]}[{frame[2]}]"
+                frame[2] += 1
+            else:
+                path = f"{frame[0]}.{frame[3]}" if frame[0] else frame[3]
+
+        offsets[path] = match.start()
+        if first == LBRACE:
+            stack.append([path, False, 0, None])
+        elif first == LBRACKET:
+            stack.append([path, True, 0, None])
+    return offsets
+
+
+class Span:
+    """Byte range [start, end) of one value; children is [(key or index, Span)] for containers, None for scalars"""
+
+    __slots__ = ('start', 'end', 'children')
+
+    def __init__(self, start, end=None, children=None):
+        self.start = start
+        self.end = end
+        self.children = children
+
+
+def span_tree(raw):
+    """Root Span of a valid JSON document, with every nested value's byte range"""
+    root = None
+    # Open containers, and the key waiting for its value in the innermost one
+    stack = []
+    key = None
+    for match in TOKEN.finditer(raw):
+        first = raw[match.start()]
+        if first == RBRACE or first == RBRACKET:
+            stack.pop().end = match.end()
+            continue
+        if match.start(1) != -1:
+            token = raw[match.start():match.start(1)]
+            key = json.loads(token) if BACKSLASH in token else token[1:-1].decode('utf-8')
+            continue
+
+        if first == LBRACE or first == LBRACKET:
+            span = Span(match.start(), children=[])
+        else:
+            span = Span(match.start(), match.end())
+        if not stack:
+            root = span
+        else:
+            parent = stack[-1].children
+            parent.append((len(parent) if raw[stack[-1].start] == LBRACKET else key, span))
+        if span.children is not None:
+            stack.append(span)
+    return root
+
+
+class PositionIndex:
+    """JSON path -> byte offset / 1-based (line, column) for one document"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self._offsets = None
+        self._line_starts = None
+
+    @property
+    def offsets(self):
+        if self._offsets is None:
+            self._offsets = scan_offsets(self.raw)
+        return self._offsets
+
+    def offset(self, path):
+        """Byte offset of a path, or of its nearest existing ancestor"""
+        offsets = self.offsets
+        while path not in offsets:
+            if not path:
+                return 0
+            parent = PARENT.sub('', path)
+            path = parent if parent != path else ''
+        return offsets[path]
+
+    def locate(self, path):
+        """(line, column) of a path; the column counts characters, not bytes"""
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in re.finditer(rb'\n', self.raw)]
+        offset = self.offset(path)
+        line = bisect.bisect_right(self._line_starts, offset)
+        start = self._line_starts[line - 1]
+        return line, len(self.raw[start:offset].decode('utf-8', errors='replace')) + 1
+
+    def locate_in_string(self, path, index):
+        """(line, column) of character `index` of the decoded string at path, following the source's escapes"""
+        line, column = self.locate(path)
+        match = STRING.match(self.raw, self.offset(path))
+        if match is None:
+            return line, column
+        # Count source characters up to the index-th decoded one; a surrogate pair decodes to one character
+        consumed = 0
+        for part in STRING_PART.finditer(match.group().decode('utf-8', errors='replace')[1:-1]):
+            if index <= 0:
+                break
+            consumed += len(part.group())
+            if not (part.group().startswith('\\u') and 0xD800 <= int(part.group()[2:], 16) <= 0xDBFF):
+                index -= 1
+        return line, column + 1 + consumed
+
+
+def load_json_with_positions(filepath):
+    """Return (data, PositionIndex) for a JSON file; raises json.JSONDecodeError like json.load"""
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    data = json.loads(raw)
+    return data, PositionIndex(raw)
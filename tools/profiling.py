@@ -0,0 +1,157 @@
+"""
+Opt-in profiling for the content validators.
+
+A Profiler records wall time and call counts per (file, rule or phase),
+plus the number of content strings each rule scanned. Rule hooks are timed
+by instrumenting a RuleEngine (see RuleEngine.instrument); tool phases such
+as parsing and printing are timed with `profiler.phase(name)`. Phase rows
+exclude the rule time nested inside them, so the rows add up to the wall
+time.
+
+When profiling is off the tools use NULL_PROFILER, whose phase() returns a
+shared no-op context manager and which leaves the engine's dispatch lists
+untouched, so the cost is one attribute lookup per phase.
+"""
+
+import json
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+OUTPUT_DIR = Path('build/content_tools')
+
+_NULL_CONTEXT = nullcontext()
+
+
+class NullProfiler:
+    """Profiler stand-in used when --profile is off"""
+
+    enabled = False
+
+    def set_file(self, filename):
+        pass
+
+    def phase(self, name):
+        return _NULL_CONTEXT
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'start', 'rule_start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.rule_start = self.profiler.rule_seconds
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        # Rule hooks timed inside this phase are reported on their own rows
+        nested = self.profiler.rule_seconds - self.rule_start
+        self.profiler.record(self.name, time.perf_counter() - self.start - nested)
+
+
+class Profiler:
+    """Collects wall time, call counts and strings scanned per rule/phase and per file"""
+
+    enabled = True
+
+    def __init__(self):
+        self.file = None
+        # (file, name) -> [seconds, calls, strings]
+        self.stats = {}
+        self.rule_seconds = 0.0
+        self.started = time.perf_counter()
+
+    def set_file(self, filename):
+        self.file = filename
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def record(self, name, seconds, strings=0):
+        entry = self.stats.get((self.file, name))
+        if entry is None:
+            entry = self.stats[(self.file, name)] = [0.0, 0, 0]
+        entry[0] += seconds
+        entry[1] += 1
+        entry[2] += strings
+
+    def wrap(self, rule_id, hook_name, hook):
+        """Return a timed version of one rule hook"""
+        name = f"rule:{rule_id}"
+        counts_strings = hook_name == 'visit_string'
+        perf_counter = time.perf_counter
+
+        def timed(*args):
+            start = perf_counter()
+            hook(*args)
+            seconds = perf_counter() - start
+            self.rule_seconds += seconds
+            self.record(name, seconds, 1 if counts_strings else 0)
+
+        return timed
+
+    # --- Reporting ---
+
+    def _totals(self, key_index):
+        totals = {}
+        for key, (seconds, calls, strings) in self.stats.items():
+            entry = totals.setdefault(key[key_index], [0.0, 0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+            entry[2] += strings
+        return totals
+
+    def report(self):
+        """JSON-serializable timing report"""
+        def rows(items, label):
+            return [
+                {label: key, 'seconds': round(seconds, 6), 'calls': calls, 'strings': strings}
+                for key, (seconds, calls, strings) in sorted(items, key=lambda kv: kv[1][0], reverse=True)
+            ]
+
+        return {
+            'wall_seconds': round(time.perf_counter() - self.started, 6),
+            'by_name': rows(self._totals(1).items(), 'name'),
+            'by_file': rows(self._totals(0).items(), 'file'),
+            'entries': [
+                {'file': file, 'name': name, 'seconds': round(seconds, 6), 'calls': calls, 'strings': strings}
+                for (file, name), (seconds, calls, strings)
+                in sorted(self.stats.items(), key=lambda kv: kv[1][0], reverse=True)
+            ],
+        }
+
+    def print_report(self, top=15):
+        report = self.report()
+        wall = report['wall_seconds'] or 1e-9
+
+        print()
+        print("=" * 80)
+        print(f"PROFILE (wall time {wall * 1000:.1f} ms)")
+        print("=" * 80)
+        print(f"{'rule / phase':<28}{'ms':>10}{'%':>7}{'calls':>10}{'strings':>10}")
+        print("-" * 65)
+        for row in report['by_name'][:top]:
+            print(f"{row['name']:<28}{row['seconds'] * 1000:>10.1f}{row['seconds'] / wall * 100:>6.1f}%"
+                  f"{row['calls']:>10}{row['strings']:>10}")
+        print()
+        print(f"{'file':<40}{'ms':>10}{'%':>7}")
+        print("-" * 57)
+        for row in report['by_file'][:top]:
+            print(f"{str(row['file']):<40}{row['seconds'] * 1000:>10.1f}{row['seconds'] / wall * 100:>6.1f}%")
+        print()
+        print(f"Top {top} (file, rule / phase):")
+        for row in report['entries'][:top]:
+            print(f"   {row['seconds'] * 1000:>8.1f} ms  {row['file']}  {row['name']}  "
+                  f"({row['calls']} calls, {row['strings']} strings)")
+
+    def write_report(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2), encoding='utf-8')
+        return path
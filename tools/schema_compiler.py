@@ -0,0 +1,205 @@
+"""
+Compile declarative JSON shape schemas into validator functions.
+
+A schema is plain Python data:
+
+    {'id': 'string', 'stage': 'integer', 'note?': 'string|null',
+     'options': ['string'], 'level': {'excellent', 'good', 'poor'}}
+
+- a dict is an object; a key ending in '?' is optional. Keys the schema
+  doesn't mention are allowed (the Dart models ignore them too)
+- a one-element list is an array of that item schema
+- a set is a string enum
+- a string names the allowed scalar types, '|'-separated: 'string',
+  'integer', 'number' (integer or float), 'boolean', 'null', 'datetime'
+  (an ISO-8601 string DateTime.parse accepts) or 'any'
+- MapOf(schema) is an object with arbitrary keys and uniform values;
+  OneOf(a, b, ...) accepts a value matching any alternative
+
+compile_schema() walks the schema once and returns a closure per node, so
+validating a document is one pass of direct type checks with no schema
+interpretation left in it. A check appends (json_path, message) tuples:
+
+    check = compile_schema(QUIZ_SCHEMA)
+    errors = []
+    check(data, '', errors)
+
+Paths use the same format as the CDS rules ('questions[3].options[0]').
+Booleans never satisfy 'integer' or 'number', unlike isinstance().
+"""
+
+import re
+
+SCALAR_TYPES = {
+    'string': (str,),
+    'integer': (int,),
+    'number': (int, float),
+    'boolean': (bool,),
+    'null': (type(None),),
+    'datetime': (str,),
+}
+TYPE_NAMES = {str: 'string', int: 'integer', float: 'number', bool: 'boolean',
+              type(None): 'null', dict: 'object', list: 'array'}
+# The subset of ISO-8601 that Dart's DateTime.parse accepts
+DATETIME = re.compile(r'^[+-]?\d{4,6}-?\d\d-?\d\d(?:[T ]\d\d(?::?\d\d(?::?\d\d(?:[.,]\d+)?)?)?(?:Z|[+-]\d\d(?::?\d\d)?)?)?$')
+
+
+class MapOf:
+    """An object whose keys are data (drug classes, score bands) and whose values share one schema"""
+
+    def __init__(self, values):
+        self.values = values
+
+
+class OneOf:
+    """A value matching any one of several schemas"""
+
+    def __init__(self, *alternatives):
+        self.alternatives = alternatives
+
+
+def type_name(value):
+    return TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def child_path(path, key):
+    return f"{path}.{key}" if path else key
+
+
+def compile_schema(schema):
+    """Validator function check(value, path, errors) for a schema, or None if it accepts anything"""
+    if isinstance(schema, str):
+        return _compile_scalar(schema)
+    if isinstance(schema, (set, frozenset)):
+        return _compile_enum(schema)
+    if isinstance(schema, dict):
+        return _compile_object(schema)
+    if isinstance(schema, list):
+        if len(schema) != 1:
+            raise ValueError(f"array schema needs exactly one item schema: {schema!r}")
+        return _compile_array(schema[0])
+    if isinstance(schema, MapOf):
+        return _compile_map(schema.values)
+    if isinstance(schema, OneOf):
+        return _compile_one_of(schema.alternatives)
+    raise ValueError(f"unsupported schema node: {schema!r}")
+
+
+def _compile_scalar(spec):
+    names = spec.split('|')
+    if 'any' in names:
+        return None
+    unknown = [name for name in names if name not in SCALAR_TYPES]
+    if unknown:
+        raise ValueError(f"unknown type(s) {', '.join(unknown)} in '{spec}'")
+    allowed = frozenset(t for name in names for t in SCALAR_TYPES[name])
+    expected = ' or '.join(names)
+
+    if 'datetime' in names:
+        def check(value, path, errors):
+            if type(value) not in allowed:
+                errors.append((path, f"expected {expected}, got {type_name(value)}"))
+            elif type(value) is str and not DATETIME.match(value):
+                errors.append((path, f"'{value}' is not an ISO-8601 date/time"))
+        return check
+
+    def check(value, path, errors):
+        if type(value) not in allowed:
+            errors.append((path, f"expected {expected}, got {type_name(value)}"))
+    return check
+
+
+def _compile_enum(values):
+    allowed = frozenset(values)
+    listing = ', '.join(sorted(allowed))
+
+    def check(value, path, errors):
+        if type(value) is not str:
+            errors.append((path, f"expected one of {listing}, got {type_name(value)}"))
+        elif value not in allowed:
+            errors.append((path, f"'{value}' is not one of {listing}"))
+    return check
+
+
+def _compile_object(schema):
+    fields = []
+    for key, value_schema in schema.items():
+        optional = key.endswith('?')
+        name = key[:-1] if optional else key
+        fields.append((name, optional, compile_schema(value_schema)))
+    fields = tuple(fields)
+
+    def check(value, path, errors):
+        if type(value) is not dict:
+            errors.append((path, f"expected object, got {type_name(value)}"))
+            return
+        for name, optional, field_check in fields:
+            if name in value:
+                if field_check is not None:
+                    field_check(value[name], f"{path}.{name}" if path else name, errors)
+            elif not optional:
+                errors.append((path, f"missing required field '{name}'"))
+    return check
+
+
+def _compile_array(item_schema):
+    item_check = compile_schema(item_schema)
+
+    if item_check is None:
+        def check(value, path, errors):
+            if type(value) is not list:
+                errors.append((path, f"expected array, got {type_name(value)}"))
+        return check
+
+    if isinstance(item_schema, str) and 'datetime' not in item_schema:
+        # Arrays of scalars (synonyms, keyPoints...) are the most common node; check them inline
+        allowed = frozenset(t for name in item_schema.split('|') for t in SCALAR_TYPES[name])
+
+        def check(value, path, errors):
+            if type(value) is not list:
+                errors.append((path, f"expected array, got {type_name(value)}"))
+                return
+            for i, item in enumerate(value):
+                if type(item) not in allowed:
+                    item_check(item, f"{path}[{i}]", errors)
+        return check
+
+    def check(value, path, errors):
+        if type(value) is not list:
+            errors.append((path, f"expected array, got {type_name(value)}"))
+            return
+        for i, item in enumerate(value):
+            item_check(item, f"{path}[{i}]", errors)
+    return check
+
+
+def _compile_map(value_schema):
+    value_check = compile_schema(value_schema)
+
+    def check(value, path, errors):
+        if type(value) is not dict:
+            errors.append((path, f"expected object, got {type_name(value)}"))
+            return
+        if value_check is not None:
+            for key, item in value.items():
+                value_check(item, f"{path}.{key}" if path else key, errors)
+    return check
+
+
+def _compile_one_of(alternatives):
+    checks = [compile_schema(alternative) for alternative in alternatives]
+    if any(c is None for c in checks):
+        return None
+
+    def check(value, path, errors):
+        best = None
+        for alternative in checks:
+            found = []
+            alternative(value, path, found)
+            if not found:
+                return
+            if best is None or len(found) < len(best):
+                best = found
+        # Report against the closest alternative rather than all of them
+        errors.extend(best)
+    return check
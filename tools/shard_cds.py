@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Split each CDS category into a summary manifest plus one shard per condition.
+
+Category list screens only need each condition's id, name, severity and
+shortDescription; the manifest carries exactly that (plus the category's
+own fields), and every condition's full content lives in its own shard:
+
+    build/assets_data/cds_shards/<category id>/manifest.v1.json
+    build/assets_data/cds_shards/<category id>/conditions/<condition id>.v1.json
+
+Manifest condition entries record the shard path, byte size and SHA-256,
+so a loader can verify or cache shards. After writing, every category is
+reassembled from its manifest and shards and compared with the source
+document, key order included.
+
+Usage: python tools/shard_cds.py [--out DIR]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import sys
+from pathlib import Path
+
+from compile_assets import minify
+from validate_all_cds import CDS_DIR
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+OUTPUT_DIR = Path('build/assets_data/cds_shards')
+MANIFEST_VERSION = 1
+SUMMARY_FIELDS = ['id', 'name', 'severity', 'shortDescription']
+SAFE_NAME = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]*$')
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def shard_category(source, out_dir, written):
+    """Write the manifest and shards for one category; returns (category id, manifest, shard sizes)"""
+    raw = source.read_bytes()
+    data = json.loads(raw)
+    category_id = data.get('id', source.name.split('.')[0])
+    if not SAFE_NAME.match(str(category_id)):
+        raise ValueError(f"category id '{category_id}' is not a safe directory name")
+    # Two sources with one id would otherwise overwrite each other's shards
+    if category_id in written:
+        raise ValueError(f"category id '{category_id}' is also used by {written[category_id]}")
+    written[category_id] = source.name
+
+    category_dir = out_dir / category_id
+    if category_dir.exists():
+        shutil.rmtree(category_dir)
+    (category_dir / 'conditions').mkdir(parents=True)
+
+    summaries = []
+    shard_sizes = []
+    seen = set()
+    for condition in data.get('conditions', []):
+        condition_id = condition.get('id')
+        if not isinstance(condition_id, str) or not SAFE_NAME.match(condition_id):
+            raise ValueError(f"condition id {condition_id!r} is not a safe file name")
+        if condition_id in seen:
+            raise ValueError(f"duplicate condition id '{condition_id}'")
+        seen.add(condition_id)
+
+        encoded = minify(condition).encode('utf-8')
+        shard_path = f"conditions/{condition_id}.v1.json"
+        (category_dir / shard_path).write_bytes(encoded)
+        shard_sizes.append(len(encoded))
+
+        summary = {field: condition[field] for field in SUMMARY_FIELDS if field in condition}
+        summary['shard'] = shard_path
+        summary['bytes'] = len(encoded)
+        summary['sha256'] = sha256(encoded)
+        summaries.append(summary)
+
+    # Same top-level key order as the source, with the summaries in place of the conditions
+    manifest = {key: (summaries if key == 'conditions' else value) for key, value in data.items()}
+    manifest['manifestVersion'] = MANIFEST_VERSION
+    manifest['source'] = {'file': source.name, 'bytes': len(raw), 'sha256': sha256(raw)}
+    (category_dir / 'manifest.v1.json').write_bytes(minify(manifest).encode('utf-8'))
+    return category_id, manifest, shard_sizes
+
+
+def reassemble(category_dir):
+    """Rebuild the full category document from its manifest and shards"""
+    manifest = json.loads((category_dir / 'manifest.v1.json').read_bytes())
+    conditions = []
+    for summary in manifest.get('conditions', []):
+        encoded = (category_dir / summary['shard']).read_bytes()
+        if sha256(encoded) != summary['sha256'] or len(encoded) != summary['bytes']:
+            raise ValueError(f"shard {summary['shard']} does not match its manifest hash/size")
+        conditions.append(json.loads(encoded))
+
+    document = {}
+    for key, value in manifest.items():
+        if key in ('manifestVersion', 'source'):
+            continue
+        document[key] = conditions if key == 'conditions' else value
+    return document
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shard CDS categories into manifests and per-condition files.')
+    parser.add_argument('--out', default=str(OUTPUT_DIR), help='output directory (default: build/assets_data/cds_shards)')
+    args = parser.parse_args()
+
+    files = sorted(CDS_DIR.glob('*.json'))
+    if not files:
+        print(f"❌ No JSON files found in {CDS_DIR}")
+        sys.exit(1)
+
+    out_dir = Path(args.out)
+    print("=" * 80)
+    print("CDS CATEGORY SHARDING")
+    print("=" * 80)
+    print(f"{'category':<36}{'source':>10}{'manifest':>10}{'shards':>8}{'largest':>10}")
+    print("-" * 74)
+
+    failures = []
+    written = {}
+    for source in files:
+        try:
+            category_id, manifest, shard_sizes = shard_category(source, out_dir, written)
+            category_dir = out_dir / category_id
+            original = json.loads(source.read_bytes())
+            # json.dumps is order-sensitive, so this also checks key order
+            if json.dumps(reassemble(category_dir)) != json.dumps(original):
+                failures.append(f"{source.name}: shards do not reassemble to the source document")
+        except (ValueError, OSError, KeyError) as e:
+            failures.append(f"{source.name}: {e}")
+            continue
+
+        manifest_bytes = (category_dir / 'manifest.v1.json').stat().st_size
+        largest = max(shard_sizes, default=0)
+        print(f"{category_id:<36}{source.stat().st_size / 1024:>8.1f}KB{manifest_bytes / 1024:>8.1f}KB"
+              f"{len(shard_sizes):>8}{largest / 1024:>8.1f}KB")
+
+    print("-" * 74)
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print(f"✅ All {len(files)} categories reassemble from their shards. Output: {out_dir}")
+
+
+if __name__ == '__main__':
+    main()
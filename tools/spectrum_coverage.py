@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Compile antibiotic spectrum coverage into packed bitsets and query them.
+
+stewardship/antibiotic_spectrum_data.json lists, per antibiotic, a
+coverage array of {organismId, level}. The compiler turns it into
+"at least this level" bitsets in both directions (organism i is bit i of an
+antibiotic's set, antibiotic j is bit j of an organism's set), written as
+hex strings so the width is not tied to 64 bits:
+
+    {
+      "version": 1,
+      "source": {"file": "...", "sha256": "...", "updatedAt": "..."},
+      "levels": ["none", "poor", "variable", "good", "excellent"],
+      "organisms": ["mssa", "mrsa", ...],
+      "antibiotics": ["penicillin-g", ...],
+      "breadth": ["narrow", ...],                      # per antibiotic
+      "byAntibiotic": {"good": ["1f3d", ...], ...},    # organisms covered at >= level
+      "byOrganism": {"good": ["40a1c3", ...], ...}     # antibiotics covering at >= level
+    }
+
+"Agents with at least good coverage of MSSA + E. coli + Pseudomonas" is
+then the AND of three byOrganism['good'] sets; the narrowest of them are
+the ones whose byAntibiotic['good'] set has the fewest bits.
+
+Compilation fails on coverage entries for unknown organisms, unknown
+levels and repeated organisms; organisms an antibiotic doesn't list are
+treated as 'none' and reported. The output is a build artifact
+(build/assets_data/antibiotic_spectrum_coverage.v1.json), like the quiz and
+CDS shards; the app does not read it yet.
+
+Usage: python tools/spectrum_coverage.py [--output PATH] [--check]
+       python tools/spectrum_coverage.py --query mssa,e-coli,pseudomonas[@good] [--query ...] [--queries FILE]
+       python tools/spectrum_coverage.py --bench [--repeat N]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from itertools import combinations
+from pathlib import Path
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+SPECTRUM_PATH = Path('assets/data/stewardship/antibiotic_spectrum_data.json')
+OUTPUT_PATH = Path('build/assets_data/antibiotic_spectrum_coverage.v1.json')
+COVERAGE_VERSION = 1
+
+# Ascending, as ranked by CoverageLevel in antibiotic_spectrum.dart
+LEVELS = ['none', 'poor', 'variable', 'good', 'excellent']
+LEVEL_RANK = {level: rank for rank, level in enumerate(LEVELS)}
+BREADTH_RANK = {'narrow': 0, 'extended': 1, 'broad': 2}
+DEFAULT_LEVEL = 'good'
+
+
+def compile_coverage(data, source_raw):
+    """(coverage document, errors, warnings)"""
+    errors, warnings = [], []
+    organisms = [organism['id'] for organism in data['organisms']]
+    organism_bits = {organism: i for i, organism in enumerate(organisms)}
+    antibiotics = [antibiotic['id'] for antibiotic in data['antibiotics']]
+
+    # Cumulative masks: at_least[rank][j] holds organisms antibiotic j covers at >= LEVELS[rank]
+    by_antibiotic = {level: [0] * len(antibiotics) for level in LEVELS[1:]}
+    by_organism = {level: [0] * len(organisms) for level in LEVELS[1:]}
+    for j, antibiotic in enumerate(data['antibiotics']):
+        seen = set()
+        for k, coverage in enumerate(antibiotic['coverage']):
+            path = f"antibiotics[{j}].coverage[{k}]"
+            organism, level = coverage.get('organismId'), coverage.get('level')
+            if organism not in organism_bits:
+                errors.append(f"{path}.organismId: '{antibiotic['id']}' covers unknown organism '{organism}'")
+                continue
+            if level not in LEVEL_RANK:
+                errors.append(f"{path}.level: unknown level '{level}' (expected one of {', '.join(LEVELS)})")
+                continue
+            if organism in seen:
+                errors.append(f"{path}.organismId: '{antibiotic['id']}' lists '{organism}' more than once")
+                continue
+            seen.add(organism)
+            i = organism_bits[organism]
+            for covered in LEVELS[1:LEVEL_RANK[level] + 1]:
+                by_antibiotic[covered][j] |= 1 << i
+                by_organism[covered][i] |= 1 << j
+        missing = [organism for organism in organisms if organism not in seen]
+        if missing:
+            warnings.append(f"{antibiotic['id']}: no coverage listed for {', '.join(missing)} (treated as none)")
+        if antibiotic.get('spectrumBreadth') not in BREADTH_RANK:
+            errors.append(f"antibiotics[{j}].spectrumBreadth: unknown breadth '{antibiotic.get('spectrumBreadth')}'")
+
+    document = {
+        'version': COVERAGE_VERSION,
+        'source': {'file': SPECTRUM_PATH.name, 'sha256': hashlib.sha256(source_raw).hexdigest(),
+                   'updatedAt': data.get('updatedAt')},
+        'levels': LEVELS,
+        'organisms': organisms,
+        'antibiotics': antibiotics,
+        'breadth': [antibiotic.get('spectrumBreadth') for antibiotic in data['antibiotics']],
+        'byAntibiotic': {level: [format(mask, 'x') for mask in masks] for level, masks in by_antibiotic.items()},
+        'byOrganism': {level: [format(mask, 'x') for mask in masks] for level, masks in by_organism.items()},
+    }
+    return document, errors, warnings
+
+
+class CoverageIndex:
+    """Bitwise queries over a compiled coverage document"""
+
+    def __init__(self, document):
+        self.organisms = document['organisms']
+        self.antibiotics = document['antibiotics']
+        self.organism_bits = {organism: i for i, organism in enumerate(self.organisms)}
+        self.by_antibiotic = {level: [int(mask, 16) for mask in masks]
+                              for level, masks in document['byAntibiotic'].items()}
+        self.by_organism = {level: [int(mask, 16) for mask in masks]
+                            for level, masks in document['byOrganism'].items()}
+        self.breadth = [BREADTH_RANK.get(breadth, len(BREADTH_RANK)) for breadth in document['breadth']]
+
+    def covering(self, organisms, level=DEFAULT_LEVEL):
+        """Bitset of antibiotics covering every organism id at >= level"""
+        if level == 'none':
+            return (1 << len(self.antibiotics)) - 1
+        masks = self.by_organism[level]
+        result = (1 << len(self.antibiotics)) - 1
+        for organism in organisms:
+            result &= masks[self.organism_bits[organism]]
+        return result
+
+    def narrowest(self, organisms, level=DEFAULT_LEVEL):
+        """Antibiotic ids covering every organism at >= level, narrowest first"""
+        result = self.covering(organisms, level)
+        spans = self.by_antibiotic.get(level)
+        found = []
+        while result:
+            low = result & -result
+            j = low.bit_length() - 1
+            found.append(j)
+            result ^= low
+        found.sort(key=lambda j: (bin(spans[j]).count('1') if spans else 0, self.breadth[j], self.antibiotics[j]))
+        return [self.antibiotics[j] for j in found]
+
+
+def naive_covering(data, organisms, level=DEFAULT_LEVEL):
+    """Reference implementation: scan every coverage list, as the app does"""
+    minimum = LEVEL_RANK[level]
+    found = []
+    for antibiotic in data['antibiotics']:
+        for organism in organisms:
+            entry = next((c for c in antibiotic['coverage'] if c['organismId'] == organism), None)
+            if LEVEL_RANK[entry['level'] if entry else 'none'] < minimum:
+                break
+        else:
+            found.append(antibiotic['id'])
+    return found
+
+
+def parse_query(text):
+    """'mssa,e-coli@excellent' -> (['mssa', 'e-coli'], 'excellent')"""
+    organisms, _, level = text.strip().partition('@')
+    return [organism.strip() for organism in organisms.split(',') if organism.strip()], level.strip() or DEFAULT_LEVEL
+
+
+def benchmark(data, index, repeat):
+    """Every organism pair and triple at every level, bitsets vs the naive scan"""
+    queries = [(list(group), level) for size in (1, 2, 3)
+               for group in combinations(index.organisms, size) for level in LEVELS[1:]]
+    naive_results = [naive_covering(data, organisms, level) for organisms, level in queries]
+    bitset_results = [sorted(index.antibiotics[j] for j in range(len(index.antibiotics))
+                             if index.covering(organisms, level) >> j & 1) for organisms, level in queries]
+    mismatches = sum(1 for a, b in zip(naive_results, bitset_results) if sorted(a) != b)
+
+    def best_of(run):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    naive_s = best_of(lambda: [naive_covering(data, organisms, level) for organisms, level in queries])
+    bitset_s = best_of(lambda: [index.covering(organisms, level) for organisms, level in queries])
+    return len(queries), naive_s, bitset_s, mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile and query antibiotic spectrum coverage bitsets.')
+    parser.add_argument('--output', default=str(OUTPUT_PATH),
+                        help='output path (default: build/assets_data/antibiotic_spectrum_coverage.v1.json)')
+    parser.add_argument('--check', action='store_true', help='only compile and validate the coverage; write nothing')
+    parser.add_argument('--query', action='append', default=[], metavar='ORGANISMS[@LEVEL]',
+                        help=f"comma-separated organism ids, optionally @level (default {DEFAULT_LEVEL})")
+    parser.add_argument('--queries', metavar='FILE', help='file with one query per line')
+    parser.add_argument('--bench', action='store_true', help='time bitset queries against a naive scan')
+    parser.add_argument('--repeat', type=int, default=5, help='benchmark runs (best is kept)')
+    args = parser.parse_args()
+
+    try:
+        source_raw = SPECTRUM_PATH.read_bytes()
+        data = json.loads(source_raw)
+    except (OSError, ValueError) as e:
+        print(f"❌ Cannot read {SPECTRUM_PATH}: {e}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("ANTIBIOTIC SPECTRUM COVERAGE")
+    print("=" * 80)
+
+    document, errors, warnings = compile_coverage(data, source_raw)
+    print(f"{len(document['organisms'])} organisms x {len(document['antibiotics'])} antibiotics, "
+          f"{len(LEVELS) - 1} level bitsets each way")
+    for warning in warnings:
+        print(f"⚠️  {warning}")
+    if errors:
+        print(f"\n❌ {len(errors)} coverage error(s):")
+        for error in errors:
+            print(f"   {error}")
+        sys.exit(1)
+
+    index = CoverageIndex(document)
+    queries = list(args.query)
+    if args.queries:
+        with open(args.queries, 'r', encoding='utf-8') as f:
+            queries.extend(line for line in f if line.strip() and not line.lstrip().startswith('#'))
+
+    failed = False
+    for text in queries:
+        organisms, level = parse_query(text)
+        unknown = [organism for organism in organisms if organism not in index.organism_bits]
+        if unknown or level not in LEVEL_RANK:
+            problem = f"unknown organism(s) {', '.join(unknown)}" if unknown else f"unknown level '{level}'"
+            print(f"\n❌ {text.strip()}: {problem}")
+            failed = True
+            continue
+        found = index.narrowest(organisms, level)
+        print(f"\n{' + '.join(organisms)} at >= {level}: {len(found)} agent(s)")
+        for antibiotic in found:
+            print(f"   {antibiotic}")
+
+    if args.bench:
+        count, naive_s, bitset_s, mismatches = benchmark(data, index, args.repeat)
+        print(f"\nBenchmark: {count} queries, best of {args.repeat}")
+        print(f"   naive scan: {naive_s * 1000:8.2f} ms")
+        print(f"   bitsets:    {bitset_s * 1000:8.2f} ms ({naive_s / bitset_s:.0f}x)")
+        if mismatches:
+            print(f"❌ {mismatches} query result(s) differ between the two engines")
+            failed = True
+        else:
+            print("✅ Both engines agree on every query")
+
+    output = Path(args.output)
+    encoded = json.dumps(document, ensure_ascii=False, separators=(',', ':')) + '\n'
+    if not args.check and not queries and not args.bench:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(encoded, encoding='utf-8')
+        print(f"\nCoverage written to {output} ({len(encoded.encode('utf-8')) / 1024:.1f} KB)")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Synthetic CDS corpus generator for scaling benchmarks.
+
+Builds larger corpora from the real category files, keeping the
+condition/section schema intact. A scale factor k is split into
+more conditions per category (up to 10x, to exercise per-file cost) and
+more category files (the rest, to exercise corpus size):
+
+    10x   -> every category has 10x the conditions
+    100x  -> 10x conditions, 10 variants of every category
+    1000x -> 10x conditions, 100 variants of every category
+
+Scales above 10 must be multiples of 10, so that the split is exact.
+
+Cloned conditions get unique ids and names; their section content is
+shared with the template, so generation stays cheap at any scale.
+
+Usage: python tools/synthetic_corpus.py --scale 100 [--out DIR]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from validate_all_cds import CDS_DIR
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+
+MAX_CONDITIONS_FACTOR = 10
+OUTPUT_DIR = Path('build/content_tools/synthetic')
+
+
+def load_templates(cds_dir=CDS_DIR):
+    """Real category documents, in sorted file order"""
+    templates = []
+    for json_file in sorted(Path(cds_dir).glob('*.json')):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            templates.append((json_file.name, json.load(f)))
+    return templates
+
+
+def scale_error(scale):
+    """Why a scale factor can't be built exactly, or None"""
+    if scale < 1:
+        return f"scale {scale} must be at least 1"
+    if scale > MAX_CONDITIONS_FACTOR and scale % MAX_CONDITIONS_FACTOR:
+        lower = scale - scale % MAX_CONDITIONS_FACTOR
+        return (f"scale {scale} is not a multiple of {MAX_CONDITIONS_FACTOR} "
+                f"(try {lower} or {lower + MAX_CONDITIONS_FACTOR})")
+    return None
+
+
+def split_scale(scale):
+    """Return (files_factor, conditions_factor) for a scale factor; raises ValueError for inexact scales"""
+    error = scale_error(scale)
+    if error:
+        raise ValueError(error)
+    conditions_factor = min(scale, MAX_CONDITIONS_FACTOR)
+    return scale // conditions_factor, conditions_factor
+
+
+def scale_document(data, variant, conditions_factor):
+    """One synthetic variant of a category with conditions_factor x the conditions"""
+    conditions = []
+    for copy in range(conditions_factor):
+        for condition in data.get('conditions', []):
+            if variant == 0 and copy == 0:
+                conditions.append(condition)
+                continue
+            suffix = f"v{variant}c{copy}"
+            conditions.append(dict(
+                condition,
+                id=f"{condition.get('id', 'condition')}-{suffix}",
+                name=f"{condition.get('name', 'Condition')} ({suffix})",
+            ))
+
+    document = dict(data, conditions=conditions)
+    if variant:
+        document['id'] = f"{data.get('id', 'category')}-v{variant}"
+        document['name'] = f"{data.get('name', 'Category')} (v{variant})"
+    return document
+
+
+def iter_synthetic_documents(templates, scale):
+    """Yield (filename, document) for a corpus of the given scale, one file at a time"""
+    files_factor, conditions_factor = split_scale(scale)
+    for variant in range(files_factor):
+        for filename, data in templates:
+            if variant:
+                stem = filename.split('.')[0]
+                filename = f"{stem}-v{variant}.v1.json"
+            yield filename, scale_document(data, variant, conditions_factor)
+
+
+def write_corpus(templates, scale, out_dir):
+    """
+    Write a synthetic corpus under out_dir/assets/data/cds so the validators
+    can be run against it from out_dir. Returns (files, bytes).
+    """
+    cds_dir = Path(out_dir) / 'assets' / 'data' / 'cds'
+    cds_dir.mkdir(parents=True, exist_ok=True)
+    files = 0
+    total_bytes = 0
+    for filename, document in iter_synthetic_documents(templates, scale):
+        text = json.dumps(document, ensure_ascii=False, indent=2)
+        (cds_dir / filename).write_text(text, encoding='utf-8')
+        files += 1
+        total_bytes += len(text.encode('utf-8'))
+    return files, total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic CDS corpus.')
+    parser.add_argument('--scale', type=int, required=True, help='size relative to the real corpus (e.g. 10, 100)')
+    parser.add_argument('--out', help='output root (default: build/content_tools/synthetic/x<scale>)')
+    args = parser.parse_args()
+
+    if scale_error(args.scale):
+        parser.error(scale_error(args.scale))
+
+    out_dir = Path(args.out) if args.out else OUTPUT_DIR / f'x{args.scale}'
+    templates = load_templates()
+    if not templates:
+        print(f"❌ No JSON files found in {CDS_DIR}")
+        sys.exit(1)
+
+    files_factor, conditions_factor = split_scale(args.scale)
+    files, total_bytes = write_corpus(templates, args.scale, out_dir)
+    print(f"✅ {args.scale}x corpus: {files} files ({files_factor}x files, {conditions_factor}x conditions), "
+          f"{total_bytes / 1024 / 1024:.1f} MB")
+    print(f"   Run the validators from {out_dir}, e.g.:")
+    print(f"   cd {out_dir} && python {Path(__file__).resolve().parent / 'validate_all_cds.py'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,17 +5,43 @@ Validates:
 1. JSON Schema (required fields)
 2. Condition structure (sections, references)
 3. Medical abbreviations (capitalization)
-4. Dosing formats (regex)
+4. Dosing formats (regex, reported by tools/dosing_index.py)
 5. Text length (UI/UX)
+
+Usage: python tools/validate_all_cds.py [--jobs N] [--no-cache] [--profile] [--watch]
+                                        [--jsonl PATH|-] [--sarif PATH]
+
+With --watch, the CDS, stewardship and outbreak_groups directories are
+polled after the first pass and every saved file is re-validated (the
+stewardship and outbreak_groups files are checked for JSON syntax only).
+
+--jsonl / --sarif stream every finding as a structured record (file, JSON
+path, rule id, severity) while the run is in progress; with --jsonl - the
+records go to stdout and the text report to stderr.
 """
 
+import argparse
+import contextlib
 import json
+import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from cds_rules import AbbreviationRule, ConditionStructureRule, RuleEngine, TopLevelFieldsRule
+from file_watcher import PollingWatcher
+from issue_output import ERROR, open_issue_stream
+from json_positions import load_json_with_positions
+from profiling import NULL_PROFILER, OUTPUT_DIR as PROFILE_DIR, Profiler
+from validation_cache import ValidationCache, ruleset_fingerprint
+
 # --- Configuration ---
 CDS_DIR = Path('assets/data/cds')
+WATCH_DIRS = [CDS_DIR, Path('assets/data/stewardship'), Path('assets/data/outbreak_groups')]
+WATCH_INTERVAL = 0.03
+WATCH_DEBOUNCE = 0.05
 REQUIRED_TOP_FIELDS = ['version', 'updatedAt', 'id', 'name', 'description', 'icon', 'color', 'conditions']
 REQUIRED_CONDITION_FIELDS = ['id', 'name', 'synonyms', 'icd10', 'severity', 'shortDescription', 'sections']
 REQUIRED_SECTIONS = ['overview', 'diagnostics', 'microbiology', 'empiric', 'definitive', 'duration', 'special', 'stewardship', 'references']
@@ -36,153 +62,225 @@ REQUIRED_CAPS = [
     'DAIR', 'PAD', 'ABI', 'FDA', 'TPN', 'IVDU'
 ]
 
+# Findings kept for the text report per rule (the counts and structured output stay complete)
+ISSUE_LIMITS = {'abbreviations': 5}
+
 # Regex for dosing format
 DOSING_PATTERN = re.compile(r'\b[A-Z][a-z]+(?:-[a-z]+)?\s+\d+(?:-\d+)?(?:\.\d+)?(?:mg|g|mcg|units?|%)\s+(?:IV|PO|IM|SC|topically)\s+(?:daily|BID|TID|QID|q\d+h|q\d+-\d+h)\b')
 
-def validate_json_structure(data, filename):
-    """Validate JSON schema and structure"""
-    issues = []
-    
-    # Check top-level fields
-    for field in REQUIRED_TOP_FIELDS:
-        if field not in data:
-            issues.append(f"Missing top-level field: {field}")
-
-    # Check conditions
-    if 'conditions' not in data:
-        issues.append("No conditions array found")
-        return issues
-
-    conditions = data['conditions']
-    if not conditions:
-        issues.append("Conditions array is empty")
-
-    return issues
-
-def validate_condition_structure(condition, index, filename):
-    """Validate individual condition structure"""
-    issues = []
-    cond_name = condition.get('name', f'Condition {index}')
-
-    # Required fields
-    for field in REQUIRED_CONDITION_FIELDS:
-        if field not in condition:
-            issues.append(f"{cond_name}: Missing field '{field}'")
-
-    # Check sections
-    if 'sections' not in condition:
-        return issues
-
-    sections = condition['sections']
-    for section in REQUIRED_SECTIONS:
-        if section not in sections:
-            issues.append(f"{cond_name}: Missing section '{section}'")
-
-    # Check references
-    if 'references' in sections:
-        refs = sections['references'].get('references', [])
-        if len(refs) < 1:
-             issues.append(f"{cond_name}: No references found (minimum 1 required)")
-        
-        for i, ref in enumerate(refs, 1):
-            if 'label' not in ref:
-                issues.append(f"{cond_name}: Reference {i} missing 'label'")
-            if 'url' not in ref:
-                issues.append(f"{cond_name}: Reference {i} missing 'url'")
-    else:
-        issues.append(f"{cond_name}: No references section")
-
-    return issues
-
-def validate_medical_abbreviations(data, filename):
-    """Validate medical abbreviation capitalization in content values only"""
-    issues = []
-
-    def check_string_value(value, path=""):
-        local_issues = []
-        if isinstance(value, str):
-            for abbr in REQUIRED_CAPS:
-                # Look for lowercase or mixed case versions in content
-                # Use word boundary to avoid partial matches
-                pattern = re.compile(r'\b' + abbr.lower() + r'\b', re.IGNORECASE)
-                matches = pattern.findall(value)
-                incorrect = [m for m in matches if m != abbr]
-                if incorrect:
-                    local_issues.append(f"In '{path}': Found '{abbr}' as {set(incorrect)}")
-        elif isinstance(value, dict):
-            for key, val in value.items():
-                local_issues.extend(check_string_value(val, f"{path}.{key}" if path else key))
-        elif isinstance(value, list):
-            for i, item in enumerate(value):
-                local_issues.extend(check_string_value(item, f"{path}[{i}]"))
-        return local_issues
-
-    for condition in data.get('conditions', []):
-        cond_name = condition.get('name', 'Unknown')
-        sections = condition.get('sections', {})
-        for section_id, section in sections.items():
-            if section_id == 'references':
-                continue
-            content = section.get('content', {})
-            issues.extend(check_string_value(content, f"{cond_name}.{section_id}"))
-
-    return issues
-
-def validate_dosing_format(data, filename):
-    """Validate dosing format consistency"""
-    issues = []
-    json_str = json.dumps(data)
-    dosings = DOSING_PATTERN.findall(json_str)
-    
-    # Heuristic: If a file has many conditions but few properly formatted dosings, it might be an issue.
-    # But for now, we just report if NO dosings are found in a file that likely should have them.
-    if len(dosings) == 0 and len(data.get('conditions', [])) > 0:
-         # This is a weak check, but better than nothing. 
-         # Many files might not have standard dosing strings if they use tables or lists differently.
-         pass 
+# Replaced by a Profiler when --profile is given
+PROFILER = NULL_PROFILER
 
-    return issues
+# Rule profile: every rule runs in the same single walk over a file
+ENGINE = RuleEngine([
+    TopLevelFieldsRule(REQUIRED_TOP_FIELDS),
+    ConditionStructureRule(REQUIRED_CONDITION_FIELDS, REQUIRED_SECTIONS, min_references=1),
+    AbbreviationRule(REQUIRED_CAPS),
+], limits=ISSUE_LIMITS)
 
-def validate_file(filepath):
-    """Run all validations on a single file"""
-    print(f"Validating {filepath.name}...")
+def check_file(filepath, sink=None):
+    """
+    Run all validations on a single file and return (passed, report_lines).
+    A sink from an IssueStream receives every finding as it is reported.
+    """
+    lines = [f"Validating {filepath.name}..."]
+    PROFILER.set_file(filepath.name)
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with PROFILER.phase('read+parse'):
+            data, positions = load_json_with_positions(filepath)
     except json.JSONDecodeError as e:
-        print(f"❌ JSON SYNTAX ERROR in {filepath.name}: {e}")
-        return False
+        lines.append(f"❌ JSON SYNTAX ERROR in {filepath.name}: {e}")
+        if sink is not None:
+            sink.emit('json', ERROR, f"JSON syntax error: {e.msg}", '', (e.lineno, e.colno))
+        return False, lines
     except Exception as e:
-        print(f"❌ Error reading {filepath.name}: {e}")
-        return False
+        lines.append(f"❌ Error reading {filepath.name}: {e}")
+        if sink is not None:
+            sink.emit('json', ERROR, f"Error reading file: {e}", '')
+        return False, lines
 
+    with PROFILER.phase('traversal'):
+        doc = ENGINE.run(data, filepath.name, sink, positions)
     all_issues = []
 
     # 1. Structure
-    all_issues.extend(validate_json_structure(data, filepath.name))
+    all_issues.extend(doc.issues['structure'])
 
     # 2. Conditions
-    for i, condition in enumerate(data.get('conditions', []), 1):
-        all_issues.extend(validate_condition_structure(condition, i, filepath.name))
+    all_issues.extend(doc.issues['conditions'])
 
     # 3. Abbreviations
-    abbr_issues = validate_medical_abbreviations(data, filepath.name)
-    # Limit abbreviation issues to avoid spamming
-    if len(abbr_issues) > 5:
-        all_issues.extend(abbr_issues[:5])
-        all_issues.append(f"... and {len(abbr_issues) - 5} more abbreviation issues")
-    else:
-        all_issues.extend(abbr_issues)
+    # Limited by ISSUE_LIMITS to avoid spamming
+    all_issues.extend(doc.issues['abbreviations'])
+    if doc.suppressed('abbreviations'):
+        all_issues.append(f"... and {doc.suppressed('abbreviations')} more abbreviation issues")
 
     if all_issues:
         for issue in all_issues:
-            print(f"   [FAIL] {issue}")
-        return False
+            lines.append(f"   [FAIL] {issue}")
+        return False, lines
     else:
-        print(f"   [OK]")
-        return True
+        lines.append(f"   [OK]")
+        return True, lines
+
+def validate_file(filepath):
+    """Run all validations on a single file and print the report"""
+    passed, lines = check_file(filepath)
+    for line in lines:
+        print(line)
+    return passed
+
+def check_json_file(filepath):
+    """JSON syntax check for watched files that have no CDS rules; returns (passed, report_lines)"""
+    lines = [f"Validating {filepath}..."]
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            json.load(f)
+    except json.JSONDecodeError as e:
+        lines.append(f"❌ JSON SYNTAX ERROR in {filepath.name}: {e}")
+        return False, lines
+    except Exception as e:
+        lines.append(f"❌ Error reading {filepath.name}: {e}")
+        return False, lines
+    lines.append("   [OK]")
+    return True, lines
+
+def watch(dirs):
+    """Re-validate saved files until interrupted"""
+    watcher = PollingWatcher(dirs, interval=WATCH_INTERVAL, debounce=WATCH_DEBOUNCE)
+    print(f"👀 Watching {', '.join(str(d) for d in dirs)} (Ctrl+C to stop)")
+    try:
+        while True:
+            changed, removed = watcher.wait()
+            print("=" * 80)
+            print(f"[{time.strftime('%H:%M:%S')}] {len(changed)} changed, {len(removed)} removed")
+            for path in removed:
+                print(f"🗑️  {path} removed")
+
+            passed_count = failed_count = 0
+            newest_save = 0
+            for path in changed:
+                # Saves can be half written; a parse error is reported and fixed by the next save
+                is_cds = path.parent == CDS_DIR
+                passed, lines = check_file(path) if is_cds else check_json_file(path)
+                for line in lines:
+                    print(line)
+                if passed:
+                    passed_count += 1
+                else:
+                    failed_count += 1
+                try:
+                    newest_save = max(newest_save, path.stat().st_mtime)
+                except OSError:
+                    pass
+
+            latency = f", {(time.time() - newest_save) * 1000:.0f} ms after save" if newest_save else ""
+            print("-" * 80)
+            print(f"Summary: {passed_count} passed, {failed_count} failed{latency}")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+
+def check_files(files, jobs, cache, stream=None):
+    """
+    Yield (passed, report_lines) for each file in the given order.
+    Files whose content and ruleset are unchanged replay their cached result.
+    With jobs > 1 the remaining files are checked in a process pool; the
+    biggest files are submitted first so they don't end up as the stragglers.
+    Structured output (stream) needs the live run, so callers pass jobs=1
+    and a disabled cache along with it.
+    """
+    cached = {}
+    pending = []
+    for json_file in files:
+        key, result = cache.get(json_file)
+        if result is not None:
+            cached[json_file] = tuple(result)
+        else:
+            pending.append((json_file, key))
+
+    if jobs <= 1 or len(pending) <= 1:
+        keys = dict(pending)
+        for json_file in files:
+            if json_file in cached:
+                yield cached[json_file]
+                continue
+            result = check_file(json_file, stream.file(json_file) if stream else None)
+            cache.put(json_file, keys[json_file], result)
+            yield result
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as executor:
+        futures = {
+            json_file: (key, executor.submit(check_file, json_file))
+            for json_file, key in sorted(pending, key=lambda item: item[0].stat().st_size, reverse=True)
+        }
+        for json_file in files:
+            if json_file in cached:
+                yield cached[json_file]
+                continue
+            key, future = futures[json_file]
+            result = future.result()
+            cache.put(json_file, key, result)
+            yield result
+
+def ruleset():
+    """Fingerprint of everything that decides a file's validation result"""
+    config = {
+        'REQUIRED_TOP_FIELDS': REQUIRED_TOP_FIELDS,
+        'REQUIRED_CONDITION_FIELDS': REQUIRED_CONDITION_FIELDS,
+        'REQUIRED_SECTIONS': REQUIRED_SECTIONS,
+        'REQUIRED_CAPS': REQUIRED_CAPS,
+        'DOSING_PATTERN': DOSING_PATTERN.pattern,
+        'ISSUE_LIMITS': ISSUE_LIMITS,
+    }
+    tools_dir = Path(__file__).resolve().parent
+    # json_positions.py decides the "(line L, col C)" in cached report lines; issue_output.py
+    # is left out because --jsonl/--sarif runs bypass the cache
+    sources = ['validate_all_cds.py', 'cds_rules.py', 'abbreviation_matcher.py', 'json_positions.py']
+    return ruleset_fingerprint(config, [tools_dir / name for name in sources])
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Validate all CDS category files.')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='number of worker processes (1 = serial, 0 = one per CPU)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='re-validate every file instead of replaying cached results')
+    parser.add_argument('--watch', action='store_true',
+                        help='after the first pass, re-validate files as they are saved')
+    parser.add_argument('--jsonl', metavar='PATH',
+                        help="stream findings as JSON lines to PATH ('-' for stdout, text report to stderr)")
+    parser.add_argument('--sarif', metavar='PATH', help='also write findings as a SARIF 2.1.0 log')
+    parser.add_argument('--profile', action='store_true',
+                        help='time every rule and phase per file (runs serially, without the cache)')
+    parser.add_argument('--profile-top', type=int, default=15, metavar='N', help='rows in the profile tables')
+    parser.add_argument('--profile-output', default=str(PROFILE_DIR / 'profile_validate_all_cds.json'),
+                        help='JSON timing report path')
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    # Opened before stdout is redirected, so '-' still means the real stdout
+    stream = open_issue_stream(args.jsonl, args.sarif, 'validate_all_cds', ENGINE.rules)
+    try:
+        if args.jsonl == '-':
+            with contextlib.redirect_stdout(sys.stderr):
+                run(args, stream)
+        else:
+            run(args, stream)
+    finally:
+        if stream is not None:
+            stream.close()
+
+def run(args, stream):
+    global PROFILER
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    if args.profile:
+        PROFILER = Profiler()
+        ENGINE.instrument(PROFILER)
+        jobs = 1
+    if stream is not None:
+        jobs = 1
+
     print("=" * 80)
     print("CDS MODULE - COMPREHENSIVE VALIDATION")
     print("=" * 80)
@@ -196,17 +294,33 @@ def main():
         print("❌ No JSON files found.")
         return
 
+    cache = ValidationCache('validate_all_cds', ruleset(),
+                            enabled=not (args.no_cache or args.profile or stream is not None))
     success_count = 0
     failure_count = 0
 
-    for json_file in sorted(files):
-        if validate_file(json_file):
+    # Reports are always printed in sorted file order, whatever the job count
+    for passed, lines in check_files(sorted(files), jobs, cache, stream):
+        with PROFILER.phase('print'):
+            for line in lines:
+                print(line)
+        if passed:
             success_count += 1
         else:
             failure_count += 1
             
     print("-" * 80)
     print(f"Summary: {success_count} passed, {failure_count} failed")
+    cache.save()
+    print(cache.summary())
+
+    if args.profile:
+        PROFILER.print_report(args.profile_top)
+        print(f"Profile written to {PROFILER.write_report(args.profile_output)}")
+
+    if args.watch:
+        watch(WATCH_DIRS)
+        return
     
     if failure_count > 0:
         sys.exit(1)
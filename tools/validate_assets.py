@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Schema validation for every JSON asset under assets/data.
+
+Each file is matched to an asset family (tools/asset_schemas.py) and
+checked against that family's compiled schema: required fields, value
+types, enums the Dart models resolve by name, and a few consistency checks
+(duplicate ids, quiz answer indexes, spectrum organism references). A file
+that belongs to no family is reported too, so new asset types get a schema
+when they are added.
+
+Outbreak group files that outbreak_groups/index.v1.json does not list are
+never loaded by the app; their findings are reported as warnings.
+
+Usage: python tools/validate_assets.py [--jsonl PATH|-] [--sarif PATH]
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from asset_schemas import FAMILIES, family_for
+from issue_output import ERROR, WARNING, open_issue_stream
+from json_positions import load_json_with_positions
+
+# Force UTF-8 output for Windows consoles
+sys.stdout.reconfigure(encoding='utf-8')
+sys.stderr.reconfigure(encoding='utf-8')
+
+DATA_DIR = Path('assets/data')
+OUTBREAK_INDEX = DATA_DIR / 'outbreak_groups' / 'index.v1.json'
+OUTBREAK_GROUPS = 'outbreak groups'
+
+
+class JsonSyntaxRule:
+    """File is not valid JSON"""
+    id = 'json'
+
+
+class SchemaRule:
+    """Asset does not match its family schema or consistency checks"""
+    id = 'schema'
+
+
+class UnknownAssetRule:
+    """JSON file belongs to no asset family"""
+    id = 'unknown-asset'
+
+
+RULES = [JsonSyntaxRule, SchemaRule, UnknownAssetRule]
+
+
+def listed_outbreak_groups():
+    """dataFile paths (relative to assets/data) listed in the outbreak index, or None if it can't be read"""
+    try:
+        with open(OUTBREAK_INDEX, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        return {f"outbreak_groups/{group['dataFile']}" for kind in index['types'] for group in kind['groups']}
+    except (OSError, ValueError, KeyError, TypeError):
+        # The index's own findings come from its schema check
+        return None
+
+
+def validate_file(filepath, relative, listed_groups, sink=None):
+    """Returns (family name, severity, [(path, location, message)])"""
+    family = family_for(relative)
+    if family is None:
+        message = "no asset family matches this file (add a schema in tools/asset_schemas.py)"
+        if sink is not None:
+            sink.emit(UnknownAssetRule.id, WARNING, message, '')
+        return None, WARNING, [('', None, message)]
+
+    severity = ERROR
+    if family.name == OUTBREAK_GROUPS and listed_groups is not None and relative not in listed_groups:
+        severity = WARNING
+
+    try:
+        data, positions = load_json_with_positions(filepath)
+    except json.JSONDecodeError as e:
+        message = f"JSON syntax error: {e.msg}"
+        if sink is not None:
+            sink.emit(JsonSyntaxRule.id, ERROR, message, '', (e.lineno, e.colno))
+        return family.name, ERROR, [('', (e.lineno, e.colno), message)]
+    except Exception as e:
+        message = f"Error reading file: {e}"
+        if sink is not None:
+            sink.emit(JsonSyntaxRule.id, ERROR, message, '')
+        return family.name, ERROR, [('', None, message)]
+
+    findings = []
+    for path, message in family.validate(data):
+        location = positions.locate(path)
+        if sink is not None:
+            sink.emit(SchemaRule.id, severity, message, path, location)
+        findings.append((path, location, message))
+    return family.name, severity, findings
+
+
+def run(args, stream=None):
+    files = sorted(DATA_DIR.rglob('*.json'))
+    if not files:
+        print(f"❌ No JSON files found in {DATA_DIR}")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("ASSET SCHEMA VALIDATION")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    listed_groups = listed_outbreak_groups()
+    file_counts = defaultdict(int)
+    results = defaultdict(list)
+    errors = warnings = 0
+    for filepath in files:
+        relative = filepath.relative_to(DATA_DIR).as_posix()
+        sink = stream.file(filepath) if stream is not None else None
+        family, severity, findings = validate_file(filepath, relative, listed_groups, sink)
+        file_counts[family] += 1
+        if findings:
+            results[family].append((relative, severity, findings))
+            if severity == ERROR:
+                errors += len(findings)
+            else:
+                warnings += len(findings)
+    elapsed = time.perf_counter() - start
+
+    for family in [f.name for f in FAMILIES] + [None]:
+        if not file_counts[family]:
+            continue
+        failed = results[family]
+        label = family or "unrecognized files"
+        if not failed:
+            print(f"✅ {label}: {file_counts[family]} file(s)")
+            continue
+        has_errors = any(severity == ERROR for _, severity, _ in failed)
+        print(f"{'❌' if has_errors else '⚠️ '} {label}: {len(failed)} of {file_counts[family]} file(s) with findings")
+        for relative, severity, findings in failed:
+            note = " (not listed in outbreak_groups/index.v1.json, not loaded by the app)" \
+                if family == OUTBREAK_GROUPS and severity == WARNING else ""
+            print(f"   {relative}{note}")
+            for path, location, message in findings:
+                where = f"{location[0]}:{location[1]}" if location else "-"
+                print(f"      [{where}] {path or '<root>'}: {message}")
+
+    print("-" * 80)
+    print(f"Summary: {len(files)} files, {errors} error(s), {warnings} warning(s) in {elapsed:.2f}s")
+
+    if errors:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate every JSON asset under assets/data against its schema.')
+    parser.add_argument('--jsonl', metavar='PATH',
+                        help="stream findings as JSON lines to PATH ('-' for stdout, text report to stderr)")
+    parser.add_argument('--sarif', metavar='PATH', help='also write findings as a SARIF 2.1.0 log')
+    args = parser.parse_args()
+
+    # Opened before stdout is redirected, so '-' still means the real stdout
+    stream = open_issue_stream(args.jsonl, args.sarif, 'validate_assets', RULES)
+    try:
+        if args.jsonl == '-':
+            with contextlib.redirect_stdout(sys.stderr):
+                run(args, stream)
+        else:
+            run(args, stream)
+    finally:
+        if stream is not None:
+            stream.close()
+
+
+if __name__ == '__main__':
+    main()
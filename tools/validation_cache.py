@@ -0,0 +1,117 @@
+"""
+Persistent, content-hash keyed result cache for the content validators.
+
+Each entry is keyed by the SHA-256 of the file contents combined with a
+fingerprint of the rule configuration (abbreviation lists, required fields,
+the validator sources themselves). Unchanged files replay their cached
+result; entries for deleted files are evicted on save, and a changed
+ruleset invalidates the whole cache.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+CACHE_DIR = Path('build/content_tools')
+CACHE_FORMAT = 1
+
+
+def ruleset_fingerprint(config, sources=()):
+    """Hash the rule configuration plus the source files that implement the rules"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+    for source in sources:
+        digest.update(Path(source).read_bytes())
+    return digest.hexdigest()
+
+
+def file_digest(filepath):
+    return hashlib.sha256(Path(filepath).read_bytes()).hexdigest()
+
+
+class ValidationCache:
+    """On-disk map of file path -> (content hash + ruleset) key and cached result"""
+
+    def __init__(self, name, ruleset, enabled=True, cache_dir=CACHE_DIR):
+        self.path = Path(cache_dir) / f'{name}_cache.json'
+        self.ruleset = ruleset
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._entries = {}
+        self._seen = set()
+        self._dirty = False
+        if enabled:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if stored.get('format') != CACHE_FORMAT or stored.get('ruleset') != self.ruleset:
+            # Rules changed: every cached result is stale
+            self.evicted = len(stored.get('entries', {}))
+            self._dirty = True
+            return
+        self._entries = stored.get('entries', {})
+
+    def key_for(self, filepath):
+        return hashlib.sha256(f'{self.ruleset}:{file_digest(filepath)}'.encode('utf-8')).hexdigest()
+
+    def get(self, filepath):
+        """Return (key, cached result or None) for a file"""
+        name = str(filepath)
+        self._seen.add(name)
+        if not self.enabled:
+            self.misses += 1
+            return None, None
+        try:
+            key = self.key_for(filepath)
+        except OSError:
+            self.misses += 1
+            return None, None
+        entry = self._entries.get(name)
+        if entry is not None and entry['key'] == key:
+            self.hits += 1
+            return key, entry['result']
+        self.misses += 1
+        return key, None
+
+    def put(self, filepath, key, result):
+        if not self.enabled or key is None:
+            return
+        self._entries[str(filepath)] = {'key': key, 'result': result}
+        self._dirty = True
+
+    def save(self):
+        """Evict entries for files that no longer exist and write the cache atomically"""
+        if not self.enabled:
+            return
+        for name in list(self._entries):
+            if name not in self._seen and not Path(name).exists():
+                del self._entries[name]
+                self.evicted += 1
+                self._dirty = True
+        if not self._dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {'format': CACHE_FORMAT, 'ruleset': self.ruleset, 'entries': self._entries}
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.path)
+
+    def summary(self):
+        if not self.enabled:
+            return "Cache: disabled"
+        total = self.hits + self.misses
+        line = f"Cache: {self.hits}/{total} hits, {self.misses} misses"
+        if self.evicted:
+            line += f", {self.evicted} evicted"
+        return line